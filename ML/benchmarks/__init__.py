@@ -0,0 +1 @@
+"""Micro-benchmarks for the ML service hot paths (run as python -m benchmarks.<name>)"""
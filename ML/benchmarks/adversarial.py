@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Worst-case text analysis cost on pathological inputs
+
+Feeds inputs built to trigger regex backtracking (long tokens, digit and
+dot runs, padded whitespace, dense "@" and "%") through every per-request
+text analysis and reports the CPU time of each. Cleaning and parsing must
+stay linear, so these should cost about as much as an ordinary resume.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipelines.document import ParsedDocument
+from pipelines.lexical import LexicalIndex
+from pipelines.preprocess import preprocessor
+
+DOCUMENT_ANALYSES = (
+    'text', 'token_ids', 'skills', 'sections', 'terms', 'impact_verbs', 'experience_impact_verbs',
+    'structured_text', 'ats_sections', 'has_contact', 'achievement_count'
+)
+
+
+def adversarial_inputs(length: int = 10000) -> Dict[str, str]:
+    """Named pathological inputs of roughly the given length"""
+    def repeat(unit: str) -> str:
+        return (unit * (length // len(unit) + 1))[:length]
+
+    return {
+        "long_token_trailing_at": repeat("a")[:-1] + "@",
+        "long_token_leading_at": "@" + repeat("a")[1:],
+        "at_runs": repeat("a@"),
+        "dotted_token": repeat("a."),
+        "dotted_email_like": repeat("a.b-") + "@x",
+        "zero_run": repeat("0"),
+        "digit_run_with_percent": repeat("0") + "%",
+        "digit_space_run": repeat("1 "),
+        "digit_dash_tail": "1" + repeat("-")[1:],
+        "plus_digits": repeat("+1"),
+        "paren_digits": repeat("(1"),
+        "url_prefixes": repeat("http"),
+        "trailing_whitespace": "python" + repeat(" ")[6:],
+        "whitespace_only": repeat(" \t\n"),
+        "newline_sections": repeat("experience\n"),
+    }
+
+
+def fuzz_inputs(count: int, length: int = 10000, seed: int = 0) -> Dict[str, str]:
+    """Random texts drawn from long runs of regex-sensitive characters"""
+    rng = random.Random(seed)
+    alphabet = "a0 1.@%-+(\t\n"
+    inputs = {}
+    for i in range(count):
+        parts = []
+        size = 0
+        while size < length:
+            run = rng.choice(alphabet) * rng.randint(1, length // 4)
+            parts.append(run)
+            size += len(run)
+        inputs[f"fuzz_{i}"] = ''.join(parts)[:length]
+    return inputs
+
+
+def analyze(text: str) -> float:
+    """CPU milliseconds for every resume- and job-side analysis of one text"""
+    started = time.process_time()
+    document = ParsedDocument(text)
+    for name in DOCUMENT_ANALYSES:
+        getattr(document, name)
+    # Job descriptions are skill-extracted and tokenized without cleaning
+    preprocessor.extract_skills(text)
+    LexicalIndex.tokenize(text)
+    preprocessor.tokenize_text(text)
+    return (time.process_time() - started) * 1000
+
+
+def run(length: int = 10000, fuzz: int = 20) -> Dict[str, float]:
+    inputs = {**adversarial_inputs(length), **fuzz_inputs(fuzz, length)}
+    return {name: round(analyze(text), 3) for name, text in inputs.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark text analysis on pathological inputs")
+    parser.add_argument("--length", type=int, default=10000, help="Input length in characters")
+    parser.add_argument("--fuzz", type=int, default=20, help="Number of random pathological inputs")
+    args = parser.parse_args()
+
+    timings = run(args.length, args.fuzz)
+    worst = max(timings, key=timings.get)
+    print(json.dumps({"worst_case": worst, "worst_case_ms": timings[worst], "timings_ms": timings}, indent=2))
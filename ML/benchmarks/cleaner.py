@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for the shared text cleaners
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipelines.text_cleaner import text_cleaner, structured_cleaner
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def load_documents(target_length: int = 10000):
+    """Sample resumes repeated up to a realistic upload size"""
+    with open(os.path.join(DATA_DIR, 'sample_resumes.json')) as f:
+        resumes = [resume['text'] for resume in json.load(f)['resumes']]
+    return [(text + "\n\n") * (target_length // (len(text) + 2) + 1) for text in resumes]
+
+
+def measure(clean, documents, min_time: float = 1.0):
+    """Run clean over the documents until min_time elapses"""
+    total_chars = sum(len(document) for document in documents)
+    rounds = 0
+    started = time.perf_counter()
+    while True:
+        for document in documents:
+            clean(document)
+        rounds += 1
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            break
+    calls = rounds * len(documents)
+    return {
+        "docs_per_second": round(calls / elapsed, 1),
+        "mb_per_second": round(rounds * total_chars / elapsed / 1e6, 2),
+        "ms_per_doc": round(elapsed / calls * 1000, 4)
+    }
+
+
+def run(min_time: float = 1.0, target_length: int = 10000):
+    documents = load_documents(target_length)
+    return {
+        "text_cleaner": measure(text_cleaner.clean, documents, min_time),
+        "structured_cleaner": measure(structured_cleaner.clean, documents, min_time)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark text cleaning throughput")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to run each cleaner")
+    parser.add_argument("--length", type=int, default=10000, help="Approximate document length in characters")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.min_time, args.length), indent=2))
@@ -0,0 +1,98 @@
+"""
+Seeded synthetic corpora for the benchmark suite
+
+Jobs and resumes are built from data/sample_jobs.json, data/sample_resumes.json
+and data/test_data.py: every synthetic posting is a sample description with
+its own id, a shuffled set of dictionary skills and a few filler sentences,
+so term statistics and skill overlap look like a real pool. The same seed
+always gives the same corpus.
+"""
+
+import itertools
+import json
+import os
+import random
+import sys
+from typing import Any, Dict, List
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data.test_data import generate_sample_jobs, generate_sample_resumes, get_test_resume_text
+from pipelines.preprocess import preprocessor
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# Resume lengths (characters); long stays under the API's 10000 limit
+RESUME_LENGTHS = {"short": 0, "long": 9000}
+
+FILLER = [
+    "You will work closely with product and design on customer facing features.",
+    "We value ownership, clear communication and pragmatic engineering.",
+    "The role includes code review, mentoring and on-call rotation.",
+    "Experience with distributed systems and monitoring is a plus.",
+    "We offer flexible hours, remote work and a learning budget.",
+    "You will help us scale our platform to millions of users."
+]
+LEVELS = ["entry", "mid", "senior", "lead"]
+LOCATIONS = ["remote", "new york", "london", "bangalore", "berlin"]
+
+
+def _sample_jobs() -> List[Dict[str, Any]]:
+    with open(os.path.join(DATA_DIR, 'sample_jobs.json')) as f:
+        jobs = json.load(f)['jobs']
+    return jobs + generate_sample_jobs()
+
+
+def _sample_resumes() -> List[str]:
+    with open(os.path.join(DATA_DIR, 'sample_resumes.json')) as f:
+        resumes = [resume['text'] for resume in json.load(f)['resumes']]
+    return resumes + [resume['text'] for resume in generate_sample_resumes()]
+
+
+def job_corpus(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """count distinct job postings shaped like POST /ml/jobs and job_pool entries"""
+    rng = random.Random(seed)
+    base_jobs = _sample_jobs()
+    skills = sorted({skill for category in preprocessor.skills_dict.values() for skill in category})
+    jobs = []
+    for i in range(count):
+        base = base_jobs[i % len(base_jobs)]
+        job_skills = rng.sample(skills, rng.randint(3, 8))
+        description = " ".join([
+            base['description'].strip(),
+            f"Required skills: {', '.join(job_skills)}.",
+            *rng.sample(FILLER, 2),
+            f"Requisition {seed}-{i}."
+        ])
+        jobs.append({
+            "id": f"bench_job_{seed}_{i}",
+            "title": base.get('title', ''),
+            "company": base.get('company', ''),
+            "description": description,
+            "required_skills": job_skills[:3],
+            "experience_level": rng.choice(LEVELS),
+            "location": rng.choice(LOCATIONS)
+        })
+    return jobs
+
+
+def resume_text(size: str = "short") -> str:
+    """Short: the test resume; long: sample resumes concatenated to RESUME_LENGTHS["long"]"""
+    if size == "short":
+        return get_test_resume_text()
+    target = RESUME_LENGTHS[size]
+    text = ""
+    for resume in _sample_resumes() * (target // 1000 + 1):
+        if len(text) + len(resume) + 2 > target:
+            break
+        text += resume.strip() + "\n\n"
+    return text
+
+
+_references = itertools.count()
+
+
+def unique(text: str) -> str:
+    """A copy of text no parse cache has seen in this process (for uncached per-call timings)"""
+    return f"{text}\nReference {next(_references)}"
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Concurrent HTTP load generator for the ML service
+
+Drives the /ml/* endpoints with a weighted request mix, either closed-loop
+(N clients, each sending its next request when the previous one returns)
+or open-loop (requests start at a fixed rate whether or not earlier ones
+have finished, so queueing shows up in the latencies instead of silently
+lowering the offered load). Reports per-endpoint p50/p95/p99/max latency,
+throughput and error rates; --levels sweeps concurrency (or rate) and
+reports the level at which each endpoint saturates.
+
+    python -m benchmarks.load --url http://localhost:8000 --concurrency 16
+    python -m benchmarks.load --mode open --levels 10,20,40,80 --duration 20
+    python -m benchmarks.load --start --workers 4 --levels 1,4,16,64
+
+All traffic comes from one client address, so raise RATE_LIMIT_PER_MINUTE
+on the service under test (--start does) or rate-limited (429) responses
+will dominate.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.corpus import job_corpus, resume_text, unique
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Default request mix (relative weights); profiles and jobs writes are left
+# out so a run does not grow the service's stores
+DEFAULT_MIX = {
+    "status": 1, "match": 6, "match_batch": 1, "recommend": 3,
+    "interview": 2, "feedback": 2, "ats": 3, "analyze": 1
+}
+
+# A level saturates when adding load gains less throughput than this...
+MIN_THROUGHPUT_GAIN = 0.10
+# ...or more than this fraction of its requests fail
+MAX_ERROR_RATE = 0.01
+
+# Payload builder per endpoint name: () -> (method, path, json body)
+Payload = Tuple[str, str, Optional[Dict[str, Any]]]
+
+
+def build_endpoints(seed: int = 0) -> Dict[str, Callable[[], Payload]]:
+    """Request factories for every endpoint, on the benchmark corpora"""
+    rng = random.Random(seed)
+    jobs = job_corpus(200, seed=seed)
+    resumes = [resume_text("short"), resume_text("long")]
+
+    def resume() -> str:
+        # Mostly distinct texts, so the parse cache behaves as in production
+        return unique(rng.choice(resumes))
+
+    def job() -> Dict[str, Any]:
+        return rng.choice(jobs)
+
+    return {
+        "status": lambda: ("GET", "/ml/status", None),
+        "match": lambda: ("POST", "/ml/match", {
+            "resume_text": resume(), "job_description": job()['description'], "use_cache": True
+        }),
+        "match_batch": lambda: ("POST", "/ml/match/batch", {
+            "resume_text": resume(), "job_descriptions": [job()['description'] for _ in range(10)]
+        }),
+        "recommend": lambda: ("POST", "/ml/recommend", {
+            "resume_text": resume(),
+            "job_pool": [{key: item[key] for key in ("id", "title", "company", "description")}
+                         for item in rng.sample(jobs, 50)],
+            "max_recommendations": 5
+        }),
+        "interview": lambda: ("POST", "/ml/interview", {
+            "applied_jobs": rng.randint(0, 50), "interviews_given": rng.randint(0, 20),
+            "skills_strength": round(rng.random(), 2), "prep_hours": rng.randint(0, 100),
+            "match_score_avg": round(rng.random(), 2), "resume_score": round(rng.random(), 2),
+            "years_experience": rng.randint(0, 20)
+        }),
+        "feedback": lambda: ("POST", "/ml/resume/feedback", {
+            "resume_text": resume(), "target_role": "software engineer"
+        }),
+        "ats": lambda: ("POST", "/ml/ats", {"resume_text": resume()}),
+        "analyze": lambda: ("POST", "/ml/analyze", {
+            "resume_text": resume(),
+            "jobs": [{"id": item['id'], "description": item['description']} for item in rng.sample(jobs, 5)],
+            "analyses": ["ats", "feedback", "match"]
+        })
+    }
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'match=5,ats=1' -> {'match': 5.0, 'ats': 1.0}"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        name, _, weight = item.partition("=")
+        mix[name.strip()] = float(weight) if weight else 1.0
+    return mix
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values), math.ceil(q / 100 * len(sorted_values))) - 1)
+    return sorted_values[index]
+
+
+class EndpointStats:
+    """Latencies and outcomes of one endpoint during one run"""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.statuses: Counter = Counter()
+        self.errors = 0
+
+    def record(self, latency: float, status: Optional[int]):
+        self.latencies.append(latency)
+        self.statuses[str(status) if status is not None else "exception"] += 1
+        if status is None or status >= 400:
+            self.errors += 1
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        count = len(latencies)
+        return {
+            "requests": count,
+            "throughput_rps": round((count - self.errors) / duration, 2) if duration else 0.0,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            # 429s mean the service's rate limit, not its capacity, was reached
+            "rate_limited": self.statuses.get("429", 0),
+            "statuses": dict(self.statuses),
+            "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            "mean_ms": round(sum(latencies) / count * 1000, 2) if count else 0.0
+        }
+
+
+class LoadRun:
+    """One closed- or open-loop run at a single concurrency/rate level"""
+
+    def __init__(self, client: httpx.AsyncClient, endpoints: Dict[str, Callable[[], Payload]],
+                 mix: Dict[str, float], api_key: str = "", seed: int = 0):
+        unknown = set(mix) - set(endpoints)
+        if unknown:
+            raise ValueError(f"Unknown endpoints in mix: {', '.join(sorted(unknown))}")
+        self.client = client
+        self.endpoints = endpoints
+        self.names = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.names]
+        self.headers = {"X-API-Key": api_key} if api_key else {}
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, EndpointStats] = {name: EndpointStats() for name in self.names}
+        self.dropped = 0
+
+    async def _request(self, name: str, scheduled: float = None):
+        """Send one request; open-loop latency counts from its scheduled start"""
+        method, path, body = self.endpoints[name]()
+        started = scheduled if scheduled is not None else time.perf_counter()
+        try:
+            response = await self.client.request(method, path, json=body, headers=self.headers)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        self.stats[name].record(time.perf_counter() - started, status)
+
+    def _next(self) -> str:
+        return self.rng.choices(self.names, self.weights)[0]
+
+    async def closed_loop(self, concurrency: int, duration: float):
+        deadline = time.perf_counter() + duration
+
+        async def client_loop():
+            while time.perf_counter() < deadline:
+                await self._request(self._next())
+
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    async def open_loop(self, rate: float, duration: float, max_in_flight: int = 1000):
+        """Start requests at a constant rate; arrivals beyond max_in_flight are dropped"""
+        in_flight = set()
+        started = time.perf_counter()
+        for i in range(int(rate * duration)):
+            scheduled = started + i / rate
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if len(in_flight) >= max_in_flight:
+                self.dropped += 1
+                continue
+            task = asyncio.create_task(self._request(self._next(), scheduled))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def run(self, mode: str, level: float, duration: float, max_in_flight: int = 1000) -> Dict[str, Any]:
+        started = time.perf_counter()
+        if mode == "closed":
+            await self.closed_loop(int(level), duration)
+        else:
+            await self.open_loop(level, duration, max_in_flight)
+        elapsed = time.perf_counter() - started
+
+        total = EndpointStats()
+        for stats in self.stats.values():
+            total.latencies.extend(stats.latencies)
+            total.statuses.update(stats.statuses)
+            total.errors += stats.errors
+        return {
+            "mode": mode,
+            "level": level,
+            "duration_s": round(elapsed, 2),
+            "dropped": self.dropped,
+            "total": total.summary(elapsed),
+            "endpoints": {name: stats.summary(elapsed) for name, stats in self.stats.items() if stats.latencies}
+        }
+
+
+def saturation_points(levels: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """Per endpoint (and "total"), the first level past which load stopped paying off
+
+    That is the last level before throughput grew by less than
+    MIN_THROUGHPUT_GAIN, or the first level whose error rate exceeded
+    MAX_ERROR_RATE; None if the endpoint never saturated in the sweep.
+    """
+    names = {"total"} | {name for result in levels for name in result["endpoints"]}
+    points = {}
+    for name in sorted(names):
+        point, previous = None, None
+        for result in levels:
+            summary = result["total"] if name == "total" else result["endpoints"].get(name)
+            if summary is None:
+                continue
+            if summary["error_rate"] > MAX_ERROR_RATE:
+                point = result["level"]
+                break
+            if previous is not None and summary["throughput_rps"] < previous[1] * (1 + MIN_THROUGHPUT_GAIN):
+                point = previous[0]
+                break
+            previous = (result["level"], summary["throughput_rps"])
+        points[name] = point
+    return points
+
+
+async def sweep(client: httpx.AsyncClient, mode: str, levels: List[float], duration: float,
+                mix: Dict[str, float] = None, api_key: str = "", seed: int = 0,
+                max_in_flight: int = 1000) -> Dict[str, Any]:
+    """Run every level in turn and locate saturation"""
+    endpoints = build_endpoints(seed)
+    results = []
+    for level in levels:
+        load_run = LoadRun(client, endpoints, mix or DEFAULT_MIX, api_key, seed)
+        result = await load_run.run(mode, level, duration, max_in_flight)
+        results.append(result)
+        total = result["total"]
+        print(f"📈 {mode} {level:g}: {total['throughput_rps']} rps, p50 {total['p50_ms']} ms, "
+              f"p99 {total['p99_ms']} ms, errors {total['error_rate']:.1%}", file=sys.stderr)
+    return {"levels": results, "saturation": saturation_points(results) if len(results) > 1 else {}}
+
+
+def start_service(port: int, workers: int = 1, timeout: float = 120.0) -> subprocess.Popen:
+    """Start the service (gunicorn with uvicorn workers, as in production) and wait for /ml/ready"""
+    if workers > 1:
+        command = ["gunicorn", "main:app", "-c", "gunicorn.conf.py", "-k", "uvicorn.workers.UvicornWorker",
+                   "-w", str(workers), "-b", f"127.0.0.1:{port}", "--timeout", "120"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"]
+    # One load generator is one client: lift the per-client limit unless one was chosen
+    env = {**os.environ, "RATE_LIMIT_PER_MINUTE": os.environ.get("RATE_LIMIT_PER_MINUTE", "1000000")}
+    process = subprocess.Popen(command, cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, start_new_session=True)
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Service exited with code {process.returncode}")
+        try:
+            # With several workers, each answers for itself; a few passes make it likely all are warm
+            if all(httpx.get(f"http://127.0.0.1:{port}/ml/ready", timeout=2).status_code == 200
+                   for _ in range(workers * 2)):
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    stop_service(process)
+    raise RuntimeError(f"Service not ready after {timeout:.0f}s")
+
+
+def stop_service(process: subprocess.Popen):
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout=30)
+    except (ProcessLookupError, subprocess.TimeoutExpired):
+        os.killpg(process.pid, signal.SIGKILL)
+
+
+def print_report(report: Dict[str, Any]):
+    header = f"{'level':>8} {'endpoint':<12} {'req':>7} {'rps':>8} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+    print(header)
+    for result in report["levels"]:
+        rows = [("total", result["total"])] + sorted(result["endpoints"].items())
+        for name, summary in rows:
+            print(f"{result['level']:>8g} {name:<12} {summary['requests']:>7} {summary['throughput_rps']:>8} "
+                  f"{summary['error_rate'] * 100:>6.1f} {summary['p50_ms']:>8} {summary['p95_ms']:>8} "
+                  f"{summary['p99_ms']:>8} {summary['max_ms']:>8}")
+    if report["saturation"]:
+        print("\n🔥 Saturation (last level that still paid off):")
+        for name, level in report["saturation"].items():
+            print(f"   {name:<12} {'not reached' if level is None else format(level, 'g')}")
+
+
+async def main(args) -> Dict[str, Any]:
+    levels = [float(level) for level in args.levels.split(",")] if args.levels else \
+        [float(args.concurrency if args.mode == "closed" else args.rate)]
+    process = start_service(args.port, args.workers) if args.start else None
+    base_url = f"http://127.0.0.1:{args.port}" if args.start else args.url
+    try:
+        limits = httpx.Limits(max_connections=args.max_in_flight, max_keepalive_connections=args.max_in_flight)
+        async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+            return await sweep(client, args.mode, levels, args.duration, parse_mix(args.mix) if args.mix else None,
+                               args.api_key, args.seed, args.max_in_flight)
+    finally:
+        if process is not None:
+            stop_service(process)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the ML service endpoints")
+    parser.add_argument("--url", default=os.getenv("BASE_URL", "http://localhost:8000"), help="Service base URL")
+    parser.add_argument("--api-key", default=os.getenv("API_KEY", ""), help="X-API-Key header value")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed",
+                        help="closed: fixed concurrency; open: fixed arrival rate (req/s)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients (closed loop)")
+    parser.add_argument("--rate", type=float, default=20.0, help="Requests per second (open loop)")
+    parser.add_argument("--levels", default="", help="Comma-separated concurrencies/rates to sweep, e.g. 1,2,4,8,16")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per level")
+    parser.add_argument("--mix", default="", help="Endpoint weights, e.g. match=5,ats=1 (default: all endpoints)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open-loop cap on outstanding requests")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", action="store_true", help="Start the service locally for the run")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --start")
+    parser.add_argument("--workers", type=int, default=1, help="Gunicorn workers for --start")
+    parser.add_argument("--output", default="", help="Also write the report as JSON here")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Cold start profile of the service
+
+Runs fresh interpreters so nothing is already imported: one under
+`python -X importtime` to summarize which modules the app import spends
+its time in, and one that imports the app, runs its startup (model warmup)
+and serves a first request, timing each phase.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that take seconds to import and must only load on first use
+HEAVY_MODULES = ('torch', 'sentence_transformers', 'transformers', 'sklearn', 'nltk', 'spacy')
+
+# Prefix of the timings line, so log lines on stdout around it are skipped
+TIMINGS_MARKER = "COLD_START_TIMINGS "
+
+COLD_START_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    status = client.get(sys.argv[1]).status_code
+    responded = time.perf_counter()
+print(%r + json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_response_ms": (responded - ready) * 1000,
+    "status_code": status,
+    "heavy_modules_loaded": sorted(name for name in %r if name in sys.modules)
+}), flush=True)
+""" % (TIMINGS_MARKER, HEAVY_MODULES)
+
+
+def _python(args: List[str], env: Dict[str, str] = None) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=SERVICE_DIR, capture_output=True, text=True,
+        env={**os.environ, **(env or {})}, check=True
+    )
+
+
+def import_times(module: str = "main", env: Dict[str, str] = None) -> List[Dict[str, Any]]:
+    """Per-module (self_ms, cumulative_ms, depth) from `python -X importtime`"""
+    stderr = _python(["-X", "importtime", "-c", f"import {module}"], env).stderr
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line
+        entries.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip()) - 1) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000
+        })
+    return entries
+
+
+def summarize(entries: List[Dict[str, Any]], top: int = 15) -> Dict[str, Any]:
+    """Total import time and the most expensive modules"""
+    roots = [entry for entry in entries if entry["depth"] == 0]
+    packages: Dict[str, float] = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + entry["self_ms"]
+    return {
+        "total_ms": round(sum(entry["cumulative_ms"] for entry in roots), 1),
+        "modules_imported": len(entries),
+        # Top-level imports and what they import directly
+        "slowest_imports": [
+            {"module": entry["module"], "cumulative_ms": round(entry["cumulative_ms"], 1)}
+            for entry in sorted(
+                (entry for entry in entries if entry["depth"] <= 1), key=lambda entry: -entry["cumulative_ms"]
+            )[:top]
+        ],
+        "top_packages_self_ms": {
+            package: round(ms, 1)
+            for package, ms in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        }
+    }
+
+
+def cold_start(path: str = "/health", env: Dict[str, str] = None) -> Dict[str, Any]:
+    """Import, startup and first response times of a fresh service process"""
+    stdout = _python(["-c", COLD_START_SCRIPT, path], env).stdout
+    line = next(line for line in stdout.splitlines() if line.startswith(TIMINGS_MARKER))
+    timings = json.loads(line[len(TIMINGS_MARKER):])
+    for key in ("import_ms", "startup_ms", "first_response_ms"):
+        timings[key] = round(timings[key], 1)
+    return timings
+
+
+def run(module: str = "main", path: str = "/health", top: int = 15) -> Dict[str, Any]:
+    return {
+        "cold_start": cold_start(path),
+        "imports": summarize(import_times(module), top)
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile service cold start")
+    parser.add_argument("--module", default="main", help="Module whose import is profiled")
+    parser.add_argument("--path", default="/health", help="Path of the first request")
+    parser.add_argument("--top", type=int, default=15, help="Number of modules/packages to list")
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.module, args.path, args.top), indent=2))
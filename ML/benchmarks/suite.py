@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite with a committed baseline
+
+Times every model's predict, skill extraction, text cleaning, the
+embedding batch path and the cache layer at several input sizes, on the
+seeded corpora of benchmarks/corpus.py. Results are written as JSON and
+compared against benchmarks/baseline.json; a case whose median time grew
+by more than the tolerance is a regression and the run exits non-zero.
+
+Timings are compared relative to a fixed calibration workload timed in
+the same run, so a baseline recorded on one machine stays usable on a
+faster or slower one.
+
+    python -m benchmarks.suite                       # run and compare
+    python -m benchmarks.suite --quick -k recommend  # subset, fewer samples
+    python -m benchmarks.suite --update-baseline     # record a new baseline
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from benchmarks.corpus import job_corpus, resume_text, unique
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_TOLERANCE = 0.5
+
+JOB_POOL_SIZES = (1, 100, 1000)   # job_pool is capped at 1000 by the API
+INDEX_SIZES = (1000, 10000)       # postings indexed via POST /ml/jobs
+RESUME_SIZES = ("short", "long")
+EMBEDDING_BATCH = 100
+
+# (name, setup) pairs; setup returns the timed call (taking the call
+# index) and an optional teardown, or None to skip the case
+Case = Tuple[str, Callable[[], Optional[Tuple[Callable[[int], Any], Optional[Callable[[], None]]]]]]
+
+
+def calibrate(samples: int = 9) -> float:
+    """Fastest ms of a fixed interpreter + numpy workload, the unit timings are compared in"""
+    data = np.arange(200000, dtype=np.int64)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        total = sum(i * i for i in range(100000))
+        total += int(np.sort(data[::-1]).sum())
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def measure(func: Callable[[int], Any], min_time: float = 0.5, min_calls: int = 5,
+            max_calls: int = 10000) -> Dict[str, Any]:
+    """Time func(i) call by call until min_time and min_calls are both reached
+
+    The garbage collector is paused while timing, so a collection triggered
+    by an earlier case's garbage is not billed to this one.
+    """
+    func(-1)  # Warm-up call (lazy loading, first-use caches)
+    gc.collect()
+    gc.disable()
+    timings = []
+    try:
+        started = time.perf_counter()
+        while len(timings) < max_calls:
+            call_started = time.perf_counter()
+            func(len(timings))
+            timings.append((time.perf_counter() - call_started) * 1000)
+            if len(timings) >= min_calls and time.perf_counter() - started >= min_time:
+                break
+    finally:
+        gc.enable()
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "median_ms": round(statistics.median(timings), 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        "mean_ms": round(statistics.fmean(timings), 4)
+    }
+
+
+def _text_cases() -> List[Case]:
+    from pipelines.preprocess import preprocessor
+
+    cases = []
+    for size in RESUME_SIZES:
+        text = resume_text(size)
+        cases.append((f"clean_text/{size}", lambda text=text: (lambda i: preprocessor.clean_text(unique(text)), None)))
+        cases.append((f"extract_skills/{size}", lambda text=text: (lambda i: preprocessor.extract_skills(text), None)))
+    return cases
+
+
+def _model_cases() -> List[Case]:
+    from data.test_data import generate_interview_test_cases, get_test_job_description
+    from models.registry import model_registry
+
+    cases = []
+    job_description = get_test_job_description()
+    for size in RESUME_SIZES:
+        text = resume_text(size)
+
+        def match(text=text):
+            model = model_registry.get("match")
+            return lambda i: model.predict({'resume_text': unique(text), 'job_description': job_description}), None
+
+        def ats(text=text):
+            model = model_registry.get("ats")
+            return lambda i: model.predict({'resume_text': unique(text)}), None
+
+        def feedback(text=text):
+            model = model_registry.get("feedback")
+            return lambda i: model.predict({'resume_text': unique(text), 'target_role': 'software engineer'}), None
+
+        cases += [(f"match.predict/{size}", match), (f"ats.predict/{size}", ats), (f"feedback.predict/{size}", feedback)]
+
+    def match_batch():
+        model = model_registry.get("match")
+        jobs = job_corpus(100)
+        text = resume_text("short")
+        return lambda i: model.predict_batch([
+            {'resume_text': unique(text), 'job_description': job['description']} for job in jobs
+        ]), None
+    cases.append(("match.predict_batch/100_jobs", match_batch))
+
+    for count in JOB_POOL_SIZES:
+        def recommend_pool(count=count):
+            model = model_registry.get("recommend")
+            pool = job_corpus(count)
+            text = resume_text("short")
+            return lambda i: model.predict({'resume_text': unique(text), 'job_pool': pool, 'max_recommendations': 10}), None
+        cases.append((f"recommend.predict/pool_{count}", recommend_pool))
+
+    for count in INDEX_SIZES:
+        def recommend_index(count=count):
+            from pipelines.job_index import job_index
+            model = model_registry.get("recommend")
+            job_index.clear()
+            job_index.upsert_many(job_corpus(count, seed=1))
+            job_index.matrix()
+            text = resume_text("short")
+            return (lambda i: model.predict({'resume_text': unique(text), 'max_recommendations': 10}),
+                    job_index.clear)
+        cases.append((f"recommend.predict/index_{count}", recommend_index))
+
+    def interview():
+        model = model_registry.get("interview")
+        features = {key: value for key, value in generate_interview_test_cases()[0].items() if key != 'expected_category'}
+        return lambda i: model.predict(features), None
+    cases.append(("interview.predict", interview))
+    return cases
+
+
+def _embedding_cases() -> List[Case]:
+    from pipelines.embedding_codec import decode_embedding, encode_embedding
+
+    def codec():
+        embeddings = np.random.default_rng(0).standard_normal((EMBEDDING_BATCH, 384)).astype(np.float32)
+
+        def roundtrip(i):
+            for embedding in embeddings:
+                decode_embedding(encode_embedding(embedding, "bench"), "bench")
+        return roundtrip, None
+
+    def batch():
+        from pipelines.embeddings import embedding_manager
+        if embedding_manager.model is None:
+            return None  # ENABLE_SBERT=false or sentence-transformers unavailable
+        texts = [job['description'] for job in job_corpus(EMBEDDING_BATCH)]
+        return lambda i: embedding_manager.get_embeddings_batch([unique(text) for text in texts]), None
+
+    return [(f"embedding_codec/{EMBEDDING_BATCH}", codec), (f"embeddings.batch/{EMBEDDING_BATCH}", batch)]
+
+
+def _cache_cases() -> List[Case]:
+    from utils import cache
+
+    def lru():
+        lru_cache = cache.LRUCache(1000, name="bench")
+        values = {f"key:{i}": list(range(20)) for i in range(1000)}
+
+        def get_set(i):
+            for key, value in values.items():
+                if lru_cache.get(key) is None:
+                    lru_cache.set(key, value)
+        return get_set, None
+
+    def redis_many():
+        try:
+            cache.get_redis().ping()
+        except Exception:
+            return None  # No Redis to measure against
+        keys = [f"bench:{i}" for i in range(100)]
+        payload = {key: {"value": list(range(20))} for key in keys}
+
+        def round_trip(i):
+            cache.local_cache.clear()
+            cache.set_cache_many(payload, ttl=60)
+            cache.local_cache.clear()
+            cache.get_cache_many(keys)
+        return round_trip, lambda: cache.clear_pattern("bench:*")
+
+    return [("cache.lru/1000_keys", lru), ("cache.redis_many/100_keys", redis_many)]
+
+
+def cases() -> List[Case]:
+    return _text_cases() + _model_cases() + _embedding_cases() + _cache_cases()
+
+
+def run(pattern: str = "", min_time: float = 0.5, min_calls: int = 5,
+        names: List[str] = None) -> Dict[str, Any]:
+    """Run every case whose name contains pattern (or only the named cases)
+
+    The calibration workload is timed right before each case, so a machine
+    that gets busier or quieter during the run shifts both alike.
+    """
+    results, skipped = {}, []
+    for name, setup in cases():
+        if pattern not in name or (names is not None and name not in names):
+            continue
+        prepared = setup()
+        if prepared is None:
+            skipped.append(name)
+            continue
+        func, teardown = prepared
+        try:
+            calibration_ms = calibrate()
+            results[name] = measure(func, min_time, min_calls)
+        finally:
+            if teardown:
+                teardown()
+        results[name]["calibration_ms"] = round(calibration_ms, 4)
+        results[name]["relative"] = round(results[name]["median_ms"] / calibration_ms, 6)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        },
+        "results": results,
+        "skipped": skipped
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE) -> Dict[str, Any]:
+    """Cases slower than baseline by more than tolerance (relative to calibration)"""
+    regressions, improvements, unchanged = [], [], []
+    baseline_results = baseline.get("results", {})
+    for name, result in current["results"].items():
+        reference = baseline_results.get(name)
+        if reference is None:
+            continue
+        ratio = result["relative"] / reference["relative"] if reference["relative"] else 1.0
+        entry = {"case": name, "ratio": round(ratio, 3),
+                 "median_ms": result["median_ms"], "baseline_median_ms": reference["median_ms"]}
+        if ratio > 1 + tolerance:
+            regressions.append(entry)
+        elif ratio < 1 / (1 + tolerance):
+            improvements.append(entry)
+        else:
+            unchanged.append(entry)
+    return {
+        "tolerance": tolerance,
+        "regressions": regressions,
+        "improvements": improvements,
+        "unchanged": unchanged,
+        "new_cases": sorted(set(current["results"]) - set(baseline_results))
+    }
+
+
+def fastest(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine two measurements of a case: the quietest case and calibration timings"""
+    best = min(first, second, key=lambda result: result["median_ms"])
+    calibration_ms = min(first["calibration_ms"], second["calibration_ms"])
+    return {**best, "calibration_ms": calibration_ms, "relative": round(best["median_ms"] / calibration_ms, 6)}
+
+
+def confirm(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = DEFAULT_TOLERANCE,
+            retries: int = 3, **run_options) -> Dict[str, Any]:
+    """Re-measure regressed cases, keeping each case's fastest run
+
+    A slowdown has to reproduce on every retry to be reported, which
+    filters out a neighbour process stealing the CPU for a few seconds.
+    """
+    for _ in range(retries):
+        regressed = [entry["case"] for entry in compare(current, baseline, tolerance)["regressions"]]
+        if not regressed:
+            break
+        for name, result in run(names=regressed, **run_options)["results"].items():
+            current["results"][name] = fastest(current["results"][name], result)
+    return compare(current, baseline, tolerance)
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def write_json(data: Dict[str, Any], path: str):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare against the baseline")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Fewer samples per case (noisier)")
+    parser.add_argument("--output", default="benchmark_results.json", help="Where to write this run's results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a case counts as a regression (0.5 = 50%%)")
+    parser.add_argument("--retries", type=int, default=3, help="Times a regressed case is re-measured")
+    parser.add_argument("--update-baseline", action="store_true", help="Write this run as the new baseline")
+    args = parser.parse_args()
+
+    run_options = {"min_time": 0.1 if args.quick else 0.5, "min_calls": 3 if args.quick else 5}
+    results = run(args.filter, **run_options)
+    print(f"📊 {len(results['results'])} cases measured (skipped: {', '.join(results['skipped']) or 'none'})")
+
+    if args.update_baseline:
+        # Fastest of several runs per case, like the retries of a comparison
+        for _ in range(args.retries):
+            for name, result in run(args.filter, **run_options)["results"].items():
+                results["results"][name] = fastest(results["results"][name], result)
+        write_json(results, args.output)
+        write_json(results, args.baseline)
+        print(f"✅ Baseline updated: {args.baseline}")
+        sys.exit(0)
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        write_json(results, args.output)
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline to record one")
+        sys.exit(0)
+
+    report = confirm(results, baseline, args.tolerance, args.retries, **run_options)
+    write_json({**results, "comparison": report}, args.output)
+    for entry in report["regressions"]:
+        print(f"❌ {entry['case']}: {entry['ratio']}x baseline ({entry['median_ms']} ms vs {entry['baseline_median_ms']} ms)")
+    for entry in report["improvements"]:
+        print(f"🚀 {entry['case']}: {entry['ratio']}x baseline")
+    print(f"{len(report['unchanged'])} unchanged, {len(report['improvements'])} faster, "
+          f"{len(report['regressions'])} slower than baseline (tolerance {args.tolerance:.0%})")
+    sys.exit(1 if report["regressions"] else 0)
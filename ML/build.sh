@@ -7,25 +7,7 @@ pip install --no-cache-dir fastapi==0.104.1 uvicorn==0.24.0 pydantic==2.5.0 pyth
 
 # Create necessary directories
 echo "📁 Setting up directories..."
-mkdir -p models logs nltk_data
-
-# Download required NLTK data
-echo "📚 Downloading NLTK data..."
-python -c "
-import nltk
-import os
-
-nltk_data_dir = './nltk_data'
-os.makedirs(nltk_data_dir, exist_ok=True)
-
-try:
-    nltk.download('punkt', download_dir=nltk_data_dir, quiet=True)
-    nltk.download('stopwords', download_dir=nltk_data_dir, quiet=True)
-    print('✅ NLTK data downloaded successfully')
-except Exception as e:
-    print(f'⚠️ NLTK download issue: {e}')
-    print('🔄 Continuing build...')
-"
+mkdir -p models logs
 
 # Now install the rest of requirements
 echo "📦 Installing remaining dependencies..."
@@ -35,6 +17,10 @@ pip install --no-cache-dir -r requirements.txt
 echo "🤖 Setting up ML models..."
 python scripts/download_models.py
 
+# Fit the TF-IDF/BM25 document frequencies (models/*-idf.*, not in git)
+echo "📐 Fitting match model IDF..."
+python scripts/train_models.py
+
 # Run basic health check
 echo "🧪 Running final health check..."
 if python -c "print('✅ Python is working')"; then
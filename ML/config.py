@@ -33,9 +33,20 @@ class Settings(BaseSettings):
     
     # Rate limiting
     rate_limit_per_minute: int = int(os.getenv("RATE_LIMIT_PER_MINUTE", "60"))
+    # Per-endpoint limits, e.g. "default=120,match=60,match_batch=10/60" (<endpoint>=<limit>[/<window s>])
+    rate_limits: str = os.getenv("RATE_LIMITS", "")
+    # Per-API-key limits replacing the endpoint ones, e.g. "<key>=600"
+    api_key_rate_limits: str = os.getenv("API_KEY_RATE_LIMITS", "")
     
     # Database & Cache
     redis_url: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    # Redis calls fail fast instead of hanging on a dead host; after
+    # REDIS_BREAKER_FAILURES consecutive failures the circuit opens and Redis
+    # is skipped (in-process cache only) for REDIS_BREAKER_RESET seconds
+    redis_socket_timeout: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.25"))
+    redis_connect_timeout: float = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.25"))
+    redis_breaker_failures: int = int(os.getenv("REDIS_BREAKER_FAILURES", "3"))
+    redis_breaker_reset: float = float(os.getenv("REDIS_BREAKER_RESET", "30"))
     mongo_uri: str = os.getenv("MONGO_URI", "mongodb://localhost:27017/trackruit")
     db_name: str = os.getenv("DB_NAME", "trackruit")
     
@@ -49,6 +60,12 @@ class Settings(BaseSettings):
     enable_sbert: bool = os.getenv("ENABLE_SBERT", "true").lower() == "true"
     enable_cache: bool = os.getenv("ENABLE_CACHE", "true").lower() == "true"
     enable_monitoring: bool = os.getenv("ENABLE_MONITORING", "true").lower() == "true"
+    warmup_models: bool = os.getenv("WARMUP_MODELS", "true").lower() == "true"
+    enable_tracing: bool = os.getenv("ENABLE_TRACING", "true").lower() == "true"
+    
+    # Span export: OTLP/JSON lines appended to a file and/or POSTed to an OTLP/HTTP collector
+    trace_file: str = os.getenv("TRACE_FILE", "")
+    trace_endpoint: str = os.getenv("TRACE_ENDPOINT", "")
     
     # Model Versions
     match_model_version: str = os.getenv("MATCH_MODEL_VERSION", "match-v1")
@@ -59,6 +76,22 @@ class Settings(BaseSettings):
     
     # Performance
     max_embedding_cache: int = int(os.getenv("MAX_EMBEDDING_CACHE", "1000"))
+    max_feature_cache: int = int(os.getenv("MAX_FEATURE_CACHE", "1000"))
+    local_cache_max_bytes: int = int(os.getenv("LOCAL_CACHE_MAX_BYTES", "0"))  # 0 = item count only
+    # Longest a worker serves its local copy of a Redis entry before re-reading it
+    local_cache_ttl: int = int(os.getenv("LOCAL_CACHE_TTL", "300"))
+    embedding_cache_dtype: str = os.getenv("EMBEDDING_CACHE_DTYPE", "float32")  # or float16
+    max_profiles: int = int(os.getenv("MAX_PROFILES", "5000"))
+    profile_ttl: int = int(os.getenv("PROFILE_TTL", "604800"))
+    # Seconds a worker serves its copy of the shared job index before checking Redis for changes
+    job_index_sync: float = float(os.getenv("JOB_INDEX_SYNC", "1.0"))
+    # Distinct tokens interned per process before new ones fall back to hashed ids
+    max_vocabulary_size: int = int(os.getenv("MAX_VOCABULARY_SIZE", "500000"))
+    
+    # Model executors: per-model thread/process pools, e.g. "ats=process:2:32,recommend=thread:4:16"
+    model_executors: str = os.getenv("MODEL_EXECUTORS", "")
+    executor_workers: int = int(os.getenv("EXECUTOR_WORKERS", "4"))
+    executor_queue_size: int = int(os.getenv("EXECUTOR_QUEUE_SIZE", "64"))
     batch_size: int = int(os.getenv("BATCH_SIZE", "32"))
     max_text_length: int = int(os.getenv("MAX_TEXT_LENGTH", "10000"))
     
@@ -0,0 +1,24 @@
+"""
+Gunicorn hooks (loaded automatically from the working directory)
+
+Prometheus metrics are shared between workers through files in
+PROMETHEUS_MULTIPROC_DIR: stale files are cleared when the master starts
+and an exited worker's live gauges are dropped.
+"""
+
+import glob
+import os
+
+
+def on_starting(server):
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
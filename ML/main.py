@@ -1,4 +1,6 @@
 import os
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
@@ -7,15 +9,43 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from config import Settings, get_settings
+from models.warmup import readiness, warmup
+from utils.metrics import MetricsMiddleware
+from utils.logger import setup_logger
+from utils.tracing import TracingMiddleware
 from routes import (
     match, 
     recommend, 
     interview, 
     feedback, 
     ats, 
-    health
+    health,
+    jobs,
+    profiles,
+    analyze
 )
 
+async def _warmup():
+    state = await warmup()
+    if state.ready:
+        print(f"🔥 Models warmed up: {state.report()['models']}")
+    else:
+        print(f"⚠️ Warmup failed: {state.error}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm models up in the background; /ml/ready passes once they are warm"""
+    # Request and prediction logs (JSON unless DEBUG) carry the request id
+    setup_logger()
+    task = None
+    if get_settings().warmup_models:
+        task = asyncio.create_task(_warmup())
+    else:
+        readiness.disable()
+    yield
+    if task is not None and not task.done():
+        task.cancel()
+
 def create_app() -> FastAPI:
     """Create and configure FastAPI application"""
     settings = get_settings()
@@ -26,7 +56,8 @@ def create_app() -> FastAPI:
         version="1.0.0",
         docs_url="/ml/docs",
         redoc_url="/ml/redoc",
-        openapi_url="/ml/openapi.json"
+        openapi_url="/ml/openapi.json",
+        lifespan=lifespan
     )
 
     # CORS Middleware
@@ -38,13 +69,24 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Request count/latency per route for /ml/metrics
+    if settings.enable_monitoring:
+        app.add_middleware(MetricsMiddleware)
+
+    # Request id, per-stage spans and Server-Timing header on every response
+    if settings.enable_tracing:
+        app.add_middleware(TracingMiddleware)
+
     # Include routers
     app.include_router(health.router, prefix="/ml", tags=["Health"])
     app.include_router(match.router, prefix="/ml", tags=["Matching"])
     app.include_router(recommend.router, prefix="/ml", tags=["Recommendation"])
+    app.include_router(jobs.router, prefix="/ml", tags=["Job Index"])
+    app.include_router(profiles.router, prefix="/ml", tags=["Resume Profiles"])
     app.include_router(interview.router, prefix="/ml", tags=["Interview"])
     app.include_router(feedback.router, prefix="/ml", tags=["Feedback"])
     app.include_router(ats.router, prefix="/ml", tags=["ATS"])
+    app.include_router(analyze.router, prefix="/ml", tags=["Analysis"])
 
     @app.get("/")
     async def root():
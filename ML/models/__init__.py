@@ -1,13 +1,22 @@
-from .match_model import MatchModel
-from .recommend_model import RecommendModel
-from .interview_model import InterviewModel
-from .feedback_model import FeedbackModel
-from .ats_model import ATSModel
+import importlib
+
+from .registry import ModelRegistry, model_registry, MODEL_CLASSES
+
+# Model classes are imported on first access, like the registry loads them
+_MODEL_EXPORTS = {class_name: module_name for module_name, class_name in MODEL_CLASSES.values()}
 
 __all__ = [
     "MatchModel",
     "RecommendModel", 
     "InterviewModel",
     "FeedbackModel",
-    "ATSModel"
-]
\ No newline at end of file
+    "ATSModel",
+    "ModelRegistry",
+    "model_registry"
+]
+
+
+def __getattr__(name):
+    if name not in _MODEL_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_MODEL_EXPORTS[name]), name)
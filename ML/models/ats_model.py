@@ -1,8 +1,9 @@
-import re
 from typing import Dict, List, Any
 import logging
 from .base_model import BaseModel
 from pipelines.preprocess import preprocessor
+from pipelines.document import ATS_SECTION_PATTERNS, parse_document
+from utils.tracing import traced
 
 # Set up logger
 logger = logging.getLogger("ats_model")
@@ -17,11 +18,7 @@ class ATSModel(BaseModel):
     def _init_ml_components(self):
         """Initialize ML-specific components"""
         # ML Feature: Section detection patterns
-        self.section_patterns = {
-            'experience': r'(experience|work history|employment|professional)',
-            'education': r'(education|academic|qualifications|degree)',
-            'skills': r'(skills|technical skills|competencies|proficiencies)'
-        }
+        self.section_patterns = ATS_SECTION_PATTERNS
         
         # ML Feature: ATS scoring weights (calibrated for more realistic scores)
         self.weights = {
@@ -51,42 +48,41 @@ class ATSModel(BaseModel):
     
     def _advanced_clean(self, text: str) -> str:
         """ML Feature: Advanced text cleaning for resume analysis"""
-        if not text:
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs, emails, phone numbers
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', '', text)
-        
-        # ML Feature: Preserve important resume structure
-        text = re.sub(r'[^\w\s\.\,\!\\?\-\:\;]', ' ', text)
-        
-        # Remove extra whitespace but preserve paragraph breaks
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return preprocessor.clean_structured_text(text)
+    
+    def extract_features(self, resume_text: str) -> Dict[str, Any]:
+        """ML Feature: Resume-side signals the ATS score is computed from"""
+        document = parse_document(resume_text)
+        return {
+            'word_count': document.structured_word_count,
+            'sections_found': document.ats_sections,
+            'has_contact': document.has_contact,
+            'achievement_score': self._calculate_achievement_score_ml(
+                document.achievement_count, document.structured_word_count
+            )
+        }
     
     def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """ML Prediction: Analyze ATS compatibility with ML scoring and better error handling"""
         try:
-            processed_data = self.preprocess(data)
-            resume_text = processed_data['resume_text']
+            profile = data.get('resume_profile')
+            if profile is not None:
+                # Features precomputed by POST /ml/profiles
+                features = profile['ats']
+            else:
+                features = self.extract_features(data.get('resume_text', ''))
             
-            if not resume_text:
+            if not features['word_count']:
                 return self._get_empty_response()
             
             # ML Feature: Calculate ATS score using weighted components
-            ats_score = self._calculate_ml_ats_score(resume_text)
+            ats_score = self._calculate_ml_ats_score(features)
             
             # Apply calibration for more realistic scores
             calibrated_ats_score = self._calibrate_ats_score(ats_score)
             
             # ML Feature: Find ATS issues using pattern recognition
-            issues = self._find_ats_issues_ml(resume_text)
+            issues = self._find_ats_issues_ml(features)
             
             # ML Feature: Generate intelligent recommendations
             recommendations = self._generate_ml_recommendations(calibrated_ats_score, issues)
@@ -109,38 +105,31 @@ class ATSModel(BaseModel):
         calibrated = min(score * 1.4, 0.95)  # Scale up but cap at 0.95
         return max(calibrated, 0.2)  # Ensure minimum reasonable score
     
-    def _calculate_ml_ats_score(self, resume_text: str) -> float:
+    @traced("scoring")
+    def _calculate_ml_ats_score(self, features: Dict[str, Any]) -> float:
         """ML Feature: Calculate ATS score using machine learning principles - CALIBRATED"""
         score = 0.0
         
         # ML Component: Section detection using regex patterns - MORE GENEROUS
-        sections_found = self._detect_sections_ml(resume_text)
+        sections_found = features['sections_found']
         section_score = min(len(sections_found) / len(self.section_patterns) * 1.2, 1.0)
         score += section_score * self.weights['sections']
         
         # ML Component: Optimal length scoring - WIDER ACCEPTABLE RANGE
-        word_count = len(resume_text.split())
+        word_count = features['word_count']
         length_score = self._calculate_length_score_ml(word_count)
         score += length_score * self.weights['length']
         
         # ML Component: Contact information detection - BASE SCORE EVEN IF MISSING
-        contact_score = 0.8 if self._has_contact_info_ml(resume_text) else 0.4
+        contact_score = 0.8 if features['has_contact'] else 0.4
         score += contact_score * self.weights['contact']
         
         # ML Component: Achievement quantification - MORE GENEROUS
-        achievement_score = min(self._calculate_achievement_score_ml(resume_text) * 1.3, 1.0)
+        achievement_score = min(features['achievement_score'] * 1.3, 1.0)
         score += achievement_score * self.weights['achievements']
         
         return min(score, 1.0)
     
-    def _detect_sections_ml(self, resume_text: str) -> List[str]:
-        """ML Feature: Detect resume sections using pattern matching"""
-        found_sections = []
-        for section, pattern in self.section_patterns.items():
-            if re.search(pattern, resume_text, re.IGNORECASE):
-                found_sections.append(section)
-        return found_sections
-    
     def _calculate_length_score_ml(self, word_count: int) -> float:
         """ML Feature: Calculate optimal resume length score - CALIBRATED"""
         # Based on ATS research but with wider acceptable ranges
@@ -153,55 +142,39 @@ class ATSModel(BaseModel):
         else:
             return 0.3
     
-    def _has_contact_info_ml(self, resume_text: str) -> bool:
-        """ML Feature: Detect contact information"""
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        return bool(re.search(email_pattern, resume_text))
-    
-    def _calculate_achievement_score_ml(self, resume_text: str) -> float:
+    def _calculate_achievement_score_ml(self, indicator_count: int, word_count: int) -> float:
         """ML Feature: Quantify achievement-oriented language - CALIBRATED"""
-        achievement_indicators = [
-            r'\d+%', r'increased', r'decreased', r'improved', r'reduced',
-            r'saved', r'achieved', r'developed', r'managed', r'led'
-        ]
-        
-        indicator_count = 0
-        for indicator in achievement_indicators:
-            matches = re.findall(indicator, resume_text, re.IGNORECASE)
-            indicator_count += len(matches)
-        
         # Normalize score based on text length - MORE GENEROUS THRESHOLD
-        word_count = len(resume_text.split())
         if word_count == 0:
             return 0.0
         
         density = indicator_count / (word_count / 100)  # per 100 words
         return min(density / 3.0, 1.0)  # More generous: Max 3 indicators per 100 words for full score
     
-    def _find_ats_issues_ml(self, resume_text: str) -> List[str]:
+    def _find_ats_issues_ml(self, features: Dict[str, Any]) -> List[str]:
         """ML Feature: Intelligent issue detection - CALIBRATED THRESHOLDS"""
         issues = []
         
         # Check sections using ML detection - MORE LENIENT
-        sections_found = self._detect_sections_ml(resume_text)
+        sections_found = features['sections_found']
         missing_sections = set(self.section_patterns.keys()) - set(sections_found)
         
         for section in missing_sections:
             issues.append(f"Missing {section.capitalize()} section")
         
         # Check length - WIDER ACCEPTABLE RANGES
-        word_count = len(resume_text.split())
+        word_count = features['word_count']
         if word_count < 150:  # More lenient minimum
             issues.append("Resume is too short (less than 150 words)")
         elif word_count > 2000:  # More lenient maximum
             issues.append("Resume is too long (more than 2000 words)")
         
         # Check contact info - SUGGESTION INSTEAD OF ERROR
-        if not self._has_contact_info_ml(resume_text):
+        if not features['has_contact']:
             issues.append("Consider adding professional email address")
         
         # Check achievements - HIGHER THRESHOLD
-        achievement_score = self._calculate_achievement_score_ml(resume_text)
+        achievement_score = features['achievement_score']
         if achievement_score < 0.4:  # Higher threshold
             issues.append("Add more quantifiable achievements and action verbs")
         
@@ -269,5 +242,9 @@ class ATSModel(BaseModel):
             "model_version": self.get_version()
         }
 
-# Global ML model instance
-ats_model = ATSModel()
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve the shared ats_model instance lazily from the model registry"""
+    if name == "ats_model":
+        from .registry import model_registry
+        return model_registry.get("ats")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,9 @@
-import re
 from typing import Dict, List, Any
 import logging
 from .base_model import BaseModel
 from pipelines.preprocess import preprocessor
+from pipelines.document import IMPACT_VERBS, count_impact_verbs, parse_document
+from utils.tracing import traced
 
 # Set up logger
 logger = logging.getLogger("feedback_model")
@@ -33,10 +34,7 @@ class FeedbackModel(BaseModel):
         }
         
         # ML Feature: Impact indicators for achievement detection
-        self.impact_verbs = [
-            'increased', 'decreased', 'improved', 'reduced', 'saved',
-            'achieved', 'developed', 'managed', 'led', 'implemented'
-        ]
+        self.impact_verbs = IMPACT_VERBS
     
     def _create_default_model(self):
         """Create default ML feedback model"""
@@ -55,20 +53,42 @@ class FeedbackModel(BaseModel):
             'original_data': data
         }
     
+    def extract_features(self, resume_text: str) -> Dict[str, Any]:
+        """ML Feature: Role-independent signals of a resume"""
+        document = parse_document(resume_text)
+        return {
+            'impact_verbs': document.impact_verbs,
+            'experience_impact_verbs': document.experience_impact_verbs
+        }
+    
     def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """ML Prediction: Generate comprehensive resume feedback with better error handling"""
         try:
-            processed_data = self.preprocess(data)
-            resume_text = processed_data['resume_text']
-            target_role = processed_data['target_role']
+            target_role = data.get('target_role', 'software developer').lower()
+            profile = data.get('resume_profile')
+            
+            if profile is not None:
+                # Artifacts precomputed by POST /ml/profiles
+                resume_text = profile['text']
+                skills = profile['skills']
+                sections = profile['sections']
+                features = profile['feedback']
+            else:
+                # ML Analysis: Shared parse of the resume text
+                document = parse_document(data.get('resume_text', ''))
+                resume_text = document.text
+                if not resume_text:
+                    return self._get_empty_response()
+                skills = document.skills
+                sections = document.sections
+                features = {
+                    'impact_verbs': document.impact_verbs,
+                    'experience_impact_verbs': document.experience_impact_verbs
+                }
             
             if not resume_text:
                 return self._get_empty_response()
             
-            # ML Analysis: Extract features
-            skills = preprocessor.extract_skills(resume_text)
-            sections = preprocessor.extract_sections(resume_text)
-            
             # ML Scoring: Calculate component scores with calibration
             structure_score = self._calculate_ml_structure_score(sections, resume_text)
             keyword_score = self._calculate_ml_keyword_score(resume_text, target_role)
@@ -90,7 +110,7 @@ class FeedbackModel(BaseModel):
             # ML Feedback Generation
             feedback = self._generate_ml_feedback(
                 calibrated_structure_score, calibrated_keyword_score, calibrated_skill_score, 
-                sections, skills, target_role
+                sections, skills, target_role, features['experience_impact_verbs']
             )
             
             # Return with proper ML model version
@@ -104,7 +124,7 @@ class FeedbackModel(BaseModel):
                     "character_count": len(resume_text),
                     "skills_found": len(skills),
                     "sections_found": len(sections),
-                    "impact_verbs": self._count_impact_verbs(resume_text)
+                    "impact_verbs": features['impact_verbs']
                 },
                 "skills_found": skills[:15],
                 "sections_found": list(sections.keys()),
@@ -122,6 +142,7 @@ class FeedbackModel(BaseModel):
         calibrated = min(score * 1.3, 0.95)  # Scale up but cap at 0.95
         return max(calibrated, 0.1)  # Ensure minimum score
     
+    @traced("scoring")
     def _calculate_ml_structure_score(self, sections: Dict[str, str], resume_text: str) -> float:
         """ML Feature: Calculate structure score using ML principles - CALIBRATED"""
         score = 0.0
@@ -150,6 +171,7 @@ class FeedbackModel(BaseModel):
         
         return min(score, 1.0)
     
+    @traced("scoring")
     def _calculate_ml_keyword_score(self, resume_text: str, target_role: str) -> float:
         """ML Feature: Calculate keyword relevance score - CALIBRATED"""
         # Get relevant keywords for target role
@@ -179,6 +201,7 @@ class FeedbackModel(BaseModel):
         final_score = (coverage * 0.7) + (min(keyword_density * 0.3, 0.3))
         return min(final_score, 1.0)
     
+    @traced("scoring")
     def _calculate_ml_skill_score(self, skills: List[str], target_role: str) -> float:
         """ML Feature: Calculate skill relevance and quantity score - CALIBRATED"""
         if not skills:
@@ -204,14 +227,12 @@ class FeedbackModel(BaseModel):
     
     def _count_impact_verbs(self, resume_text: str) -> int:
         """ML Feature: Count impact-oriented verbs"""
-        count = 0
-        for verb in self.impact_verbs:
-            count += len(re.findall(r'\b' + re.escape(verb) + r'\b', resume_text.lower()))
-        return count
+        return count_impact_verbs(resume_text)
     
+    @traced("scoring")
     def _generate_ml_feedback(self, structure_score: float, keyword_score: float, 
                             skill_score: float, sections: Dict[str, str], 
-                            skills: List[str], target_role: str) -> List[str]:
+                            skills: List[str], target_role: str, experience_impact: int = None) -> List[str]:
         """ML Feature: Generate intelligent, actionable feedback"""
         feedback = []
         
@@ -240,7 +261,9 @@ class FeedbackModel(BaseModel):
             feedback.append("Consider focusing on your most relevant skills (quality over quantity).")
         
         # Achievement-based feedback
-        impact_count = self._count_impact_verbs(sections.get('experience', ''))
+        impact_count = experience_impact
+        if impact_count is None:
+            impact_count = self._count_impact_verbs(sections.get('experience', ''))
         if impact_count < 3:
             feedback.append("Use more action verbs and quantify achievements in your Experience section.")
         
@@ -304,5 +327,9 @@ class FeedbackModel(BaseModel):
             "model_version": self.get_version()
         }
 
-# Global ML model instance
-feedback_model = FeedbackModel()
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve the shared feedback_model instance lazily from the model registry"""
+    if name == "feedback_model":
+        from .registry import model_registry
+        return model_registry.get("feedback")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,6 +4,7 @@ import joblib
 
 from .base_model import BaseModel
 from config import get_settings
+from utils.tracing import traced
 
 settings = get_settings()
 
@@ -18,6 +19,7 @@ class InterviewModel(BaseModel):
         """Create default interview model (heuristic)"""
         self.is_loaded = True
     
+    @traced("preprocess")
     def preprocess(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Preprocess interview prediction features"""
         # Extract features
@@ -65,6 +67,7 @@ class InterviewModel(BaseModel):
             print(f"Error in interview prediction: {e}")
             return self._error_response(str(e))
     
+    @traced("scoring")
     def _rule_based_prediction(self, features: Dict[str, Any]) -> float:
         """Rule-based prediction for interview success"""
         score = 0.0
@@ -180,5 +183,9 @@ class InterviewModel(BaseModel):
             "error": error_msg
         }
 
-# Global model instance
-interview_model = InterviewModel()
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve the shared interview_model instance lazily from the model registry"""
+    if name == "interview_model":
+        from .registry import model_registry
+        return model_registry.get("interview")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
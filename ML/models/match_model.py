@@ -1,12 +1,15 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from typing import Dict, List, Any
 import logging
 
 from .base_model import BaseModel
 from config import get_settings
 from pipelines.preprocess import preprocessor
+from pipelines.lexical import TermVector, lexical_index
+from pipelines.document import parse_document
+from pipelines.sparse_scoring import jaccard
+from pipelines.vocabulary import token_vocabulary
+from utils.tracing import traced
 
 settings = get_settings()
 
@@ -18,16 +21,13 @@ class MatchModel(BaseModel):
     
     def __init__(self, version: str = None):
         super().__init__("match", version or settings.match_model_version)
-        self.vectorizer = None
         self.ensure_loaded()
     
     def _create_default_model(self):
-        """Create TF-IDF vectorizer"""
-        self.vectorizer = TfidfVectorizer(
-            max_features=1000,
-            stop_words='english',
-            ngram_range=(1, 2)
-        )
+        """Use the corpus-fitted IDF for tfidf/bm25 scoring"""
+        self.lexical_index = lexical_index
+        if not lexical_index.is_fitted:
+            self.logger.info("No fitted IDF found; tfidf/bm25 scoring uses indexed jobs only")
         self.is_loaded = True
     
     def preprocess(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -38,63 +38,150 @@ class MatchModel(BaseModel):
         return {
             'resume_text': preprocessor.clean_text(resume_text),
             'job_description': preprocessor.clean_text(job_description),
+            'scoring': data.get('scoring') or 'jaccard',
             'original_data': data
         }
     
     def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate resume-job match score with graceful error handling"""
         try:
-            processed_data = self.preprocess(data)
-            resume_text = processed_data['resume_text']
-            job_description = processed_data['job_description']
+            scoring = data.get('scoring') or 'jaccard'
+            profile = data.get('resume_profile')
+            if profile is not None:
+                resume = self._profile_features(profile, scoring)
+            else:
+                resume = self._cached_text_features(data.get('resume_text', ''), scoring)
+            job = self._cached_text_features(data.get('job_description', ''), scoring)
             
-            if not resume_text or not job_description:
+            if not resume['text'] or not job['text']:
                 return self._get_empty_response()
             
-            # Calculate similarity using basic word overlap
-            similarity_score = self._calculate_similarity(resume_text, job_description)
-            
-            # Extract skills
-            resume_skills = preprocessor.extract_skills(resume_text)
-            job_skills = preprocessor.extract_skills(job_description)
-            
-            # Calculate skill match
-            common_skills = set(resume_skills) & set(job_skills)
-            skill_match = len(common_skills) / len(job_skills) if job_skills else 0
-            
-            # Combined score - more realistic weighting
-            match_score = (similarity_score * 0.7) + (skill_match * 0.3)
-            
-            result = {
-                "match_score": round(match_score, 4),
-                "similarity_score": round(similarity_score, 4),
-                "skill_match": round(skill_match, 4),
-                "top_skills_matched": list(common_skills)[:10],
-                "missing_skills": list(set(job_skills) - set(resume_skills))[:10],
-                "model_version": self.get_version()
-            }
-            
-            return result
+            return self._score(resume, job, scoring)
             
         except Exception as e:
             logger.error(f"Match prediction error: {e}")
             # Return graceful fallback instead of failing completely
             return self._get_error_response(str(e))
     
+    def predict_batch(self, pairs: List[Dict[str, Any]], scoring: str = 'jaccard') -> List[Dict[str, Any]]:
+        """Score many resume/job pairs, cleaning and skill-extracting each distinct text once
+        
+        Results come back in input order; a failing item carries an "error"
+        key instead of failing the whole batch. The batch runs sequentially
+        within its one call on the "match" executor: scoring is CPU-bound
+        Python, so extra threads would only add GIL contention and bypass
+        the executor's queue bounds.
+        """
+        unique_texts = list(dict.fromkeys(
+            text for pair in pairs for text in (pair.get('resume_text', ''), pair.get('job_description', ''))
+        ))
+        
+        features = {text: self._safe_text_features(text, scoring) for text in unique_texts}
+        
+        def score_pair(pair: Dict[str, Any]) -> Dict[str, Any]:
+            resume = features[pair.get('resume_text', '')]
+            job = features[pair.get('job_description', '')]
+            for item in (resume, job):
+                if isinstance(item, Exception):
+                    return {"error": f"Text analysis failed: {item}"}
+            if not resume['text'] or not job['text']:
+                return {"error": "Missing resume text or job description"}
+            try:
+                return self._score(resume, job, scoring)
+            except Exception as e:
+                logger.error(f"Batch match scoring error: {e}")
+                return {"error": str(e)}
+        
+        return [score_pair(pair) for pair in pairs]
+    
+    def predict_profile(self, profile: Dict[str, Any], job_descriptions: List[str],
+                        scoring: str = 'jaccard') -> List[Dict[str, Any]]:
+        """Score one resume profile against several job descriptions, in input order"""
+        resume = self._profile_features(profile, scoring)
+        results = []
+        for description in job_descriptions:
+            try:
+                job = self._cached_text_features(description, scoring)
+                if not resume['text'] or not job['text']:
+                    results.append(self._get_empty_response())
+                else:
+                    results.append(self._score(resume, job, scoring))
+            except Exception as e:
+                logger.error(f"Match prediction error: {e}")
+                results.append(self._get_error_response(str(e)))
+        return results
+    
+    def _cached_text_features(self, text: str, scoring: str = 'jaccard') -> Dict[str, Any]:
+        """Features of a raw text from its shared parse, analyzed once per distinct text"""
+        document = parse_document(text)
+        return {
+            'text': document.text,
+            'token_ids': document.token_ids,
+            'skills': document.skills,
+            'terms': document.terms if scoring != 'jaccard' else None
+        }
+    
+    @staticmethod
+    def _profile_features(profile: Dict[str, Any], scoring: str = 'jaccard') -> Dict[str, Any]:
+        """Text features of a stored resume profile, without re-analyzing the text"""
+        return {
+            'text': profile['text'],
+            'token_ids': token_vocabulary.encode(profile['tokens']),
+            'skills': profile['skills'],
+            'terms': TermVector(profile['term_counts']) if scoring != 'jaccard' else None
+        }
+    
+    def _safe_text_features(self, text: str, scoring: str = 'jaccard'):
+        """Cached text features, returning the exception instead of raising"""
+        try:
+            return self._cached_text_features(text, scoring)
+        except Exception as e:
+            logger.error(f"Text analysis error: {e}")
+            return e
+    
+    @traced("scoring")
+    def _score(self, resume: Dict[str, Any], job: Dict[str, Any], scoring: str = 'jaccard') -> Dict[str, Any]:
+        """Score a resume against a job from their precomputed features"""
+        if scoring == 'tfidf':
+            similarity_score = self.lexical_index.tfidf_similarity(resume['terms'], job['terms'])
+        elif scoring == 'bm25':
+            # The job is the query: how much of it does the resume cover
+            similarity_score = self.lexical_index.bm25_similarity(job['terms'], resume['terms'])
+        else:
+            # Calculate similarity using basic word overlap
+            similarity_score = self._similarity_from_ids(resume['token_ids'], job['token_ids'])
+        
+        resume_skills = resume['skills']
+        job_skills = job['skills']
+        
+        # Calculate skill match
+        common_skills = set(resume_skills) & set(job_skills)
+        skill_match = len(common_skills) / len(job_skills) if job_skills else 0
+        
+        # Combined score - more realistic weighting
+        match_score = (similarity_score * 0.7) + (skill_match * 0.3)
+        
+        return {
+            "match_score": round(match_score, 4),
+            "similarity_score": round(similarity_score, 4),
+            "skill_match": round(skill_match, 4),
+            "top_skills_matched": list(common_skills)[:10],
+            "missing_skills": list(set(job_skills) - set(resume_skills))[:10],
+            "scoring": scoring,
+            "model_version": self.get_version()
+        }
+    
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate text similarity using basic word overlap"""
+        return self._similarity_from_ids(
+            token_vocabulary.encode(text1.lower().split()), token_vocabulary.encode(text2.lower().split())
+        )
+    
+    def _similarity_from_ids(self, ids1: np.ndarray, ids2: np.ndarray) -> float:
+        """Scaled Jaccard similarity of two sorted token id arrays"""
         try:
             # Simple word overlap similarity (Jaccard similarity)
-            words1 = set(text1.lower().split())
-            words2 = set(text2.lower().split())
-            
-            if not words1 or not words2:
-                return 0.0
-            
-            intersection = words1.intersection(words2)
-            union = words1.union(words2)
-            
-            similarity = len(intersection) / len(union) if union else 0.0
+            similarity = jaccard(ids1, ids2)
             return min(similarity * 1.2, 1.0)  # Scale up slightly for better ranges
             
         except Exception as e:
@@ -150,5 +237,9 @@ class MatchModel(BaseModel):
             "note": "Basic scoring due to service issue"
         }
 
-# Global model instance
-match_model = MatchModel()
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve the shared match_model instance lazily from the model registry"""
+    if name == "match_model":
+        from .registry import model_registry
+        return model_registry.get("match")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,15 @@
+import heapq
 import numpy as np
 from typing import Dict, List, Any
 
 from .base_model import BaseModel
 from config import get_settings
 from pipelines.preprocess import preprocessor
+from pipelines.job_index import job_index
+from pipelines.document import parse_document
+from pipelines.sparse_scoring import JobMatrix, jaccard, round_scores
+from pipelines.vocabulary import token_vocabulary
+from utils.tracing import traced
 
 settings = get_settings()
 
@@ -17,86 +23,121 @@ class RecommendModel(BaseModel):
     def _create_default_model(self):
         self.is_loaded = True
     
-    def preprocess(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Preprocess input data for recommendation"""
-        resume_text = data.get('resume_text', '')
-        job_pool = data.get('job_pool', [])
-        
-        return {
-            'resume_text': preprocessor.clean_text(resume_text),
-            'job_pool': job_pool,
-            'original_data': data
-        }
-    
     def predict(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Generate job recommendations"""
         try:
-            processed_data = self.preprocess(data)
-            resume_text = processed_data['resume_text']
-            job_pool = processed_data['job_pool']
+            job_pool = data.get('job_pool')
+            # Without an explicit job pool, recommend from the server-side job index
+            use_index = job_pool is None
+            profile = data.get('resume_profile')
             
-            if not resume_text or not job_pool:
-                return self._get_empty_response()
-            
-            # Extract resume skills
-            resume_skills = preprocessor.extract_skills(resume_text)
+            # Resume features from the stored profile or the shared parse
+            if profile is not None:
+                resume_text = profile['text']
+                resume_tokens = token_vocabulary.encode(profile['tokens'])
+                resume_skills = profile['skills']
+            else:
+                document = parse_document(data.get('resume_text', ''))
+                resume_text = document.text
+                resume_tokens = document.token_ids
+                resume_skills = document.skills
             
-            # Score each job
-            scored_jobs = []
-            for job in job_pool:
-                job_description = job.get('description', '')
-                job_skills = preprocessor.extract_skills(job_description)
-                
-                # Calculate skill match
-                common_skills = set(resume_skills) & set(job_skills)
-                skill_match = len(common_skills) / len(job_skills) if job_skills else 0
-                
-                # Simple text similarity
-                similarity = self._calculate_similarity(resume_text, job_description)
-                
-                # Combined score
-                match_score = (similarity * 0.6) + (skill_match * 0.4)
-                
-                scored_jobs.append({
-                    **job,
-                    'match_score': round(match_score, 4),
-                    'skill_match': round(skill_match, 4),
-                    'common_skills': list(common_skills)[:5]
-                })
+            if not resume_text or not (job_pool or use_index):
+                return self._get_empty_response()
             
-            # Sort by match score
-            scored_jobs.sort(key=lambda x: x['match_score'], reverse=True)
+            if use_index:
+                return self._predict_from_index(data, resume_tokens, resume_skills)
             
-            # Get max recommendations
-            max_recs = data.get('max_recommendations', 5)
-            recommended_jobs = scored_jobs[:max_recs]
+            # Score the whole pool with sparse matrix products
+            pool_skills = [preprocessor.extract_skills(job.get('description', '')) for job in job_pool]
+            matrix = JobMatrix.from_features(
+                (job.get('description', '').lower().split(), job_skills)
+                for job, job_skills in zip(job_pool, pool_skills)
+            )
             
-            return {
-                "recommended_jobs": recommended_jobs,
-                "total_jobs_considered": len(job_pool),
-                "resume_skills_found": resume_skills[:10],
-                "model_version": self.get_version()
-            }
+            return self._rank(job_pool, pool_skills, matrix, resume_tokens, resume_skills,
+                              data, total_considered=len(job_pool))
             
         except Exception as e:
             print(f"Error in recommendation: {e}")
             return self._get_error_response(str(e))
     
+    @traced("scoring")
+    def _predict_from_index(self, data: Dict[str, Any], resume_tokens: np.ndarray, resume_skills: List[str]) -> Dict[str, Any]:
+        """Retrieve the top indexed postings, pruning those that cannot make the cut"""
+        job_index.sync()
+        matrix, job_ids = job_index.matrix()
+        
+        allowed = job_index.allowed_ids(data.get('filters'))
+        allowed_mask = None
+        if allowed is not None:
+            allowed_mask = np.fromiter((job_id in allowed for job_id in job_ids), dtype=bool, count=len(job_ids))
+        
+        top, documents_scored = matrix.top_k(
+            resume_tokens, resume_skills, data.get('max_recommendations', 5), allowed_mask
+        )
+        
+        resume_skill_set = set(resume_skills)
+        recommended_jobs = []
+        for row, match_score, skill_match in top:
+            job_id = job_ids[row]
+            job = job_index.get(job_id)
+            if job is None:
+                # Deleted after the matrix snapshot was taken
+                continue
+            job_skills = job_index.skills(job_id)
+            recommended_jobs.append({
+                **job,
+                'match_score': match_score,
+                'skill_match': skill_match,
+                'common_skills': [skill for skill in job_skills if skill in resume_skill_set][:5]
+            })
+        
+        return {
+            "recommended_jobs": recommended_jobs,
+            "total_jobs_considered": len(job_ids) if allowed is None else len(allowed),
+            "documents_scored": documents_scored,
+            "index_size": len(job_index),
+            "resume_skills_found": resume_skills[:10],
+            "model_version": self.get_version()
+        }
+    
+    @traced("scoring")
+    def _rank(self, jobs: List[Dict[str, Any]], pool_skills: List[List[str]],
+              matrix: JobMatrix, resume_tokens: np.ndarray, resume_skills: List[str], data: Dict[str, Any],
+              total_considered: int) -> Dict[str, Any]:
+        """Score every job (matrix row) and keep the top recommendations"""
+        _, skill_match, match_score = matrix.score(resume_tokens, resume_skills)
+        
+        # Rank on rounded scores; nlargest is stable, like sort + slice
+        rounded = round_scores(match_score)
+        max_recs = data.get('max_recommendations', 5)
+        top = heapq.nlargest(max_recs, range(len(jobs)), key=rounded.__getitem__)
+        
+        resume_skill_set = set(resume_skills)
+        recommended_jobs = []
+        for position in top:
+            job = jobs[position]
+            job_skills = pool_skills[position]
+            recommended_jobs.append({
+                **job,
+                'match_score': rounded[position],
+                'skill_match': round(float(skill_match[position]), 4),
+                'common_skills': [skill for skill in job_skills if skill in resume_skill_set][:5]
+            })
+        
+        return {
+            "recommended_jobs": recommended_jobs,
+            "total_jobs_considered": total_considered,
+            "resume_skills_found": resume_skills[:10],
+            "model_version": self.get_version()
+        }
+    
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """Calculate basic text similarity"""
         try:
             # Simple word overlap similarity
-            words1 = set(text1.lower().split())
-            words2 = set(text2.lower().split())
-            
-            if not words1 or not words2:
-                return 0.0
-            
-            intersection = words1.intersection(words2)
-            union = words1.union(words2)
-            
-            similarity = len(intersection) / len(union) if union else 0.0
-            return similarity
+            return jaccard(token_vocabulary.encode(text1.lower().split()), token_vocabulary.encode(text2.lower().split()))
             
         except Exception as e:
             print(f"Similarity calculation error: {e}")
@@ -134,5 +175,9 @@ class RecommendModel(BaseModel):
             "error": error_msg
         }
 
-# Global model instance
-recommend_model = RecommendModel()
\ No newline at end of file
+def __getattr__(name: str):
+    """Resolve the shared recommend_model instance lazily from the model registry"""
+    if name == "recommend_model":
+        from .registry import model_registry
+        return model_registry.get("recommend")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
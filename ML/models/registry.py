@@ -0,0 +1,126 @@
+import importlib
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config import get_settings
+
+settings = get_settings()
+
+# Model type -> (module, class) so only the models actually used get imported
+MODEL_CLASSES = {
+    "match": ("models.match_model", "MatchModel"),
+    "recommend": ("models.recommend_model", "RecommendModel"),
+    "interview": ("models.interview_model", "InterviewModel"),
+    "feedback": ("models.feedback_model", "FeedbackModel"),
+    "ats": ("models.ats_model", "ATSModel")
+}
+
+
+def _rss_bytes() -> int:
+    """Resident set size of this process (0 if unavailable)"""
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """Process-wide model instances, created lazily and keyed by (type, version)
+
+    Routes, health checks and scripts all go through the registry, so each
+    model is built once per process. Load time and the RSS growth observed
+    while loading are recorded for reporting.
+    """
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._load_info: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def default_version(model_type: str) -> str:
+        return getattr(settings, f"{model_type}_model_version")
+
+    def _key(self, model_type: str, version: Optional[str]) -> Tuple[str, str]:
+        if model_type not in MODEL_CLASSES:
+            raise KeyError(f"Unknown model type: {model_type}")
+        return model_type, version or self.default_version(model_type)
+
+    def get(self, model_type: str, version: str = None):
+        """Get a model instance, loading it on first use"""
+        key = self._key(model_type, version)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._load(key)
+        return model
+
+    def _load(self, key: Tuple[str, str]):
+        model_type, version = key
+        module_name, class_name = MODEL_CLASSES[model_type]
+
+        rss_before = _rss_bytes()
+        started = time.perf_counter()
+        model_class = getattr(importlib.import_module(module_name), class_name)
+        model = model_class(version=version)
+        load_time = time.perf_counter() - started
+
+        self._load_info[key] = {
+            "load_time_ms": round(load_time * 1000, 2),
+            "memory_mb": round(max(_rss_bytes() - rss_before, 0) / (1024 * 1024), 2),
+            "loaded_at": time.time()
+        }
+        self._models[key] = model
+        return model
+
+    def is_loaded(self, model_type: str, version: str = None) -> bool:
+        return self._key(model_type, version) in self._models
+
+    def warmup(self, model_types: Iterable[str] = None) -> Dict[str, float]:
+        """Load models ahead of traffic; returns load time (ms) per model type"""
+        timings = {}
+        for model_type in model_types or MODEL_CLASSES:
+            started = time.perf_counter()
+            self.get(model_type)
+            timings[model_type] = round((time.perf_counter() - started) * 1000, 2)
+        return timings
+
+    def stats(self) -> Dict[str, Any]:
+        """Status of every known model type without loading anything"""
+        report = {}
+        for model_type in MODEL_CLASSES:
+            default_key = self._key(model_type, None)
+            versions = {}
+            for (loaded_type, version), model in list(self._models.items()):
+                if loaded_type != model_type:
+                    continue
+                versions[version] = {
+                    **self._load_info.get((loaded_type, version), {}),
+                    "metadata": model.get_metadata()
+                }
+            report[model_type] = {
+                "version": default_key[1],
+                "loaded": default_key in self._models,
+                "versions": versions
+            }
+        return report
+
+    def clear(self):
+        """Drop every loaded instance (tests and reloads)"""
+        with self._lock:
+            self._models.clear()
+            self._load_info.clear()
+            self._locks.clear()
+
+# Global model registry
+model_registry = ModelRegistry()
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from .registry import MODEL_CLASSES, model_registry
+
+
+def synthetic_inputs() -> Dict[str, Dict[str, Any]]:
+    """One predict payload per model type, built from the bundled test data"""
+    from data.test_data import (
+        generate_interview_test_cases, generate_sample_jobs,
+        get_test_job_description, get_test_resume_text
+    )
+    resume_text = get_test_resume_text()
+    interview = {key: value for key, value in generate_interview_test_cases()[0].items() if key != 'expected_category'}
+    return {
+        "match": {'resume_text': resume_text, 'job_description': get_test_job_description()},
+        "recommend": {'resume_text': resume_text, 'job_pool': generate_sample_jobs(), 'max_recommendations': 5},
+        "interview": interview,
+        "feedback": {'resume_text': resume_text, 'target_role': 'software engineer'},
+        "ats": {'resume_text': resume_text}
+    }
+
+
+def _vary(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Same request with a resume that misses the parse cache, for a warm (not cached) latency"""
+    if 'resume_text' not in payload:
+        return payload
+    return {**payload, 'resume_text': payload['resume_text'] + "\n"}
+
+
+class Readiness:
+    """Warmup progress of this worker process, reported by /ml/ready
+
+    The worker is ready once every model is loaded and has answered a
+    synthetic prediction through its executor; the load time and the
+    first (cold) and second (warm) prediction latencies are kept per model.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = "pending"
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.artifacts: Dict[str, float] = {}
+        self.models: Dict[str, Dict[str, Any]] = {}
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("ready", "disabled")
+
+    def start(self):
+        with self._lock:
+            self.status = "warming"
+            self.started_at = time.time()
+            self.finished_at = None
+            self.artifacts = {}
+            self.models = {}
+            self.error = None
+
+    def finish(self, error: str = None):
+        with self._lock:
+            self.status = "failed" if error else "ready"
+            self.error = error
+            self.finished_at = time.time()
+
+    def disable(self):
+        """Warmup turned off: serve immediately, loading models on first use"""
+        with self._lock:
+            self.status = "disabled"
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            duration = None
+            if self.started_at is not None:
+                duration = round(((self.finished_at or time.time()) - self.started_at) * 1000, 2)
+            return {
+                "ready": self.ready,
+                "status": self.status,
+                "pid": os.getpid(),
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "duration_ms": duration,
+                "artifacts_ms": dict(self.artifacts),
+                "models": {name: dict(info) for name, info in self.models.items()},
+                "error": self.error
+            }
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+async def warmup(model_types: Iterable[str] = None, state: Readiness = None) -> Readiness:
+    """Load indexes and models, then run each model's synthetic prediction
+
+    Predictions go through the model's executor, so pools (including
+    process pools) are started and their models loaded before traffic.
+    A model that fails to warm up marks the worker failed (not ready).
+    """
+    from pipelines.job_index import job_index
+    from utils.executor import executors
+
+    state = state or readiness
+    state.start()
+    failures = []
+    try:
+        started = time.perf_counter()
+        await run_in_threadpool(job_index.sync, True)
+        await run_in_threadpool(job_index.matrix)
+        state.artifacts["job_index"] = _elapsed_ms(started)
+
+        inputs = synthetic_inputs()
+        for model_type in model_types or MODEL_CLASSES:
+            started = time.perf_counter()
+            model = await run_in_threadpool(model_registry.get, model_type)
+            timings = {"load_ms": _elapsed_ms(started), "executor": executors[model_type].kind}
+
+            payload = inputs[model_type]
+            started = time.perf_counter()
+            prediction = await executors.run(model_type, model.predict, payload)
+            timings["first_prediction_ms"] = _elapsed_ms(started)
+            started = time.perf_counter()
+            await executors.run(model_type, model.predict, _vary(payload))
+            timings["warm_latency_ms"] = _elapsed_ms(started)
+
+            if isinstance(prediction, dict) and prediction.get('error'):
+                timings["error"] = str(prediction['error'])
+                failures.append(model_type)
+            state.models[model_type] = timings
+    except Exception as e:
+        state.finish(f"Warmup failed: {e}")
+        return state
+
+    state.finish(f"Warmup predictions failed for: {', '.join(failures)}" if failures else None)
+    return state
+
+# Readiness of this worker process
+readiness = Readiness()
@@ -1,7 +1,19 @@
-from .preprocess import TextPreprocessor
-from .embeddings import EmbeddingManager
+import importlib
+
+# Exports resolved on first access, so importing one pipeline module does not
+# load the others (embeddings pulls in sentence_transformers/torch)
+_EXPORTS = {
+    "TextPreprocessor": ".preprocess",
+    "EmbeddingManager": ".embeddings"
+}
 
 __all__ = [
     "TextPreprocessor",
     "EmbeddingManager"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
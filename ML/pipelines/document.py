@@ -0,0 +1,155 @@
+import hashlib
+import re
+from typing import Dict, List
+
+import numpy as np
+
+from utils.cache import feature_cache
+from utils.tracing import traced
+from .preprocess import preprocessor
+from .lexical import TermVector, lexical_index
+from .vocabulary import token_vocabulary
+
+# Sections the ATS check looks for in the structure-preserving text
+ATS_SECTION_PATTERNS = {
+    'experience': re.compile(r'(experience|work history|employment|professional)', re.IGNORECASE),
+    'education': re.compile(r'(education|academic|qualifications|degree)', re.IGNORECASE),
+    'skills': re.compile(r'(skills|technical skills|competencies|proficiencies)', re.IGNORECASE)
+}
+
+# Achievement-oriented language counted by the ATS check (each pattern counted separately).
+# Percentages only start at the beginning of a digit run, which keeps long digit runs linear.
+ACHIEVEMENT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'(?<!\d)\d+%', r'increased', r'decreased', r'improved', r'reduced',
+        r'saved', r'achieved', r'developed', r'managed', r'led'
+    )
+]
+
+# Impact verbs counted by resume feedback
+IMPACT_VERBS = [
+    'increased', 'decreased', 'improved', 'reduced', 'saved',
+    'achieved', 'developed', 'managed', 'led', 'implemented'
+]
+IMPACT_VERB_PATTERN = re.compile(r'\b(?:' + '|'.join(map(re.escape, IMPACT_VERBS)) + r')\b')
+
+CONTACT_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+
+class memoized_property:
+    """Lazy attribute computed once per instance and stored in its __dict__
+
+    Unlike functools.cached_property before Python 3.12, it takes no lock
+    shared by every instance, so parses of different texts never wait on
+    each other. Two threads reading a fresh attribute together may both
+    compute it; the analyses are pure, so either result is kept.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.func(instance)
+        instance.__dict__[self.name] = value
+        return value
+
+
+def count_impact_verbs(text: str) -> int:
+    """Whole-word occurrences of the feedback impact verbs"""
+    return len(IMPACT_VERB_PATTERN.findall(text.lower()))
+
+
+class ParsedDocument:
+    """Every text-level analysis the models use, computed at most once per text
+
+    Instances are shared through parse_document, keyed by a hash of the raw
+    text, so match, recommend, ATS and feedback all read the same parse.
+    Each analysis runs lazily on first access; treat the values as read-only.
+    """
+
+    def __init__(self, raw_text: str, digest: str = None):
+        self.raw_text = raw_text
+        self.digest = digest or document_digest(raw_text)
+
+    @memoized_property
+    def text(self) -> str:
+        """Normalized text used by match, recommend and feedback"""
+        return preprocessor.clean_text(self.raw_text)
+
+    @memoized_property
+    @traced("preprocess")
+    def token_ids(self) -> np.ndarray:
+        """Distinct words as sorted int32 ids in the process-wide token vocabulary"""
+        return token_vocabulary.encode(self.text.split())
+
+    @memoized_property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    @memoized_property
+    def skills(self) -> List[str]:
+        return preprocessor.extract_skills(self.text)
+
+    @memoized_property
+    def sections(self) -> Dict[str, str]:
+        return preprocessor.extract_sections(self.text)
+
+    @memoized_property
+    @traced("preprocess")
+    def terms(self) -> TermVector:
+        """Term counts for TF-IDF/BM25 scoring (the stored vector for indexed job descriptions)"""
+        stored = lexical_index.document_vector(self.digest)
+        return stored if stored is not None else lexical_index.vectorize(self.text)
+
+    @memoized_property
+    def impact_verbs(self) -> int:
+        return count_impact_verbs(self.text)
+
+    @memoized_property
+    def experience_impact_verbs(self) -> int:
+        return count_impact_verbs(self.sections.get('experience', ''))
+
+    @memoized_property
+    def structured_text(self) -> str:
+        """Text cleaned for the ATS check, keeping structural punctuation"""
+        return preprocessor.clean_structured_text(self.raw_text)
+
+    @memoized_property
+    def structured_word_count(self) -> int:
+        return len(self.structured_text.split())
+
+    @memoized_property
+    def ats_sections(self) -> List[str]:
+        return [section for section, pattern in ATS_SECTION_PATTERNS.items() if pattern.search(self.structured_text)]
+
+    @memoized_property
+    def has_contact(self) -> bool:
+        # Without an "@" the pattern cannot match, but it would still backtrack
+        # over every word boundary of long dotted tokens
+        return '@' in self.structured_text and bool(CONTACT_PATTERN.search(self.structured_text))
+
+    @memoized_property
+    def achievement_count(self) -> int:
+        return sum(len(pattern.findall(self.structured_text)) for pattern in ACHIEVEMENT_PATTERNS)
+
+
+def document_digest(text: str) -> str:
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+def parse_document(text: str) -> ParsedDocument:
+    """Shared ParsedDocument for a raw text, memoized in the feature LRU"""
+    text = text or ""
+    digest = document_digest(text)
+    key = f"doc:{digest}"
+    document = feature_cache.get(key)
+    if document is None:
+        document = ParsedDocument(text, digest)
+        feature_cache.set(key, document)
+    return document
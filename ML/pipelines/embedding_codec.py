@@ -0,0 +1,52 @@
+import struct
+from typing import Optional
+
+import numpy as np
+
+# magic, format version, dtype code, model name length, dimension
+HEADER = struct.Struct('<4sBBHI')
+MAGIC = b'EMB1'
+FORMAT_VERSION = 1
+
+DTYPES = {0: np.dtype('<f4'), 1: np.dtype('<f2')}
+DTYPE_CODES = {'float32': 0, 'float16': 1}
+
+
+def _padded(length: int) -> int:
+    """Round a header length up so the vector starts 8-byte aligned"""
+    return (length + 7) & ~7
+
+
+def encode_embedding(embedding: np.ndarray, model_name: str, dtype: str = 'float32') -> bytes:
+    """Serialize an embedding as a small header followed by raw little-endian floats"""
+    code = DTYPE_CODES[dtype]
+    name = model_name.encode('utf-8')
+    vector = np.ascontiguousarray(embedding, dtype=DTYPES[code]).ravel()
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, code, len(name), vector.size) + name
+    return header.ljust(_padded(len(header)), b'\0') + vector.tobytes()
+
+
+def decode_embedding(data: bytes, model_name: Optional[str] = None) -> Optional[np.ndarray]:
+    """Read-only view of an encoded embedding, or None if the entry is unusable
+
+    Entries in another format (e.g. legacy JSON), from another model or
+    with a truncated payload are treated as cache misses.
+    """
+    if not data or len(data) < HEADER.size:
+        return None
+
+    magic, version, code, name_length, dimension = HEADER.unpack_from(data)
+    if magic != MAGIC or version != FORMAT_VERSION or code not in DTYPES:
+        return None
+
+    name_end = HEADER.size + name_length
+    if model_name is not None and data[HEADER.size:name_end] != model_name.encode('utf-8'):
+        return None
+
+    dtype = DTYPES[code]
+    offset = _padded(name_end)
+    if len(data) != offset + dimension * dtype.itemsize:
+        return None
+
+    return np.frombuffer(data, dtype=dtype, count=dimension, offset=offset)
@@ -1,11 +1,10 @@
 import numpy as np
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any
 import hashlib
-import json
 
 from config import get_settings
-from utils.cache import get_cache, set_cache
+from utils.cache import get_cache, set_cache, get_cache_many, set_cache_many
+from .embedding_codec import encode_embedding, decode_embedding
 
 settings = get_settings()
 
@@ -18,6 +17,8 @@ class EmbeddingManager:
         
         if settings.enable_sbert:
             try:
+                # Imported here: sentence_transformers/torch take seconds to import
+                from sentence_transformers import SentenceTransformer
                 self.model = SentenceTransformer(settings.embedding_model)
             except Exception as e:
                 print(f"Warning: Could not load SentenceTransformer: {e}")
@@ -28,6 +29,14 @@ class EmbeddingManager:
         text_hash = hashlib.md5(text.encode()).hexdigest()
         return f"embedding:{text_hash}"
     
+    def _encode(self, embedding: np.ndarray) -> bytes:
+        """Binary cache payload for an embedding"""
+        return encode_embedding(embedding, settings.embedding_model, settings.embedding_cache_dtype)
+    
+    def _decode(self, cached: bytes):
+        """Embedding view of a cache payload (None if stale or from another model)"""
+        return decode_embedding(cached, settings.embedding_model)
+    
     def get_embedding(self, text: str) -> np.ndarray:
         """Get embedding for text with caching"""
         if not text or not self.model:
@@ -36,9 +45,9 @@ class EmbeddingManager:
         # Try to get from cache
         if self.cache_enabled:
             cache_key = self._get_cache_key(text)
-            cached = get_cache(cache_key)
-            if cached:
-                return np.array(json.loads(cached))
+            embedding = self._decode(get_cache(cache_key, raw=True))
+            if embedding is not None:
+                return embedding
         
         # Generate embedding
         embedding = self.model.encode(text)
@@ -46,68 +55,40 @@ class EmbeddingManager:
         # Store in cache
         if self.cache_enabled:
             cache_key = self._get_cache_key(text)
-            set_cache(cache_key, json.dumps(embedding.tolist()), ttl=settings.cache_ttl)
+            set_cache(cache_key, self._encode(embedding), ttl=settings.cache_ttl, raw=True)
         
         return embedding
     
     def get_embeddings_batch(self, texts: List[str]) -> np.ndarray:
-        """Get embeddings for multiple texts"""
+        """Get embeddings for multiple texts with one cache read and one cache write"""
         if not texts or not self.model:
             return np.zeros((len(texts), 384))
         
-        # Separate cached and non-cached texts
-        cached_embeddings = []
-        non_cached_texts = []
-        non_cached_indices = []
+        embeddings = [None] * len(texts)
         
-        for i, text in enumerate(texts):
-            if self.cache_enabled:
-                cache_key = self._get_cache_key(text)
-                cached = get_cache(cache_key)
-                if cached:
-                    cached_embeddings.append(np.array(json.loads(cached)))
-                else:
-                    non_cached_texts.append(text)
-                    non_cached_indices.append(i)
-            else:
-                non_cached_texts.append(text)
-                non_cached_indices.append(i)
+        # One MGET for every lookup
+        if self.cache_enabled:
+            cached_values = get_cache_many([self._get_cache_key(text) for text in texts], raw=True)
+            for i, cached in enumerate(cached_values):
+                embeddings[i] = self._decode(cached)
         
-        # Generate embeddings for non-cached texts
-        if non_cached_texts:
-            new_embeddings = self.model.encode(non_cached_texts)
+        # Encode each distinct missing text once
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+            new_embeddings = dict(zip(missing_texts, self.model.encode(missing_texts)))
+            for i in missing:
+                embeddings[i] = new_embeddings[texts[i]]
             
-            # Cache new embeddings
+            # One pipelined write for the new embeddings
             if self.cache_enabled:
-                for text, embedding in zip(non_cached_texts, new_embeddings):
-                    cache_key = self._get_cache_key(text)
-                    set_cache(cache_key, json.dumps(embedding.tolist()), ttl=settings.cache_ttl)
-        else:
-            new_embeddings = np.array([])
+                set_cache_many(
+                    {self._get_cache_key(text): self._encode(embedding) for text, embedding in new_embeddings.items()},
+                    ttl=settings.cache_ttl,
+                    raw=True
+                )
         
-        # Combine all embeddings
-        all_embeddings = [None] * len(texts)
-        
-        # Place cached embeddings
-        cached_idx = 0
-        for i, text in enumerate(texts):
-            if self.cache_enabled:
-                cache_key = self._get_cache_key(text)
-                cached = get_cache(cache_key)
-                if cached:
-                    all_embeddings[i] = np.array(json.loads(cached))
-                    cached_idx += 1
-                else:
-                    # Find in new_embeddings
-                    if non_cached_indices:
-                        pos = non_cached_indices.index(i)
-                        all_embeddings[i] = new_embeddings[pos]
-            else:
-                # All are in new_embeddings
-                pos = non_cached_texts.index(text)
-                all_embeddings[i] = new_embeddings[pos]
-        
-        return np.array(all_embeddings)
+        return np.array(embeddings)
     
     def cosine_similarity(self, emb1: np.ndarray, emb2: np.ndarray) -> float:
         """Calculate cosine similarity between two embeddings"""
@@ -121,4 +102,7 @@ class EmbeddingManager:
         if norm1 == 0 or norm2 == 0:
             return 0.0
         
-        return dot_product / (norm1 * norm2)
\ No newline at end of file
+        return dot_product / (norm1 * norm2)
+
+# Global embedding manager, created on first import of this module
+embedding_manager = EmbeddingManager()
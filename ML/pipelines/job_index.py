@@ -0,0 +1,320 @@
+import json
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from config import get_settings
+from utils import metrics
+from utils.cache import get_redis, redis_breaker
+from .preprocess import preprocessor
+from .document import document_digest
+from .lexical import lexical_index
+from .sparse_scoring import JobMatrix
+from .vocabulary import token_vocabulary, skill_vocabulary
+
+settings = get_settings()
+
+# Metadata fields that can be used as exact-match recommend filters
+FILTER_FIELDS = ('company', 'location', 'job_type')
+
+
+class JobIndexUnavailable(RuntimeError):
+    """Postings could not be written to the shared store while several workers serve the index"""
+
+
+class JobIndex:
+    """In-memory job corpus with precomputed features and filter facets
+
+    Each posting is tokenized, skill-extracted and term-vectorized once at
+    upsert time; recommendations score the JobMatrix built from those
+    features, and matches against an indexed description reuse its
+    stored TF-IDF/BM25 vector.
+
+    With a key, postings are shared through Redis: publish() and retract()
+    write a hash of postings plus a version counter, and sync() rebuilds
+    this worker's copy when the version moves (checked at most every
+    JOB_INDEX_SYNC seconds). upsert()/delete() only change the local copy.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        self.key = key
+        self._synced_version: Optional[int] = None
+        self._synced_at = 0.0
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._skills: Dict[str, List[str]] = {}
+        self._token_ids: Dict[str, np.ndarray] = {}
+        self._skill_ids: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[Tuple[JobMatrix, List[str]]] = None
+        self._facets: Dict[str, Dict[str, Set[str]]] = {field: defaultdict(set) for field in FILTER_FIELDS}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    @staticmethod
+    def _facet_value(value: Any) -> Optional[str]:
+        """Normalize a metadata value for exact-match filtering"""
+        if value is None:
+            return None
+        value = str(value).strip().lower()
+        return value or None
+
+    def _analyze(self, description: str):
+        """Precompute the features RecommendModel scores a posting on"""
+        tokens = {sys.intern(token) for token in description.lower().split()}
+        skills = preprocessor.extract_skills(description)
+        return tokens, skills
+
+    @staticmethod
+    def _add_lexical(job: Dict[str, Any]):
+        """Store a posting's term vector under its description digest
+
+        The vector is built from the cleaned text, like ParsedDocument.terms,
+        which looks it up by the same digest. The IDF stays that of the
+        offline artifact, so scores do not depend on which postings a
+        worker has seen.
+        """
+        description = job.get('description', '')
+        lexical_index.store_document(preprocessor.clean_text(description), document_digest(description))
+
+    @staticmethod
+    def _remove_lexical(job: Dict[str, Any]):
+        lexical_index.drop_document(document_digest(job.get('description', '')))
+
+    def upsert(self, job: Dict[str, Any]) -> bool:
+        """Insert or replace a posting. Returns True if the posting is new."""
+        job_id = str(job['id'])
+        tokens, skills = self._analyze(job.get('description', ''))
+        token_ids = token_vocabulary.encode(tokens)
+        skill_ids = skill_vocabulary.encode(skills)
+
+        with self._lock:
+            created = job_id not in self._jobs
+            if not created:
+                self._remove_facets(job_id)
+                self._remove_lexical(self._jobs[job_id])
+
+            self._jobs[job_id] = dict(job, id=job_id)
+            self._add_lexical(job)
+            self._skills[job_id] = skills
+            self._token_ids[job_id] = token_ids
+            self._skill_ids[job_id] = skill_ids
+            self._matrix = None
+
+            for field in FILTER_FIELDS:
+                value = self._facet_value(job.get(field))
+                if value is not None:
+                    self._facets[field][value].add(job_id)
+
+        return created
+
+    def upsert_many(self, jobs: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert a batch of postings"""
+        created = updated = 0
+        for job in jobs:
+            if self.upsert(job):
+                created += 1
+            else:
+                updated += 1
+        return {"created": created, "updated": updated}
+
+    def delete(self, job_id: str) -> bool:
+        """Remove a posting. Returns False if it was not indexed."""
+        with self._lock:
+            if job_id not in self._jobs:
+                return False
+            self._remove_facets(job_id)
+            self._remove_lexical(self._jobs[job_id])
+            del self._jobs[job_id]
+            del self._skills[job_id]
+            del self._token_ids[job_id]
+            del self._skill_ids[job_id]
+            self._matrix = None
+            return True
+
+    def clear(self):
+        """Drop every posting"""
+        with self._lock:
+            for job in self._jobs.values():
+                self._remove_lexical(job)
+            self._jobs.clear()
+            self._skills.clear()
+            self._token_ids.clear()
+            self._skill_ids.clear()
+            self._matrix = None
+            for values in self._facets.values():
+                values.clear()
+
+    def _remove_facets(self, job_id: str):
+        """Unlink a posting from the filter facets it appears in"""
+        job = self._jobs.get(job_id, {})
+        for field in FILTER_FIELDS:
+            value = self._facet_value(job.get(field))
+            postings = self._facets[field].get(value)
+            if postings is not None:
+                postings.discard(job_id)
+                if not postings:
+                    del self._facets[field][value]
+
+    @property
+    def _postings_key(self) -> str:
+        return f"{self.key}:postings"
+
+    @property
+    def _version_key(self) -> str:
+        return f"{self.key}:version"
+
+    def _write_shared(self, queue) -> Optional[List[Any]]:
+        """Queue commands plus a version bump in one MULTI/EXEC round trip
+
+        Returns the command replies, or None when Redis is unreachable and
+        this is the only worker (its local copy is then the whole index).
+        """
+        try:
+            pipe = get_redis().pipeline()
+            queue(pipe)
+            pipe.incr(self._version_key)
+            with redis_breaker.call("job_index"), metrics.redis_timer("job_index"):
+                results = pipe.execute()
+        except Exception as e:
+            if settings.workers > 1:
+                raise JobIndexUnavailable(
+                    f"Job index storage unavailable ({e}); refusing a change only one of "
+                    f"{settings.workers} workers would see"
+                ) from e
+            return None
+        with self._lock:
+            if self._synced_version is not None and results[-1] == self._synced_version + 1:
+                # Nobody else wrote in between: the local change below brings this copy up to date
+                self._synced_version = results[-1]
+        return results
+
+    def publish(self, jobs: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert postings for every worker (shared store first, then this worker's copy)"""
+        jobs = [dict(job, id=str(job['id'])) for job in jobs]
+        if self.key is not None and jobs:
+            mapping = {job['id']: json.dumps(job) for job in jobs}
+            self._write_shared(lambda pipe: pipe.hset(self._postings_key, mapping=mapping))
+        return self.upsert_many(jobs)
+
+    def retract(self, job_id: str) -> bool:
+        """Delete a posting for every worker. Returns False if it was not indexed."""
+        found = False
+        if self.key is not None:
+            results = self._write_shared(lambda pipe: pipe.hdel(self._postings_key, job_id))
+            found = bool(results and results[0])
+        return self.delete(job_id) or found
+
+    def sync(self, force: bool = False):
+        """Bring this worker's copy up to date with the shared postings
+
+        Unless forced, Redis is checked at most every JOB_INDEX_SYNC seconds.
+        When Redis is unreachable or nothing was ever published, the local
+        copy is served as is.
+        """
+        if self.key is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._synced_at < settings.job_index_sync:
+            return
+        self._synced_at = now
+        try:
+            redis_client = get_redis()
+            with redis_breaker.call("job_index"), metrics.redis_timer("job_index"):
+                version = redis_client.get(self._version_key)
+                if version is None or int(version) == self._synced_version:
+                    return
+                # Read after the version, so a write in between is picked up next time
+                payloads = redis_client.hgetall(self._postings_key)
+        except Exception:
+            return
+
+        shared = {job_id: json.loads(payload) for job_id, payload in payloads.items()}
+        with self._lock:
+            for job_id in [job_id for job_id in self._jobs if job_id not in shared]:
+                self.delete(job_id)
+            for job_id in sorted(shared):
+                if self._jobs.get(job_id) != shared[job_id]:
+                    self.upsert(shared[job_id])
+            self._synced_version = int(version)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the stored posting metadata"""
+        return self._jobs.get(job_id)
+
+    def skills(self, job_id: str) -> List[str]:
+        """Get the precomputed skills of a posting"""
+        return self._skills[job_id]
+
+    def matrix(self) -> Tuple[JobMatrix, List[str]]:
+        """Scoring matrix over every posting and the posting id of each row
+
+        Rebuilt lazily after the index changes, so bulk upserts pay for one
+        rebuild at the next query rather than one per posting.
+        """
+        with self._lock:
+            if self._matrix is None:
+                job_ids = list(self._jobs)
+                matrix = JobMatrix(
+                    [self._token_ids[job_id] for job_id in job_ids],
+                    [self._skill_ids[job_id] for job_id in job_ids]
+                )
+                self._matrix = (matrix, job_ids)
+            return self._matrix
+
+    def allowed_ids(self, filters: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """Posting ids passing the filters, or None when nothing is filtered"""
+        with self._lock:
+            return self._filter_ids(filters)
+
+    def _filter_ids(self, filters: Optional[Dict[str, Any]]) -> Optional[Set[str]]:
+        """Resolve filters to the set of allowed posting ids (None means no restriction)"""
+        if not filters:
+            return None
+
+        allowed = None
+        job_ids = filters.get('job_ids')
+        if job_ids:
+            allowed = {str(job_id) for job_id in job_ids if str(job_id) in self._jobs}
+
+        for field in FILTER_FIELDS:
+            values = filters.get(field)
+            if not values:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            matching = set()
+            for value in values:
+                matching |= self._facets[field].get(self._facet_value(value), set())
+            allowed = matching if allowed is None else allowed & matching
+
+        keywords = [keyword.lower() for keyword in filters.get('title_keywords') or []]
+        if keywords:
+            pool = allowed if allowed is not None else self._jobs.keys()
+            allowed = {
+                job_id for job_id in pool
+                if any(keyword in str(self._jobs[job_id].get('title', '')).lower() for keyword in keywords)
+            }
+
+        return allowed
+
+    def stats(self) -> Dict[str, Any]:
+        """Index size and shape"""
+        matrix, _ = self.matrix()
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "unique_tokens": len(np.unique(matrix.tokens.indices)),
+                "unique_skills": len(np.unique(matrix.skills.indices)),
+                "facets": {field: len(values) for field, values in self._facets.items()}
+            }
+
+# Global job index instance, shared between workers through Redis
+job_index = JobIndex(key="jobs")
@@ -0,0 +1,249 @@
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import get_settings
+from .preprocess import preprocessor
+
+settings = get_settings()
+
+# Lexical scoring modes selectable per request ("jaccard" is the word-overlap default)
+SCORING_MODES = ('jaccard', 'tfidf', 'bm25')
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+class TermVector:
+    """Term counts of one text plus IDF weights cached for an IDF version"""
+
+    __slots__ = ('counts', 'length', '_version', '_tfidf', '_tfidf_norm')
+
+    def __init__(self, counts: Dict[str, int]):
+        self.counts = counts
+        self.length = sum(counts.values())
+        self._version = -1
+        self._tfidf: Dict[str, float] = {}
+        self._tfidf_norm = 0.0
+
+
+class LexicalIndex:
+    """Corpus document frequencies for TF-IDF and BM25 scoring
+
+    Document frequencies are a dense int32 array indexed by term id, saved
+    next to a newline-separated term list and loaded memory-mapped. Documents
+    added after loading (e.g. indexed jobs) are tracked in a small delta map,
+    so the base artifact is never copied.
+
+    Served document frequencies come from the offline artifact only: stored
+    documents (indexed jobs) keep their term vector and TF-IDF weights for
+    scoring but are not counted, so every worker scores a pair the same way
+    whatever postings it has seen.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.n_docs = 0
+        self.total_length = 0
+        self._ids: Dict[str, int] = {}
+        self._base_df: np.ndarray = np.zeros(0, dtype=np.int32)
+        self._df_delta: Dict[int, int] = {}
+        self._vectors: Dict[str, TermVector] = {}
+        self._vector_refs: Dict[str, int] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.n_docs > 0
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.n_docs if self.n_docs else 0.0
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercase alphanumeric tokens without stopwords"""
+        stop_words = preprocessor.stop_words
+        return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in stop_words]
+
+    def vectorize(self, text: str) -> TermVector:
+        """Term counts of a text"""
+        return TermVector(Counter(self.tokenize(text)))
+
+    def fit(self, documents: Iterable[str]) -> "LexicalIndex":
+        """Fit document frequencies on a corpus, replacing any previous state"""
+        with self._lock:
+            self._ids = {}
+            self._base_df = np.zeros(0, dtype=np.int32)
+            self._df_delta = {}
+            self._vectors = {}
+            self._vector_refs = {}
+            self.n_docs = 0
+            self.total_length = 0
+        for document in documents:
+            self.add_document(document)
+        return self
+
+    def add_document(self, text: str):
+        """Incrementally count one more document"""
+        self._update(self.vectorize(text), 1)
+
+    def remove_document(self, text: str):
+        """Undo add_document for a document that is being replaced or deleted"""
+        self._update(self.vectorize(text), -1)
+
+    def store_document(self, text: str, key: str) -> TermVector:
+        """Keep a document's term vector (weighted once here) for document_vector(key)
+
+        The document is not counted in the document frequencies. Stores are
+        reference counted per key; drop_document(key) undoes one.
+        """
+        vector = self.vectorize(text)
+        with self._lock:
+            vector = self._vectors.setdefault(key, vector)
+            self._vector_refs[key] = self._vector_refs.get(key, 0) + 1
+        self._tfidf_weights(vector)
+        return vector
+
+    def drop_document(self, key: str):
+        """Undo store_document for a document that is being replaced or deleted"""
+        with self._lock:
+            if key in self._vectors:
+                self._vector_refs[key] -= 1
+                if not self._vector_refs[key]:
+                    del self._vectors[key]
+                    del self._vector_refs[key]
+
+    def document_vector(self, key: str) -> Optional[TermVector]:
+        """Stored term vector of a document added with this key"""
+        return self._vectors.get(key)
+
+    def _update(self, vector: TermVector, sign: int):
+        with self._lock:
+            for term in vector.counts:
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    if sign < 0:
+                        continue
+                    term_id = len(self._ids)
+                    self._ids[term] = term_id
+                self._df_delta[term_id] = self._df_delta.get(term_id, 0) + sign
+            self.n_docs = max(self.n_docs + sign, 0)
+            self.total_length = max(self.total_length + sign * vector.length, 0)
+            self._version += 1
+
+    def doc_freq(self, term: str) -> int:
+        term_id = self._ids.get(term)
+        if term_id is None:
+            return 0
+        base = int(self._base_df[term_id]) if term_id < len(self._base_df) else 0
+        return base + self._df_delta.get(term_id, 0)
+
+    def idf(self, term: str) -> float:
+        """Smoothed TF-IDF weight (unseen terms get the maximum)"""
+        return math.log((1 + self.n_docs) / (1 + self.doc_freq(term))) + 1
+
+    def bm25_idf(self, term: str) -> float:
+        """Non-negative BM25 (Lucene) IDF"""
+        df = self.doc_freq(term)
+        return math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+
+    def _tfidf_weights(self, vector: TermVector):
+        """Refresh a vector's cached TF-IDF weights if the IDF has moved"""
+        if vector._version != self._version:
+            weights = {term: count * self.idf(term) for term, count in vector.counts.items()}
+            vector._tfidf = weights
+            vector._tfidf_norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            vector._version = self._version
+        return vector._tfidf, vector._tfidf_norm
+
+    def tfidf_similarity(self, vector1: TermVector, vector2: TermVector) -> float:
+        """Cosine similarity of TF-IDF vectors"""
+        weights1, norm1 = self._tfidf_weights(vector1)
+        weights2, norm2 = self._tfidf_weights(vector2)
+        if not norm1 or not norm2:
+            return 0.0
+        if len(weights1) > len(weights2):
+            weights1, weights2 = weights2, weights1
+        dot = sum(weight * weights2[term] for term, weight in weights1.items() if term in weights2)
+        return min(dot / (norm1 * norm2), 1.0)
+
+    def bm25_similarity(self, query: TermVector, document: TermVector) -> float:
+        """BM25 of document for query terms, normalized to 0-1
+
+        Each query term contributes at most idf * (k1 + 1), so dividing by
+        that sum gives the share of the query the document covers.
+        """
+        if not query.counts or not document.counts:
+            return 0.0
+        avg_length = self.avg_length or document.length
+        length_norm = self.k1 * (1 - self.b + self.b * document.length / avg_length)
+
+        score = 0.0
+        max_score = 0.0
+        for term in query.counts:
+            idf = self.bm25_idf(term) if self.is_fitted else 1.0
+            max_score += idf * (self.k1 + 1)
+            tf = document.counts.get(term)
+            if tf:
+                score += idf * tf * (self.k1 + 1) / (tf + length_norm)
+        return score / max_score if max_score else 0.0
+
+    def save(self, path_prefix: str):
+        """Write <prefix>.npy (document frequencies), <prefix>.terms and <prefix>.json"""
+        with self._lock:
+            terms = sorted(self._ids, key=self._ids.__getitem__)
+            df = np.array([self.doc_freq(term) for term in terms], dtype=np.int32)
+            np.save(f"{path_prefix}.npy", df)
+            with open(f"{path_prefix}.terms", 'w', encoding='utf-8') as f:
+                f.write('\n'.join(terms))
+            with open(f"{path_prefix}.json", 'w') as f:
+                json.dump({
+                    "n_docs": self.n_docs,
+                    "total_length": self.total_length,
+                    "k1": self.k1,
+                    "b": self.b,
+                    "vocabulary_size": len(terms)
+                }, f, indent=2)
+
+    @classmethod
+    def load(cls, path_prefix: str) -> Optional["LexicalIndex"]:
+        """Load a saved index with the document frequencies memory-mapped"""
+        if not os.path.exists(f"{path_prefix}.npy"):
+            return None
+        with open(f"{path_prefix}.json") as f:
+            meta: Dict[str, Any] = json.load(f)
+        with open(f"{path_prefix}.terms", encoding='utf-8') as f:
+            terms = f.read().split('\n') if meta["vocabulary_size"] else []
+
+        index = cls(k1=meta.get("k1", 1.5), b=meta.get("b", 0.75))
+        index._base_df = np.load(f"{path_prefix}.npy", mmap_mode='r')
+        index._ids = {term: term_id for term_id, term in enumerate(terms)}
+        index.n_docs = meta["n_docs"]
+        index.total_length = meta["total_length"]
+        return index
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": self.n_docs,
+            "vocabulary_size": len(self._ids),
+            "avg_document_length": round(self.avg_length, 2)
+        }
+
+
+def artifact_prefix(version: str = None) -> str:
+    """Path prefix of the persisted IDF artifact for a match model version"""
+    return os.path.join(settings.model_dir, f"{version or settings.match_model_version}-idf")
+
+# Global lexical index, fitted offline by scripts/train_models.py
+lexical_index = LexicalIndex.load(artifact_prefix()) or LexicalIndex()
@@ -1,16 +1,21 @@
-import re
 import os
-import nltk
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple, Union
 import json
 
+from utils.tracing import traced
+from .skill_matcher import SkillMatcher
+from .text_cleaner import text_cleaner, structured_cleaner, tokenize
+
+# NLTK resources ship with the service; they are read from here and never downloaded
+NLTK_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nltk_data')
+
 class TextPreprocessor:
     """Text preprocessing pipeline with robust error handling"""
     
     def __init__(self):
-        self._ensure_nltk_data()
         self.stop_words = self._get_stopwords()
         self.skills_dict = self._load_skills_dict()
+        self.skill_matcher = SkillMatcher(self.skills_dict)
         
         # Common section headers
         self.section_headers = [
@@ -18,32 +23,13 @@ class TextPreprocessor:
             'certifications', 'awards', 'summary', 'objective'
         ]
     
-    def _ensure_nltk_data(self):
-        """Ensure NLTK data is available with fallbacks"""
-        try:
-            # Set NLTK data path to project directory
-            nltk_data_path = './nltk_data'
-            if os.path.exists(nltk_data_path):
-                nltk.data.path.append(nltk_data_path)
-        
-        # Try to find punkt tokenizer
-            try:
-                nltk.data.find('tokenizers/punkt')
-                print("✅ NLTK punkt found")
-            except LookupError:
-                print("⚠️ NLTK punkt not found. Downloading...")
-                nltk.download('punkt', download_dir='./nltk_data', quiet=True)
-                nltk.download('stopwords', download_dir='./nltk_data', quiet=True)
-
-        except Exception as e:
-            print(f"⚠️ NLTK setup issue: {e}. Using fallback methods.")
-    
     def _get_stopwords(self):
-        """Get stopwords with fallback to basic list"""
+        """Get stopwords from the bundled NLTK corpus with fallback to basic list"""
         try:
-            from nltk.corpus import stopwords
-            return set(stopwords.words('english'))
-        except:
+            # The corpus is a plain word list, so it is read without importing nltk
+            with open(os.path.join(NLTK_DATA_DIR, 'corpora', 'stopwords', 'english'), encoding='utf-8') as f:
+                return {word for word in f.read().split() if word}
+        except OSError:
             # Fallback basic stopwords
             basic_stopwords = {
                 'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 
@@ -91,49 +77,33 @@ class TextPreprocessor:
         except:
             return default_skills
     
+    @traced("preprocess")
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
-        if not text:
-            return ""
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove URLs, emails, phone numbers
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-        text = re.sub(r'\S+@\S+', '', text)
-        text = re.sub(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', '', text)
-        
-        # Remove special characters but keep basic punctuation
-        text = re.sub(r'[^\w\s.,!?;:]', ' ', text)
-        
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        return text
+        return text_cleaner.clean(text)
+    
+    @traced("preprocess")
+    def clean_structured_text(self, text: str) -> str:
+        """Clean text for resume structure checks, keeping hyphens and punctuation"""
+        return structured_cleaner.clean(text)
     
     def tokenize_text(self, text: str) -> List[str]:
-        """Robust tokenization with fallback"""
-        try:
-            # Try NLTK tokenization first
-            return nltk.word_tokenize(text.lower())
-        except:
-            # Fallback to simple split
-            return text.lower().split()
+        """Lowercase word and punctuation tokens (precompiled regex, no punkt)"""
+        return tokenize(text)
     
-    def extract_skills(self, text: str) -> List[str]:
-        """Extract skills from text with basic matching"""
-        text_lower = text.lower()
-        found_skills = []
-        
-        # Check against skills dictionary
-        for category, skills in self.skills_dict.items():
-            for skill in skills:
-                if skill.lower() in text_lower:
-                    found_skills.append(skill)
+    @traced("skills")
+    def extract_skills(self, text: str, with_offsets: bool = False) -> Union[List[str], List[Tuple[str, int, int]]]:
+        """Extract skills from text with the precompiled skill automaton
+
+        Returns unique skills in order of first appearance, or every
+        (skill, start, end) occurrence when with_offsets is True.
+        """
+        if not text:
+            return []
         
-        return list(set(found_skills))
+        return self.skill_matcher.extract(text, with_offsets=with_offsets)
     
+    @traced("preprocess")
     def extract_sections(self, text: str) -> Dict[str, str]:
         """Basic section extraction"""
         sections = {}
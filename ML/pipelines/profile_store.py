@@ -0,0 +1,107 @@
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from config import get_settings
+from utils import metrics
+from utils.cache import LRUCache, get_redis, redis_breaker
+from .document import parse_document
+
+settings = get_settings()
+
+PROFILE_FORMAT = 1
+
+
+def profile_id(resume_text: str) -> str:
+    """Stable id of a resume text, so re-posting the same resume reuses its profile"""
+    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()[:32]
+
+
+class ProfileStore:
+    """Precomputed resume artifacts stored under a resume_id
+
+    A profile holds everything the models derive from the resume alone
+    (cleaned text, tokens, skills, sections, term counts and per-model
+    features), so match/recommend/ATS/feedback requests that
+    pass resume_id skip all resume-side preprocessing. Profiles are written
+    straight to Redis with their own TTL (not through the shared response
+    cache, so they never evict cached embeddings) and kept briefly in a
+    bounded in-process store. Local copies of persisted profiles live for
+    LOCAL_CACHE_TTL so deletes from other workers are seen; if Redis is
+    unavailable the local copy is the only one and keeps the full TTL.
+    """
+
+    def __init__(self, max_profiles: int = 5000, ttl: int = 604800):
+        self.ttl = ttl
+        self._local = LRUCache(max_profiles, name="profiles")
+
+    @staticmethod
+    def _key(resume_id: str) -> str:
+        return f"profile:{resume_id}"
+
+    def build(self, resume_text: str, resume_id: Optional[str] = None) -> Dict[str, Any]:
+        """Compute the model-independent artifacts of a resume, stored under
+        the caller's resume_id or, by default, a hash of the text"""
+        document = parse_document(resume_text)
+        profile = {
+            "resume_id": resume_id or profile_id(resume_text),
+            "format": PROFILE_FORMAT,
+            "text": document.text,
+            "tokens": sorted(set(document.text.split())),
+            "skills": document.skills,
+            "sections": document.sections,
+            "term_counts": dict(document.terms.counts)
+        }
+        return profile
+
+    def save(self, profile: Dict[str, Any]) -> bool:
+        """Store a profile; returns True if it also reached Redis"""
+        key = self._key(profile["resume_id"])
+        payload = json.dumps(profile)
+        persisted = False
+        try:
+            with redis_breaker.call("set"), metrics.redis_timer("set"):
+                get_redis().setex(key, self.ttl, payload)
+            persisted = True
+        except Exception:
+            pass
+        ttl = min(self.ttl, settings.local_cache_ttl) if persisted else self.ttl
+        self._local.set(key, profile, ttl=ttl, size=len(payload))
+        return persisted
+
+    def get(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """Load a profile, or None if it is unknown or expired"""
+        key = self._key(resume_id)
+        profile = self._local.get(key)
+        if profile is not None:
+            return profile
+        try:
+            with redis_breaker.call("get"), metrics.redis_timer("get"):
+                payload = get_redis().get(key)
+        except Exception:
+            return None
+        if not payload:
+            return None
+        profile = json.loads(payload)
+        if profile.get("format") != PROFILE_FORMAT:
+            return None
+        self._local.set(key, profile, ttl=min(self.ttl, settings.local_cache_ttl), size=len(payload))
+        return profile
+
+    def delete(self, resume_id: str) -> bool:
+        """Remove a profile; returns False if it was not stored"""
+        key = self._key(resume_id)
+        found = key in self._local
+        self._local.delete(key)
+        try:
+            with redis_breaker.call("delete"), metrics.redis_timer("delete"):
+                found = bool(get_redis().delete(key)) or found
+        except Exception:
+            pass
+        return found
+
+    def stats(self) -> Dict[str, Any]:
+        return {"local": self._local.stats(), "ttl": self.ttl}
+
+# Global profile store instance
+profile_store = ProfileStore(settings.max_profiles, settings.profile_ttl)
@@ -0,0 +1,131 @@
+import re
+from collections import deque
+from typing import Dict, List, Tuple, Union
+
+# A token is either a run of word characters or a single punctuation mark,
+# so multi-character skills such as "c++", "node.js" or "ci/cd" become token
+# sequences and word boundaries fall out of the tokenization for free.
+_TOKEN_PATTERN = re.compile(r'(\s*)(\w+|[^\w\s])')
+
+# Marker prepended to a token that was preceded by whitespace
+_GAP = ' '
+
+SkillMatch = Tuple[str, int, int]
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over word tokens for multi-pattern skill matching"""
+
+    def __init__(self, skills_dict: Dict[str, List[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+        self._skills: List[str] = []
+        self._skill_tokens: List[int] = []
+        self._skill_categories: Dict[str, str] = {}
+
+        seen = set()
+        for category, skills in skills_dict.items():
+            for skill in skills:
+                key = skill.lower().strip()
+                if not key or key in seen:
+                    continue
+                seen.add(key)
+                self._skill_categories[skill] = category
+                self._add_pattern(skill, key)
+
+        self._build_failure_links()
+
+    @property
+    def size(self) -> int:
+        """Number of distinct skills compiled into the automaton"""
+        return len(self._skills)
+
+    def get_category(self, skill: str) -> str:
+        """Get the skills_dict category a skill was loaded from"""
+        return self._skill_categories.get(skill, "other")
+
+    def _add_pattern(self, skill: str, key: str):
+        """Insert a skill into the token trie"""
+        state = 0
+        tokens = _TOKEN_PATTERN.findall(key)
+        for depth, (gap, token) in enumerate(tokens):
+            edge = token if depth == 0 or not gap else _GAP + token
+            next_state = self._goto[state].get(edge)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][edge] = next_state
+            state = next_state
+
+        self._output[state].append(len(self._skills))
+        self._skills.append(skill)
+        self._skill_tokens.append(len(tokens))
+
+    def _step(self, state: int, token: str, edge: str) -> int:
+        """Follow goto/failure transitions for one token"""
+        goto = self._goto
+        fail = self._fail
+        while True:
+            next_state = goto[state].get(token if state == 0 else edge)
+            if next_state is not None:
+                return next_state
+            if state == 0:
+                return 0
+            state = fail[state]
+
+    def _build_failure_links(self):
+        """Breadth-first construction of failure links and merged outputs"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for edge, child in self._goto[state].items():
+                queue.append(child)
+                token = edge[1:] if edge.startswith(_GAP) else edge
+                fallback = self._step(self._fail[state], token, edge)
+                self._fail[child] = fallback if fallback != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find(self, text: str) -> List[SkillMatch]:
+        """Find every skill occurrence as (skill, start, end) in one pass over the text"""
+        if not text:
+            return []
+
+        goto = self._goto
+        root = goto[0]
+        output = self._output
+        skills = self._skills
+        token_counts = self._skill_tokens
+        step = self._step
+
+        matches = []
+        starts = []
+        state = 0
+        position = 0
+        # Trailing whitespace can never start a token; scanning it would retry
+        # the pattern at every position of the run (quadratic on padded input)
+        for gap, token in _TOKEN_PATTERN.findall(text.lower().rstrip()):
+            position += len(gap)
+            starts.append(position)
+            position += len(token)
+            if state == 0:
+                # Fast path: most tokens cannot start any skill
+                state = root.get(token, 0)
+                if not state:
+                    continue
+            else:
+                edge = _GAP + token if gap else token
+                state = goto[state].get(edge) or step(state, token, edge)
+            for index in output[state]:
+                matches.append((skills[index], starts[-token_counts[index]], position))
+
+        return matches
+
+    def extract(self, text: str, with_offsets: bool = False) -> Union[List[str], List[SkillMatch]]:
+        """Extract unique skills in order of first appearance"""
+        matches = self.find(text)
+        if with_offsets:
+            return matches
+        return list(dict.fromkeys(skill for skill, _, _ in matches))
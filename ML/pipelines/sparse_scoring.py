@@ -0,0 +1,266 @@
+import heapq
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from scipy import sparse
+
+from .vocabulary import Vocabulary, token_vocabulary, skill_vocabulary
+
+# Recommendation score weights
+SIMILARITY_WEIGHT = 0.6
+SKILL_WEIGHT = 0.4
+
+# Scores are ranked after rounding to 4 digits, so a bound must clear the
+# threshold by half a unit in the last place before a posting can be skipped
+ROUNDING_SLACK = 1e-4
+
+# Query tokens: strings, or a sorted unique id array from Vocabulary.encode
+Tokens = Union[Iterable[str], np.ndarray]
+
+
+def intersection_size(ids1: np.ndarray, ids2: np.ndarray) -> int:
+    """Number of ids two sorted unique id arrays share"""
+    if not len(ids1) or not len(ids2):
+        return 0
+    if len(ids1) > len(ids2):
+        ids1, ids2 = ids2, ids1
+    # Binary-search each id of the shorter array in the longer one
+    positions = np.searchsorted(ids2, ids1)
+    np.minimum(positions, len(ids2) - 1, out=positions)
+    return int(np.count_nonzero(ids2[positions] == ids1))
+
+
+def jaccard(ids1: np.ndarray, ids2: np.ndarray) -> float:
+    """Jaccard similarity of two sorted unique id arrays"""
+    if not len(ids1) or not len(ids2):
+        return 0.0
+    intersection = intersection_size(ids1, ids2)
+    return intersection / (len(ids1) + len(ids2) - intersection)
+
+
+class JobMatrix:
+    """Binary job x token and job x skill matrices for batch recommend scoring
+
+    Scores the whole pool with one sparse matrix-vector product for token
+    overlap and one for skill overlap, giving the same Jaccard similarity,
+    skill match and combined score as scoring the jobs one pair at a time.
+
+    Rows are Vocabulary.encode() ids. Columns are the vocabulary ids known
+    when the matrix is built, followed by one column per hashed id (terms
+    outside the vocabulary) that occurs in some row.
+    """
+
+    def __init__(self, token_rows: Sequence[np.ndarray], skill_rows: Sequence[np.ndarray],
+                 token_vocab: Vocabulary = token_vocabulary, skill_vocab: Vocabulary = skill_vocabulary):
+        self.token_vocab = token_vocab
+        self.skill_vocab = skill_vocab
+        self.tokens, self._token_layout = self._build(token_rows, len(token_vocab))
+        self.skills, self._skill_layout = self._build(skill_rows, len(skill_vocab))
+        self.token_counts = np.diff(self.tokens.indptr)
+        self.skill_counts = np.diff(self.skills.indptr)
+        self._token_postings: Optional[sparse.csc_matrix] = None
+        self._skill_postings: Optional[sparse.csc_matrix] = None
+
+    @classmethod
+    def from_features(cls, features: Iterable[Tuple[Iterable[str], Iterable[str]]],
+                      token_vocab: Vocabulary = token_vocabulary,
+                      skill_vocab: Vocabulary = skill_vocabulary) -> "JobMatrix":
+        """Build from per-job (tokens, skills) of a caller-supplied pool
+
+        Terms are looked up, never interned, so request data cannot grow the
+        shared vocabularies; only the job index assigns new ids.
+        """
+        token_rows = []
+        skill_rows = []
+        for tokens, skills in features:
+            token_rows.append(token_vocab.encode(tokens, intern=False))
+            skill_rows.append(skill_vocab.encode(skills, intern=False))
+        return cls(token_rows, skill_rows, token_vocab, skill_vocab)
+
+    @staticmethod
+    def _build(rows: Sequence[np.ndarray], n_vocab: int) -> Tuple[sparse.csr_matrix, Tuple[int, np.ndarray]]:
+        """Stack id arrays into a binary CSR matrix, plus its column layout
+
+        The layout is (n_vocab, sorted hashed ids); hashed id i maps to
+        column n_vocab + its position.
+        """
+        lengths = np.fromiter((len(row) for row in rows), dtype=np.int64, count=len(rows))
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        indices = np.concatenate(rows).astype(np.int32) if rows else np.zeros(0, dtype=np.int32)
+        hashed = indices < 0
+        overflow = np.unique(indices[hashed])
+        indices[hashed] = n_vocab + np.searchsorted(overflow, indices[hashed])
+        data = np.ones(len(indices), dtype=np.int32)
+        n_columns = max(n_vocab + len(overflow), 1)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_columns)), (n_vocab, overflow)
+
+    def __len__(self) -> int:
+        return self.tokens.shape[0]
+
+    def _query_vector(self, columns: np.ndarray, n_columns: int) -> np.ndarray:
+        """Dense 0/1 query vector over the matrix's columns"""
+        vector = np.zeros(n_columns, dtype=np.int32)
+        vector[columns] = 1
+        return vector
+
+    @staticmethod
+    def _columns(ids: np.ndarray, vocab: Vocabulary, layout: Tuple[int, np.ndarray]) -> np.ndarray:
+        """Matrix columns of encoded query ids; ids no row contains are dropped"""
+        n_vocab, overflow = layout
+        late = ids >= n_vocab
+        if late.any():
+            # Interned after the matrix was built, so rows saw these terms as hashed ids
+            rehashed = np.fromiter((vocab.hashed_id(vocab.term(i)) for i in ids[late].tolist()), dtype=np.int32)
+            ids = np.concatenate([ids[~late], rehashed])
+        columns = ids[ids >= 0]
+        hashed = ids[ids < 0]
+        if len(hashed) and len(overflow):
+            positions = np.minimum(np.searchsorted(overflow, hashed), len(overflow) - 1)
+            found = overflow[positions] == hashed
+            columns = np.concatenate([columns, n_vocab + positions[found]])
+        return np.unique(columns)
+
+    def _token_columns(self, tokens: Tokens) -> np.ndarray:
+        """Matrix columns of the query tokens (strings or encoded ids)"""
+        if not isinstance(tokens, np.ndarray):
+            tokens = self.token_vocab.encode(tokens, intern=False)
+        return self._columns(tokens, self.token_vocab, self._token_layout)
+
+    def _skill_columns(self, skills: Iterable[str]) -> np.ndarray:
+        """Matrix columns of the query skills"""
+        return self._columns(self.skill_vocab.encode(skills, intern=False), self.skill_vocab, self._skill_layout)
+
+    def overlaps(self, tokens: Tokens, skills: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-job token and skill intersection counts"""
+        token_overlap = self.tokens @ self._query_vector(self._token_columns(tokens), self.tokens.shape[1])
+        skill_overlap = self.skills @ self._query_vector(self._skill_columns(skills), self.skills.shape[1])
+        return token_overlap, skill_overlap
+
+    def score(self, tokens: Tokens, skills: Iterable[str],
+              overlaps: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Similarity, skill match and combined match score for every job"""
+        token_overlap, skill_overlap = overlaps if overlaps is not None else self.overlaps(tokens, skills)
+
+        similarity = np.zeros(len(self), dtype=np.float64)
+        if len(tokens):
+            union = self.token_counts + len(tokens) - token_overlap
+            np.divide(token_overlap, union, out=similarity, where=self.token_counts > 0)
+
+        skill_match = np.zeros(len(self), dtype=np.float64)
+        np.divide(skill_overlap, self.skill_counts, out=skill_match, where=self.skill_counts > 0)
+
+        match_score = (similarity * SIMILARITY_WEIGHT) + (skill_match * SKILL_WEIGHT)
+        return similarity, skill_match, match_score
+
+    def _postings(self, columns: np.ndarray, skills: bool = False) -> List[np.ndarray]:
+        """Row lists (inverted postings) of the given columns"""
+        if skills:
+            if self._skill_postings is None:
+                self._skill_postings = self.skills.tocsc()
+            postings = self._skill_postings
+        else:
+            if self._token_postings is None:
+                self._token_postings = self.tokens.tocsc()
+            postings = self._token_postings
+        return [postings.indices[postings.indptr[i]:postings.indptr[i + 1]] for i in columns]
+
+    def _count_hits(self, postings: List[np.ndarray]) -> np.ndarray:
+        """Per-row number of posting lists a row appears in"""
+        if not postings:
+            return np.zeros(len(self), dtype=np.int64)
+        return np.bincount(np.concatenate(postings), minlength=len(self))
+
+    def top_k(self, tokens: Tokens, skills: Iterable[str], k: int,
+              allowed: Optional[np.ndarray] = None, batch_size: int = 256) -> Tuple[List[Tuple[int, float, float]], int]:
+        """Top-k rows by rounded match score with MaxScore-style pruning
+
+        Skill overlap is exact for every row (skill postings are short). Each
+        query token adds at most SIMILARITY_WEIGHT / len(tokens) to a row's
+        score, so once a seed threshold is known the most frequent tokens are
+        marked non-essential and their postings are never read. Candidates
+        from the essential postings are then fully scored in decreasing
+        upper-bound order until no remaining bound can enter the heap.
+
+        Returns ([(row, match_score, skill_match)], documents_scored), ranked
+        exactly like sorting every row's rounded score (ties by row).
+        """
+        n_rows = len(self)
+        query_size = len(tokens)
+        if k <= 0 or n_rows == 0:
+            return [], 0
+
+        token_columns = self._token_columns(tokens)
+        query_vector = self._query_vector(token_columns, self.tokens.shape[1])
+
+        skill_overlap = self._count_hits(self._postings(self._skill_columns(skills), skills=True))
+        skill_match = np.zeros(n_rows, dtype=np.float64)
+        np.divide(skill_overlap, self.skill_counts, out=skill_match, where=self.skill_counts > 0)
+
+        eligible = np.ones(n_rows, dtype=bool) if allowed is None else allowed
+        scored = np.zeros(n_rows, dtype=bool)
+        heap: List[Tuple[float, int]] = []
+        documents_scored = 0
+
+        def score_rows(rows: np.ndarray):
+            nonlocal documents_scored
+            rows = rows[~scored[rows]]
+            if not len(rows):
+                return
+            scored[rows] = True
+            documents_scored += len(rows)
+            overlap = self.tokens[rows] @ query_vector
+            counts = self.token_counts[rows]
+            similarity = np.zeros(len(rows), dtype=np.float64)
+            if query_size:
+                np.divide(overlap, counts + query_size - overlap, out=similarity, where=counts > 0)
+            match_score = (similarity * SIMILARITY_WEIGHT) + (skill_match[rows] * SKILL_WEIGHT)
+            for row, score in zip(rows.tolist(), round_scores(match_score)):
+                entry = (score, -row)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        def threshold() -> float:
+            return heap[0][0] - ROUNDING_SLACK if len(heap) == k else -np.inf
+
+        # Seed the heap with the strongest skill matches to get a threshold
+        skill_rows = np.flatnonzero((skill_overlap > 0) & eligible)
+        seeds = skill_rows[np.argsort(-skill_match[skill_rows], kind='stable')[:k]]
+        score_rows(seeds)
+
+        # Tokens in the most postings are non-essential while their summed
+        # bound stays below the threshold
+        token_postings = self._postings(token_columns)
+        order = sorted(range(len(token_postings)), key=lambda i: -len(token_postings[i]))
+        per_token = SIMILARITY_WEIGHT / query_size if query_size else 0.0
+        non_essential = 0
+        while non_essential < len(order) and per_token * (non_essential + 1) < threshold():
+            non_essential += 1
+        essential_postings = [token_postings[i] for i in order[non_essential:]]
+
+        essential_overlap = self._count_hits(essential_postings)
+        candidates = np.flatnonzero(((essential_overlap > 0) | (skill_overlap > 0)) & eligible & ~scored)
+
+        # Upper bound: every non-essential token present, capped by the posting length
+        counts = self.token_counts[candidates]
+        max_overlap = np.minimum(essential_overlap[candidates] + non_essential, np.minimum(counts, query_size))
+        bound = np.zeros(len(candidates), dtype=np.float64)
+        np.divide(max_overlap, counts + query_size - max_overlap, out=bound, where=counts > 0)
+        bound = (bound * SIMILARITY_WEIGHT) + (skill_match[candidates] * SKILL_WEIGHT)
+
+        by_bound = np.argsort(-bound, kind='stable')
+        for start in range(0, len(by_bound), batch_size):
+            batch = by_bound[start:start + batch_size]
+            if bound[batch[0]] < threshold():
+                break
+            score_rows(candidates[batch])
+
+        ranked = sorted(heap, reverse=True)
+        return [(-row, score, round(float(skill_match[-row]), 4)) for score, row in ranked], documents_scored
+
+
+def round_scores(scores: np.ndarray, digits: int = 4) -> List[float]:
+    """Round like the per-job scoring path did (Python round, not np.round)"""
+    return [round(score, digits) for score in scores.tolist()]
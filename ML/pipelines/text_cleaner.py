@@ -0,0 +1,58 @@
+import re
+from typing import List
+
+# Contact details removed before analysis (compiled once per process).
+# Every pattern runs in linear time on any input:
+# - an email can only start where a non-space run starts, so the lookbehind
+#   skips the attempts from inside a long token that made \S+@\S+ quadratic;
+# - a phone match fails only when no digit follows within its run, which is
+#   possible for at most ~10 starts per run, so scanning stays linear.
+URL_PATTERN = re.compile(r'(?:http|www)\S+')
+EMAIL_PATTERN = re.compile(r'(?<!\S)\S+@\S+')
+PHONE_PATTERN = re.compile(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]')
+DIGITS = frozenset('123456789')
+
+# Words keep inner joiners and trailing +/# (node.js, ci/cd, c++, c#, don't);
+# any other non-space character is a token of its own
+TOKEN_PATTERN = re.compile(r"\w+(?:[./'-]\w+)*[+#]*|[^\w\s]")
+
+
+class TextCleaner:
+    """Precompiled lowercase/strip-contacts/normalize pipeline
+
+    Produces the same output as the original five re.sub passes:
+    URLs, emails and phone numbers are removed in that order, every
+    character outside word characters and `keep` becomes a space and
+    whitespace runs collapse to one space. The contact passes only run when
+    a cheap substring check says they can match, and the character filter
+    and whitespace collapse are fused into a single substitution.
+    """
+
+    def __init__(self, keep: str):
+        self.keep = keep
+        # Runs of whitespace and filtered characters become one space
+        self._separator_pattern = re.compile(r'[^\w' + re.escape(keep) + r']+')
+
+    def clean(self, text: str) -> str:
+        if not text:
+            return ""
+
+        text = text.lower()
+        if 'http' in text or 'www' in text:
+            text = URL_PATTERN.sub('', text)
+        if '@' in text:
+            text = EMAIL_PATTERN.sub('', text)
+        if not DIGITS.isdisjoint(text):
+            text = PHONE_PATTERN.sub('', text)
+
+        return self._separator_pattern.sub(' ', text).strip()
+
+    __call__ = clean
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word and punctuation tokens"""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+# Shared cleaners: general text keeps sentence punctuation, resume structure checks also keep hyphens
+text_cleaner = TextCleaner('.,!?;:')
+structured_cleaner = TextCleaner('.,!\\?-:;')
@@ -0,0 +1,80 @@
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import get_settings
+
+settings = get_settings()
+
+
+class Vocabulary:
+    """Process-wide string to integer id interning table
+
+    Ids are dense and non-negative. encode() also maps terms seen once the
+    vocabulary holds max_size terms, giving them negative hashed ids so that
+    untrusted text cannot grow the table without bound. A term's id never
+    changes: once the table is full, unseen terms stay hashed for good.
+    """
+
+    def __init__(self, max_size: Optional[int] = None):
+        self.max_size = max_size
+        self._ids: Dict[str, int] = {}
+        self._terms: List[str] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._ids
+
+    def intern(self, term: str) -> int:
+        """Get the id of a term, assigning a new one while there is room
+
+        Past max_size an unseen term gets its hashed (negative) id instead.
+        """
+        term_id = self._ids.get(term)
+        if term_id is None:
+            with self._lock:
+                term_id = self._ids.get(term)
+                if term_id is None:
+                    if self.max_size is not None and len(self._terms) >= self.max_size:
+                        return self.hashed_id(term)
+                    term_id = len(self._terms)
+                    self._terms.append(term)
+                    self._ids[term] = term_id
+        return term_id
+
+    @staticmethod
+    def hashed_id(term: str) -> int:
+        """Negative id of a term outside the vocabulary (stable within the process)"""
+        return -1 - (hash(term) & 0x7FFFFFFF)
+
+    def encode(self, terms: Iterable[str], intern: bool = True) -> np.ndarray:
+        """Sorted unique int32 ids of a document's terms, for set operations
+
+        Terms are interned while there is room (never with intern=False, for
+        caller-supplied job pools). Other unseen terms get an id in the
+        negative int32 range from their (per-process) hash; those ids are
+        only comparable within this process.
+        """
+        get = self._ids.get
+        intern_term = self.intern
+        hashed_id = self.hashed_id
+
+        def term_id(term: str) -> int:
+            known = get(term)
+            if known is not None:
+                return known
+            return intern_term(term) if intern else hashed_id(term)
+
+        return np.unique(np.fromiter(map(term_id, terms), dtype=np.int32))
+
+    def term(self, term_id: int) -> str:
+        """Get the term for an id"""
+        return self._terms[term_id]
+
+# Global vocabularies shared by the index and the scoring kernels
+token_vocabulary = Vocabulary(settings.max_vocabulary_size)
+skill_vocabulary = Vocabulary()
@@ -4,6 +4,9 @@ from .recommend import router as recommend_router
 from .interview import router as interview_router
 from .feedback import router as feedback_router
 from .ats import router as ats_router
+from .jobs import router as jobs_router
+from .profiles import router as profiles_router
+from .analyze import router as analyze_router
 
 __all__ = [
     "health_router",
@@ -11,5 +14,8 @@ __all__ = [
     "recommend_router", 
     "interview_router",
     "feedback_router",
-    "ats_router"
+    "ats_router",
+    "jobs_router",
+    "profiles_router",
+    "analyze_router"
 ]
\ No newline at end of file
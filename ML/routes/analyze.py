@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any, Literal
+
+from models.registry import model_registry
+from pipelines.profile_store import profile_store
+from utils.security import verify_api_key, rate_limiter
+from utils.executor import executors
+from utils.validators import validator
+from utils.tracing import TracedRoute
+from .profiles import build_profile
+from config import get_settings
+
+router = APIRouter(route_class=TracedRoute)
+settings = get_settings()
+logger = logging.getLogger("analyze_route")
+
+class AnalyzeJob(BaseModel):
+    id: str
+    title: str = ""
+    company: str = ""
+    description: str = Field(..., min_length=10, max_length=10000)
+
+class AnalyzeRequest(BaseModel):
+    resume_text: Optional[str] = Field(None, min_length=10, max_length=10000)
+    # Id returned by POST /ml/profiles, used instead of resume_text (which is the
+    # fallback if that profile expired); with store_profile, the id to store under
+    resume_id: Optional[str] = Field(None, pattern=r'^[\w.\-]{1,64}$')
+    # Store the parsed profile so the returned resume_id can be reused
+    store_profile: bool = False
+    # Jobs to match against; recommend ranks these too (or the job index when omitted)
+    jobs: Optional[List[AnalyzeJob]] = Field(None, max_length=50)
+    analyses: List[Literal['ats', 'feedback', 'match', 'recommend']] = Field(
+        ['ats', 'feedback'], min_length=1
+    )
+    target_role: str = Field("software engineer", min_length=2, max_length=100)
+    scoring: Literal['jaccard', 'tfidf', 'bm25'] = 'jaccard'
+    max_recommendations: int = Field(5, ge=1, le=20)
+
+class AnalyzeResponse(BaseModel):
+    # Set when the profile was loaded from or saved to the profile store
+    resume_id: Optional[str] = None
+    ats: Optional[Dict[str, Any]] = None
+    feedback: Optional[Dict[str, Any]] = None
+    match: Optional[List[Dict[str, Any]]] = None
+    recommend: Optional[Dict[str, Any]] = None
+    timings_ms: Dict[str, float]
+    errors: Dict[str, str] = {}
+
+async def _run_ats(profile: Dict[str, Any], request: AnalyzeRequest):
+    ats_model = model_registry.get("ats")
+    prediction = await executors.run("ats", ats_model.predict, {'resume_profile': profile})
+    prediction['explanations'] = ats_model.explain(prediction)
+    return prediction
+
+async def _run_feedback(profile: Dict[str, Any], request: AnalyzeRequest):
+    feedback_model = model_registry.get("feedback")
+    data = {'resume_profile': profile, 'target_role': request.target_role}
+    prediction = await executors.run("feedback", feedback_model.predict, data)
+    prediction['explanations'] = feedback_model.explain(prediction)
+    return prediction
+
+async def _run_match(profile: Dict[str, Any], request: AnalyzeRequest):
+    if not request.jobs:
+        raise ValueError("match requires jobs")
+    match_model = model_registry.get("match")
+    predictions = await executors.run(
+        "match", match_model.predict_profile, profile,
+        [job.description for job in request.jobs], request.scoring
+    )
+    return [
+        {'job_id': job.id, **prediction, 'explanations': match_model.explain(prediction)}
+        for job, prediction in zip(request.jobs, predictions)
+    ]
+
+async def _run_recommend(profile: Dict[str, Any], request: AnalyzeRequest):
+    recommend_model = model_registry.get("recommend")
+    data = {'resume_profile': profile, 'max_recommendations': request.max_recommendations}
+    if request.jobs:
+        data['job_pool'] = [job.dict() for job in request.jobs]
+    prediction = await executors.run("recommend", recommend_model.predict, data)
+    prediction['explanations'] = recommend_model.explain(prediction)
+    return prediction
+
+ANALYSES = {
+    'ats': _run_ats,
+    'feedback': _run_feedback,
+    'match': _run_match,
+    'recommend': _run_recommend
+}
+
+async def _timed(name: str, profile: Dict[str, Any], request: AnalyzeRequest):
+    """Run one analysis, returning (result, error, elapsed ms)"""
+    started = time.perf_counter()
+    try:
+        result, error = await ANALYSES[name](profile, request), None
+    except HTTPException as e:
+        result, error = None, str(e.detail)
+    except Exception as e:
+        logger.error(f"{name} analysis error: {str(e)}")
+        result, error = None, str(e)
+    return result, error, round((time.perf_counter() - started) * 1000, 3)
+
+@router.post("/analyze", response_model=AnalyzeResponse, dependencies=[Depends(rate_limiter.limit("analyze"))])
+async def analyze_resume(
+    request: AnalyzeRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Run several analyses of one resume in a single request
+
+    The resume is parsed once into a profile (stored only with
+    store_profile, so the returned resume_id can be reused) and the
+    requested analyses run concurrently on their model executors. A
+    failing analysis is reported in errors without failing the others.
+    """
+    started = time.perf_counter()
+    # Rejects bad input only; the profile is built from the raw text, as
+    # POST /ml/profiles does, so it is the same whichever route stored it
+    validator.validate_api_input(request.dict(), "analyze")
+    profile = None
+    if request.resume_id:
+        profile = await run_in_threadpool(profile_store.get, request.resume_id)
+        if profile is None and not request.resume_text:
+            raise HTTPException(status_code=404, detail=f"Resume profile {request.resume_id} not found or expired")
+    stored = profile is not None
+    if profile is None:
+        profile = await run_in_threadpool(build_profile, request.resume_text, request.resume_id)
+        if request.store_profile:
+            await run_in_threadpool(profile_store.save, profile)
+            stored = True
+    timings = {'parse': round((time.perf_counter() - started) * 1000, 3)}
+
+    names = list(dict.fromkeys(request.analyses))
+    outcomes = await asyncio.gather(*(_timed(name, profile, request) for name in names))
+
+    response = {'resume_id': profile['resume_id'] if stored else None, 'errors': {}}
+    for name, (result, error, elapsed) in zip(names, outcomes):
+        response[name] = result
+        timings[name] = elapsed
+        if error is not None:
+            response['errors'][name] = error
+    timings['total'] = round((time.perf_counter() - started) * 1000, 3)
+
+    return AnalyzeResponse(timings_ms=timings, **response)
@@ -2,18 +2,20 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
-from models.ats_model import ATSModel
-from utils.security import verify_api_key
+from models.registry import model_registry
+from utils.security import verify_api_key, rate_limiter
+from utils.executor import executors
+from utils.tracing import TracedRoute
+from .profiles import resolve_resume
 from config import get_settings
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 settings = get_settings()
 
-# Initialize model
-ats_model = ATSModel()
-
 class ATSRequest(BaseModel):
-    resume_text: str = Field(..., min_length=10, max_length=10000)
+    resume_text: Optional[str] = Field(None, min_length=10, max_length=10000)
+    # Id returned by POST /ml/profiles, used instead of resume_text
+    resume_id: Optional[str] = None
 
 class ATSResponse(BaseModel):
     ats_score: float
@@ -23,7 +25,7 @@ class ATSResponse(BaseModel):
     explanations: Optional[List[str]] = None
     error: Optional[str] = None
 
-@router.post("/ats", response_model=ATSResponse)
+@router.post("/ats", response_model=ATSResponse, dependencies=[Depends(rate_limiter.limit("ats"))])
 async def analyze_ats_compatibility(
     request: ATSRequest,
     api_key: str = Depends(verify_api_key)
@@ -31,14 +33,13 @@ async def analyze_ats_compatibility(
     """
     Analyze resume for ATS (Applicant Tracking System) compatibility
     """
+    ats_model = model_registry.get("ats")
     try:
         # Prepare data for model
-        data = {
-            'resume_text': request.resume_text
-        }
+        data = await resolve_resume(request.resume_text, request.resume_id)
         
         # Get ATS analysis
-        prediction = ats_model.predict(data)
+        prediction = await executors.run("ats", ats_model.predict, data)
         
         # Ensure model_version is set
         if prediction.get('model_version') is None:
@@ -50,6 +51,8 @@ async def analyze_ats_compatibility(
         
         return ATSResponse(**prediction)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -59,6 +62,7 @@ async def analyze_ats_compatibility(
 @router.get("/ats/models")
 async def get_ats_models(api_key: str = Depends(verify_api_key)):
     """Get information about available ATS models"""
+    ats_model = model_registry.get("ats")
     return {
         "current_model": ats_model.get_version(),
         "model_type": ats_model.get_type(),
@@ -2,18 +2,20 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
-from models.feedback_model import FeedbackModel
-from utils.security import verify_api_key
+from models.registry import model_registry
+from utils.security import verify_api_key, rate_limiter
+from utils.executor import executors
+from utils.tracing import TracedRoute
+from .profiles import resolve_resume
 from config import get_settings
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 settings = get_settings()
 
-# Initialize model
-feedback_model = FeedbackModel()
-
 class FeedbackRequest(BaseModel):
-    resume_text: str = Field(..., min_length=10, max_length=10000)
+    resume_text: Optional[str] = Field(None, min_length=10, max_length=10000)
+    # Id returned by POST /ml/profiles, used instead of resume_text
+    resume_id: Optional[str] = None
     target_role: str = Field("software engineer", min_length=2, max_length=100)
 
 class FeedbackResponse(BaseModel):
@@ -29,7 +31,7 @@ class FeedbackResponse(BaseModel):
     explanations: Optional[List[str]] = None
     error: Optional[str] = None
 
-@router.post("/resume/feedback", response_model=FeedbackResponse)
+@router.post("/resume/feedback", response_model=FeedbackResponse, dependencies=[Depends(rate_limiter.limit("feedback"))])
 async def get_resume_feedback(
     request: FeedbackRequest,
     api_key: str = Depends(verify_api_key)
@@ -37,15 +39,16 @@ async def get_resume_feedback(
     """
     Get detailed feedback on resume quality and improvements
     """
+    feedback_model = model_registry.get("feedback")
     try:
         # Prepare data for model
         data = {
-            'resume_text': request.resume_text,
+            **await resolve_resume(request.resume_text, request.resume_id),
             'target_role': request.target_role
         }
         
         # Get feedback
-        prediction = feedback_model.predict(data)
+        prediction = await executors.run("feedback", feedback_model.predict, data)
         
         # Ensure model_version is set
         if prediction.get('model_version') is None:
@@ -57,6 +60,8 @@ async def get_resume_feedback(
         
         return FeedbackResponse(**prediction)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -66,6 +71,7 @@ async def get_resume_feedback(
 @router.get("/feedback/models")
 async def get_feedback_models(api_key: str = Depends(verify_api_key)):
     """Get information about available feedback models"""
+    feedback_model = model_registry.get("feedback")
     return {
         "current_model": feedback_model.get_version(),
         "model_type": feedback_model.get_type(),
@@ -1,12 +1,18 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 import time
 from datetime import datetime
 import os
 from typing import Dict, Any
 
 from config import get_settings
+from utils.cache import cache_stats, redis_breaker
+from utils.executor import executors
+from models.registry import model_registry
+from models.warmup import readiness
+from utils import metrics
+from utils.tracing import TracedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 settings = get_settings()
 
 @router.get("/status")
@@ -17,18 +23,19 @@ async def health_check():
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "version": "1.0.0",
+            "ready": readiness.ready,
             "models": {
-                "match": "loaded",
-                "recommend": "loaded", 
-                "interview": "loaded",
-                "feedback": "loaded",
-                "ats": "loaded"
+                name: "loaded" if info["loaded"] else "not_loaded"
+                for name, info in model_registry.stats().items()
             },
             "settings": {
                 "debug": settings.debug,
                 "cache_enabled": settings.enable_cache,
                 "sbert_enabled": settings.enable_sbert
-            }
+            },
+            "cache": cache_stats(),
+            "redis": redis_breaker.stats(),
+            "executors": executors.stats()
         }
         
         return health_info
@@ -40,6 +47,24 @@ async def health_check():
             "timestamp": datetime.now().isoformat()
         }
 
+@router.get("/ready")
+async def readiness_probe(response: Response):
+    """Readiness probe: 503 until this worker's warmup has finished
+
+    Reports each model's load time and cold/warm synthetic prediction
+    latency in this worker.
+    """
+    report = readiness.report()
+    if not report["ready"]:
+        response.status_code = 503
+    return report
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus metrics, aggregated over every worker in multiprocess mode"""
+    content, content_type = metrics.render()
+    return Response(content=content, media_type=content_type)
+
 @router.get("/version")
 async def version_info():
     """Get version information"""
@@ -58,27 +83,17 @@ async def version_info():
 
 @router.get("/models")
 async def list_models():
-    """List all available models and their status"""
-    from models.match_model import MatchModel
-    from models.recommend_model import RecommendModel
-    from models.interview_model import InterviewModel
-    from models.feedback_model import FeedbackModel
-    from models.ats_model import ATSModel
-    
-    models = {
-        "match": MatchModel(),
-        "recommend": RecommendModel(),
-        "interview": InterviewModel(), 
-        "feedback": FeedbackModel(),
-        "ats": ATSModel()
-    }
-    
+    """List all available models and their status (never loads a model)"""
     model_info = {}
-    for name, model in models.items():
+    for name, info in model_registry.stats().items():
+        loaded = info["versions"].get(info["version"], {})
         model_info[name] = {
-            "version": model.get_version(),
-            "loaded": model.is_loaded,
-            "metadata": model.get_metadata()
+            "version": info["version"],
+            "loaded": info["loaded"],
+            "load_time_ms": loaded.get("load_time_ms"),
+            "memory_mb": loaded.get("memory_mb"),
+            "metadata": loaded.get("metadata"),
+            "versions_loaded": sorted(info["versions"])
         }
     
-    return model_info
\ No newline at end of file
+    return model_info
@@ -2,16 +2,15 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional
 
-from models.interview_model import InterviewModel
-from utils.security import verify_api_key
+from models.registry import model_registry
+from utils.security import verify_api_key, rate_limiter
+from utils.executor import executors
+from utils.tracing import TracedRoute
 from config import get_settings
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 settings = get_settings()
 
-# Initialize model
-interview_model = InterviewModel()
-
 class InterviewRequest(BaseModel):
     applied_jobs: int = Field(..., ge=0, le=1000)
     interviews_given: int = Field(..., ge=0, le=100)
@@ -30,7 +29,7 @@ class InterviewResponse(BaseModel):
     explanations: Optional[List[str]] = None
     error: Optional[str] = None
 
-@router.post("/interview", response_model=InterviewResponse)
+@router.post("/interview", response_model=InterviewResponse, dependencies=[Depends(rate_limiter.limit("interview"))])
 async def predict_interview_success(
     request: InterviewRequest,
     api_key: str = Depends(verify_api_key)
@@ -38,6 +37,7 @@ async def predict_interview_success(
     """
     Predict interview success probability based on candidate metrics
     """
+    interview_model = model_registry.get("interview")
     try:
         # Prepare data for model
         data = {
@@ -51,7 +51,7 @@ async def predict_interview_success(
         }
         
         # Get prediction
-        prediction = interview_model.predict(data)
+        prediction = await executors.run("interview", interview_model.predict, data)
         
         # Ensure model_version is set
         if prediction.get('model_version') is None:
@@ -63,6 +63,8 @@ async def predict_interview_success(
         
         return InterviewResponse(**prediction)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -72,6 +74,7 @@ async def predict_interview_success(
 @router.get("/interview/models")
 async def get_interview_models(api_key: str = Depends(verify_api_key)):
     """Get information about available interview models"""
+    interview_model = model_registry.get("interview")
     return {
         "current_model": interview_model.get_version(),
         "model_type": interview_model.get_type(),
@@ -0,0 +1,73 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any
+
+from pipelines.job_index import job_index, JobIndexUnavailable
+from utils.security import verify_api_key, rate_limiter
+from utils.tracing import TracedRoute
+from config import get_settings
+
+router = APIRouter(route_class=TracedRoute)
+settings = get_settings()
+
+class IndexedJobItem(BaseModel):
+    id: str
+    title: str
+    company: str
+    description: str = Field(..., min_length=10, max_length=10000)
+    location: Optional[str] = None
+    job_type: Optional[str] = None
+
+class JobUpsertRequest(BaseModel):
+    jobs: List[IndexedJobItem] = Field(..., min_length=1, max_length=1000)
+
+class JobUpsertResponse(BaseModel):
+    created: int
+    updated: int
+    index_size: int
+
+@router.post("/jobs", response_model=JobUpsertResponse, dependencies=[Depends(rate_limiter.limit("jobs"))])
+async def upsert_jobs(
+    request: JobUpsertRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Add or replace job postings in the recommendation index of every worker
+    """
+    try:
+        counts = await run_in_threadpool(job_index.publish, [job.dict(exclude_none=True) for job in request.jobs])
+
+        return JobUpsertResponse(index_size=len(job_index), **counts)
+
+    except JobIndexUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error indexing jobs: {str(e)}"
+        )
+
+@router.delete("/jobs/{job_id}")
+async def delete_job(
+    job_id: str,
+    api_key: str = Depends(verify_api_key)
+):
+    """Remove a job posting from the recommendation index of every worker"""
+    try:
+        found = await run_in_threadpool(job_index.retract, job_id)
+    except JobIndexUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if not found:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} is not indexed")
+
+    return {
+        "deleted": job_id,
+        "index_size": len(job_index)
+    }
+
+@router.get("/jobs")
+async def get_job_index_stats(api_key: str = Depends(verify_api_key)) -> Dict[str, Any]:
+    """Get job index statistics"""
+    await run_in_threadpool(job_index.sync)
+    return await run_in_threadpool(job_index.stats)
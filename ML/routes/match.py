@@ -1,22 +1,27 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Literal
 
-from models.match_model import MatchModel
+from models.registry import model_registry
+from pipelines.lexical import SCORING_MODES
 from utils.security import verify_api_key, rate_limiter
+from utils.executor import executors
 from utils.validators import validator
+from utils.tracing import TracedRoute
+from .profiles import resolve_resume
 from config import get_settings
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 settings = get_settings()
 
-# Initialize model
-match_model = MatchModel()
-
 class MatchRequest(BaseModel):
-    resume_text: str = Field(..., min_length=10, max_length=10000)
+    resume_text: Optional[str] = Field(None, min_length=10, max_length=10000)
+    # Id returned by POST /ml/profiles, used instead of resume_text
+    resume_id: Optional[str] = None
     job_description: str = Field(..., min_length=10, max_length=10000)
     use_cache: bool = Field(True)
+    # Similarity used for the text part of the score
+    scoring: Literal['jaccard', 'tfidf', 'bm25'] = 'jaccard'
 
 class MatchResponse(BaseModel):
     match_score: float
@@ -24,32 +29,56 @@ class MatchResponse(BaseModel):
     skill_match: float
     top_skills_matched: List[str]
     missing_skills: List[str]
+    scoring: Optional[str] = None
     model_version: str
     explanations: Optional[List[str]] = None
     error: Optional[str] = None
 
-@router.post("/match", response_model=MatchResponse)
+class MatchPair(BaseModel):
+    resume_text: str
+    job_description: str
+
+class BatchMatchRequest(BaseModel):
+    pairs: Optional[List[MatchPair]] = Field(None, max_length=200)
+    # Shorthand for scoring one resume against several job descriptions
+    resume_text: Optional[str] = None
+    job_descriptions: Optional[List[str]] = Field(None, max_length=200)
+    scoring: Literal['jaccard', 'tfidf', 'bm25'] = 'jaccard'
+
+class BatchMatchItem(BaseModel):
+    index: int
+    match_score: Optional[float] = None
+    similarity_score: Optional[float] = None
+    skill_match: Optional[float] = None
+    top_skills_matched: List[str] = []
+    missing_skills: List[str] = []
+    error: Optional[str] = None
+
+class BatchMatchResponse(BaseModel):
+    results: List[BatchMatchItem]
+    ranked_indices: List[int]
+    unique_texts: int
+    failed: int
+    scoring: str
+    model_version: str
+
+@router.post("/match", response_model=MatchResponse, dependencies=[Depends(rate_limiter.limit("match"))])
 async def calculate_match_score(
     request: MatchRequest,
-    api_key: str = Depends(verify_api_key),
-    fastapi_request: Request = None
+    api_key: str = Depends(verify_api_key)
 ):
     """
     Calculate resume-job matching score with rate limiting
     """
+    match_model = model_registry.get("match")
     try:
-        # Rate limiting
-        rate_limiter.check_rate_limit(
-            fastapi_request, 
-            limit=settings.rate_limit_per_minute, 
-            window=60
-        )
-        
         # Validate input
         input_data = validator.validate_api_input(request.dict(), "match")
+        input_data['scoring'] = request.scoring
+        input_data.update(await resolve_resume(input_data.pop('resume_text', None), input_data.pop('resume_id', None)))
         
         # Get match score
-        prediction = match_model.predict(input_data)
+        prediction = await executors.run("match", match_model.predict, input_data)
         
         # Ensure model_version is set
         if prediction.get('model_version') is None:
@@ -75,20 +104,86 @@ async def calculate_match_score(
             detail="Resume matching service temporarily unavailable. Please try again later."
         )
 
-@router.get("/match/models")
+@router.post("/match/batch", response_model=BatchMatchResponse, dependencies=[Depends(rate_limiter.limit("match_batch"))])
+async def calculate_batch_match_scores(
+    request: BatchMatchRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Score many resume-job pairs in one request
+    
+    Identical texts are analyzed once; invalid or failing pairs are reported
+    per item and do not fail the batch.
+    """
+    match_model = model_registry.get("match")
+    pairs = [pair.dict() for pair in request.pairs or []]
+    if request.job_descriptions:
+        pairs.extend(
+            {'resume_text': request.resume_text or '', 'job_description': description}
+            for description in request.job_descriptions
+        )
+    if not pairs:
+        raise HTTPException(status_code=400, detail="Provide pairs or resume_text with job_descriptions")
+    if len(pairs) > 200:
+        raise HTTPException(status_code=400, detail="Batch too large (max 200 pairs)")
+    
+    # Validate per item so one bad pair does not reject the whole batch
+    valid_pairs = {}
+    errors = {}
+    for index, pair in enumerate(pairs):
+        try:
+            valid_pairs[index] = validator.validate_api_input(pair, "match")
+        except HTTPException as e:
+            errors[index] = "; ".join(e.detail.get("errors", [])) if isinstance(e.detail, dict) else str(e.detail)
+    
+    try:
+        predictions = await executors.run(
+            "match", match_model.predict_batch, list(valid_pairs.values()), request.scoring
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        import logging
+        logger = logging.getLogger("match_route")
+        logger.error(f"Batch match prediction error: {str(e)}")
+        
+        raise HTTPException(
+            status_code=500,
+            detail="Resume matching service temporarily unavailable. Please try again later."
+        )
+    
+    results_by_index = dict(zip(valid_pairs, predictions))
+    results = []
+    for index in range(len(pairs)):
+        prediction = results_by_index.get(index, {"error": errors.get(index)})
+        results.append(BatchMatchItem(index=index, **prediction))
+    
+    scored = [item for item in results if item.error is None]
+    ranked_indices = [item.index for item in sorted(scored, key=lambda item: item.match_score, reverse=True)]
+    
+    return BatchMatchResponse(
+        results=results,
+        ranked_indices=ranked_indices,
+        unique_texts=len({pair[key] for pair in valid_pairs.values() for key in ('resume_text', 'job_description')}),
+        failed=len(results) - len(scored),
+        scoring=request.scoring,
+        model_version=match_model.get_version()
+    )
+
+@router.get("/match/models", dependencies=[Depends(rate_limiter.limit("match_models"))])
 async def get_match_models(
-    api_key: str = Depends(verify_api_key),
-    fastapi_request: Request = None
+    api_key: str = Depends(verify_api_key)
 ):
     """Get information about available match models with rate limiting"""
-    # Rate limiting for model info endpoint too
-    rate_limiter.check_rate_limit(fastapi_request, limit=30, window=60)
+    match_model = model_registry.get("match")
     
     return {
         "current_model": match_model.get_version(),
         "model_type": match_model.get_type(),
         "features": {
             "matching_strategy": ["semantic", "skill_based"],
+            "scoring_modes": list(SCORING_MODES),
+            "lexical_index": match_model.lexical_index.stats(),
             "cache_enabled": False
         }
     }
\ No newline at end of file
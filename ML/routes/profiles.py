@@ -0,0 +1,109 @@
+from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+from typing import List, Optional, Dict, Any
+
+from models.registry import model_registry
+from pipelines.profile_store import profile_store
+from utils.security import verify_api_key, rate_limiter
+from utils.tracing import TracedRoute
+from config import get_settings
+
+router = APIRouter(route_class=TracedRoute)
+settings = get_settings()
+
+class ProfileRequest(BaseModel):
+    resume_text: str = Field(..., min_length=10, max_length=10000)
+    # Caller's own id for the resume (e.g. the backend's resume id); defaults to a hash of the text
+    resume_id: Optional[str] = Field(None, pattern=r'^[\w.\-]{1,64}$')
+
+class ProfileResponse(BaseModel):
+    resume_id: str
+    skills: List[str]
+    sections: List[str]
+    word_count: int
+    persisted: bool
+
+def build_profile(resume_text: str, resume_id: Optional[str] = None) -> Dict[str, Any]:
+    """Compute the shared artifacts plus each model's resume-side features"""
+    profile = profile_store.build(resume_text, resume_id)
+    profile['ats'] = model_registry.get("ats").extract_features(resume_text)
+    profile['feedback'] = model_registry.get("feedback").extract_features(resume_text)
+    return profile
+
+async def resolve_resume(resume_text: Optional[str], resume_id: Optional[str]) -> Dict[str, Any]:
+    """Model input for a request giving either resume_text or a stored resume_id
+
+    A stored profile wins when both are given; resume_text is the fallback
+    for a profile that is missing or expired. The profile store makes
+    blocking Redis calls, so it runs in the threadpool.
+    """
+    if resume_id:
+        profile = await run_in_threadpool(profile_store.get, resume_id)
+        if profile is not None:
+            return {'resume_profile': profile}
+        if not resume_text:
+            raise HTTPException(status_code=404, detail=f"Resume profile {resume_id} not found or expired")
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Provide resume_text or resume_id")
+    return {'resume_text': resume_text}
+
+@router.post("/profiles", response_model=ProfileResponse, dependencies=[Depends(rate_limiter.limit("profiles"))])
+async def create_profile(
+    request: ProfileRequest,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Analyze a resume once and store its artifacts under a resume_id
+
+    Match, recommend, ATS and feedback requests can then pass resume_id
+    instead of resume_text and skip all resume-side preprocessing. Callers
+    may supply their own resume_id; re-posting under it replaces the profile.
+    """
+    try:
+        profile = await run_in_threadpool(build_profile, request.resume_text, request.resume_id)
+        persisted = await run_in_threadpool(profile_store.save, profile)
+
+        return ProfileResponse(
+            resume_id=profile['resume_id'],
+            skills=profile['skills'],
+            sections=list(profile['sections']),
+            word_count=len(profile['text'].split()),
+            persisted=persisted
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error creating resume profile: {str(e)}"
+        )
+
+@router.get("/profiles/{resume_id}")
+async def get_profile(
+    resume_id: str,
+    api_key: str = Depends(verify_api_key)
+):
+    """Get a summary of a stored resume profile"""
+    profile = await run_in_threadpool(profile_store.get, resume_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Resume profile {resume_id} not found or expired")
+
+    return {
+        "resume_id": resume_id,
+        "skills": profile['skills'],
+        "sections": list(profile['sections']),
+        "ats": profile.get('ats')
+    }
+
+@router.delete("/profiles/{resume_id}")
+async def delete_profile(
+    resume_id: str,
+    api_key: str = Depends(verify_api_key)
+):
+    """Remove a stored resume profile"""
+    if not await run_in_threadpool(profile_store.delete, resume_id):
+        raise HTTPException(status_code=404, detail=f"Resume profile {resume_id} not found or expired")
+
+    return {"deleted": resume_id}
@@ -2,25 +2,37 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 
-from models.recommend_model import RecommendModel
-from utils.security import verify_api_key
+from models.registry import model_registry
+from pipelines.job_index import job_index
+from utils.security import verify_api_key, rate_limiter
+from utils.executor import executors
+from utils.tracing import TracedRoute
+from .profiles import resolve_resume
 from config import get_settings
 
-router = APIRouter()
+router = APIRouter(route_class=TracedRoute)
 settings = get_settings()
 
-# Initialize model
-recommend_model = RecommendModel()
-
 class JobItem(BaseModel):
     id: str
     title: str
     company: str
     description: str
 
+class RecommendFilters(BaseModel):
+    job_ids: Optional[List[str]] = None
+    company: Optional[List[str]] = None
+    location: Optional[List[str]] = None
+    job_type: Optional[List[str]] = None
+    title_keywords: Optional[List[str]] = None
+
 class RecommendRequest(BaseModel):
-    resume_text: str = Field(..., min_length=10, max_length=10000)
-    job_pool: List[JobItem] = Field(..., min_items=1)
+    resume_text: Optional[str] = Field(None, min_length=10, max_length=10000)
+    # Id returned by POST /ml/profiles, used instead of resume_text
+    resume_id: Optional[str] = None
+    # Omit job_pool to recommend from the jobs indexed via POST /ml/jobs
+    job_pool: Optional[List[JobItem]] = Field(None, min_length=1)
+    filters: Optional[RecommendFilters] = None
     max_recommendations: int = Field(5, ge=1, le=20)
 
 class RecommendResponse(BaseModel):
@@ -28,10 +40,13 @@ class RecommendResponse(BaseModel):
     total_jobs_considered: int
     resume_skills_found: List[str]
     model_version: str
+    index_size: Optional[int] = None
+    # Postings fully scored in index mode; the rest were pruned by score bounds
+    documents_scored: Optional[int] = None
     explanations: Optional[List[str]] = None
     error: Optional[str] = None
 
-@router.post("/recommend", response_model=RecommendResponse)
+@router.post("/recommend", response_model=RecommendResponse, dependencies=[Depends(rate_limiter.limit("recommend"))])
 async def get_job_recommendations(
     request: RecommendRequest,
     api_key: str = Depends(verify_api_key)
@@ -39,16 +54,20 @@ async def get_job_recommendations(
     """
     Get personalized job recommendations based on resume
     """
+    recommend_model = model_registry.get("recommend")
     try:
         # Prepare data for model
         data = {
-            'resume_text': request.resume_text,
-            'job_pool': [job.dict() for job in request.job_pool],
+            **await resolve_resume(request.resume_text, request.resume_id),
             'max_recommendations': request.max_recommendations
         }
+        if request.job_pool is not None:
+            data['job_pool'] = [job.dict() for job in request.job_pool]
+        if request.filters is not None:
+            data['filters'] = request.filters.dict(exclude_none=True)
         
         # Get recommendations
-        prediction = recommend_model.predict(data)
+        prediction = await executors.run("recommend", recommend_model.predict, data)
         
         # Ensure model_version is set
         if prediction.get('model_version') is None:
@@ -60,6 +79,8 @@ async def get_job_recommendations(
         
         return RecommendResponse(**prediction)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, 
@@ -69,11 +90,13 @@ async def get_job_recommendations(
 @router.get("/recommend/models")
 async def get_recommend_models(api_key: str = Depends(verify_api_key)):
     """Get information about available recommendation models"""
+    recommend_model = model_registry.get("recommend")
     return {
         "current_model": recommend_model.get_version(),
         "model_type": recommend_model.get_type(),
         "features": {
             "matching_strategy": ["skill_based", "content_based"],
+            "job_index_size": len(job_index),
             "cache_enabled": False
         }
     }
\ No newline at end of file
@@ -48,11 +48,7 @@ def setup_production():
     # Test basic imports
     print("🧪 Testing imports...")
     try:
-        from models.match_model import MatchModel
-        from models.recommend_model import RecommendModel
-        from models.interview_model import InterviewModel
-        from models.feedback_model import FeedbackModel
-        from models.ats_model import ATSModel
+        from models.registry import model_registry
         print("✅ All model imports successful")
     except Exception as e:
         print(f"❌ Import test failed: {e}")
@@ -61,14 +57,8 @@ def setup_production():
     # Create sample models if they don't exist
     print("🤖 Ensuring models are ready...")
     try:
-        models = [
-            MatchModel(),
-            RecommendModel(),
-            InterviewModel(), 
-            FeedbackModel(),
-            ATSModel()
-        ]
-        print("✅ All models initialized successfully")
+        timings = model_registry.warmup()
+        print(f"✅ All models initialized successfully: {timings}")
     except Exception as e:
         print(f"⚠️ Model initialization warning: {e}")
     
@@ -7,6 +7,7 @@ Run this script to train and save all ML models
 import os
 import sys
 import json
+import argparse
 import joblib
 import pandas as pd
 import numpy as np
@@ -17,11 +18,8 @@ from typing import Dict, Any
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import get_settings
-from models.match_model import MatchModel
-from models.recommend_model import RecommendModel
-from models.interview_model import InterviewModel
-from models.feedback_model import FeedbackModel
-from models.ats_model import ATSModel
+from models.registry import model_registry
+from pipelines.lexical import LexicalIndex, artifact_prefix
 
 settings = get_settings()
 
@@ -30,14 +28,33 @@ def ensure_model_dir():
     os.makedirs(settings.model_dir, exist_ok=True)
     print(f"Models directory: {settings.model_dir}")
 
-def train_match_model() -> bool:
-    """Train and save the match model"""
+def load_job_corpus(path: str):
+    """Yield job texts from a {"jobs": [...]} JSON file or a JSONL file of jobs"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            records = (json.loads(line) for line in f if line.strip())
+        else:
+            data = json.load(f)
+            records = data.get('jobs', []) if isinstance(data, dict) else data
+        
+        for record in records:
+            if isinstance(record, str):
+                yield record
+            else:
+                yield f"{record.get('title', '')} {record.get('description', record.get('text', ''))}"
+
+def train_match_model(corpus_path: str) -> bool:
+    """Fit the lexical IDF on a job corpus and save the match model"""
     try:
         print("Training Match Model...")
-        model = MatchModel()
+        model = model_registry.get("match")
+        
+        # Fit document frequencies for tfidf/bm25 scoring
+        lexical_index = LexicalIndex().fit(load_job_corpus(corpus_path))
+        lexical_index.save(artifact_prefix(model.get_version()))
+        stats = lexical_index.stats()
+        print(f"✓ IDF fitted on {stats['documents']} documents ({stats['vocabulary_size']} terms) from {corpus_path}")
         
-        # For now, we'll just save the default model
-        # In production, you would train on actual resume-JD pairs
         success = model.save_model()
         
         if success:
@@ -55,7 +72,7 @@ def train_recommend_model() -> bool:
     """Train and save the recommendation model"""
     try:
         print("Training Recommendation Model...")
-        model = RecommendModel()
+        model = model_registry.get("recommend")
         
         # Save default model
         success = model.save_model()
@@ -75,7 +92,7 @@ def train_interview_model() -> bool:
     """Train and save the interview prediction model"""
     try:
         print("Training Interview Prediction Model...")
-        model = InterviewModel()
+        model = model_registry.get("interview")
         
         # Create sample training data (in real scenario, use actual interview outcomes)
         sample_data = {
@@ -108,7 +125,7 @@ def train_feedback_model() -> bool:
     """Train and save the feedback model"""
     try:
         print("Training Feedback Model...")
-        model = FeedbackModel()
+        model = model_registry.get("feedback")
         
         # Save default model
         success = model.save_model()
@@ -128,7 +145,7 @@ def train_ats_model() -> bool:
     """Train and save the ATS model"""
     try:
         print("Training ATS Model...")
-        model = ATSModel()
+        model = model_registry.get("ats")
         
         # Save default model
         success = model.save_model()
@@ -169,6 +186,14 @@ def save_training_metadata():
 
 def main():
     """Main training function"""
+    parser = argparse.ArgumentParser(description="Train TrackRuit ML models")
+    parser.add_argument(
+        "--corpus",
+        default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "sample_jobs.json"),
+        help="Job corpus for the match model IDF (sample_jobs.json format or JSONL)"
+    )
+    args = parser.parse_args()
+    
     print("🚀 Starting TrackRuit ML Model Training")
     print("=" * 50)
     
@@ -177,7 +202,7 @@ def main():
     
     # Train all models
     models_trained = {
-        "match": train_match_model(),
+        "match": train_match_model(args.corpus),
         "recommend": train_recommend_model(),
         "interview": train_interview_model(),
         "feedback": train_feedback_model(),
@@ -4,23 +4,12 @@ echo "🚀 Starting TrackRuit ML Service..."
 # Set environment variables
 export HOST="0.0.0.0"
 export PORT=${PORT:-8000}
+# One uvicorn worker: the job index can be served without Redis
+export WORKERS=1
 export NLTK_DATA="./nltk_data"
 
 # Create necessary directories
 mkdir -p logs
-mkdir -p nltk_data
-
-# Check if NLTK data exists, download if missing
-if [ ! -f "./nltk_data/tokenizers/punkt/PY3/english.pickle" ]; then
-    echo "📥 Downloading missing NLTK data..."
-    python -c "
-import nltk
-import os
-nltk.download('punkt', download_dir='./nltk_data', quiet=True)
-nltk.download('stopwords', download_dir='./nltk_data', quiet=True)
-print('✅ NLTK data ready')
-"
-fi
 
 echo "🔧 Environment:"
 echo "   - HOST: $HOST"
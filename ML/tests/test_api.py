@@ -24,6 +24,29 @@ def test_health_check():
     assert data["status"] == "healthy"
     assert "timestamp" in data
     assert "version" in data
+    assert data["redis"]["state"] in ("closed", "open", "half_open")
+
+def test_readiness_probe(monkeypatch):
+    """Test /ml/ready fails until warmup has finished, then reports warm latencies"""
+    from models.warmup import Readiness, readiness
+    # Hermetic: never import or download the sentence-transformer model
+    monkeypatch.setattr(get_settings(), "enable_sbert", False)
+    with TestClient(app) as warm_client:
+        for _ in range(300):
+            response = warm_client.get("/ml/ready")
+            if response.json()["status"] not in ("pending", "warming"):
+                break
+            assert response.status_code == 503
+            asyncio.run(asyncio.sleep(0.1))
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert set(data["models"]) == {"match", "recommend", "interview", "feedback", "ats"}
+    for timings in data["models"].values():
+        assert timings["warm_latency_ms"] >= 0
+        assert timings["load_ms"] >= 0
+    assert "job_index" in data["artifacts_ms"]
+    assert Readiness().report()["ready"] is False
 
 def test_version_info():
     """Test version endpoint"""
@@ -43,6 +66,27 @@ def test_models_list():
     assert "feedback" in data
     assert "ats" in data
 
+def test_tracing_headers():
+    """Test request id echo and per-stage Server-Timing on a prediction"""
+    response = client.post(
+        "/ml/match",
+        json={
+            "resume_text": "Python developer skilled in Django and AWS",
+            "job_description": "Hiring a Python engineer with Django experience",
+            "use_cache": False
+        },
+        headers={"X-API-Key": TEST_API_KEY, "X-Request-ID": "trace-test-1"}
+    )
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "trace-test-1"
+    stages = {entry.split(";")[0] for entry in response.headers["server-timing"].split(", ")}
+    assert {"validation", "preprocess", "skills", "scoring", "model.match", "serialize", "total"} <= stages
+
+    # Unusable ids are replaced with a generated one
+    response = client.get("/ml/status", headers={"X-Request-ID": "bad id\n"})
+    assert response.headers["x-request-id"] != "bad id\n"
+    assert response.headers["server-timing"].startswith("validation;")
+
 def test_match_endpoint():
     """Test resume-job matching endpoint"""
     sample_data = {
@@ -66,6 +110,24 @@ def test_match_endpoint():
     assert isinstance(data["match_score"], float)
     assert 0 <= data["match_score"] <= 1
 
+def test_match_lexical_scoring():
+    """Test selecting tfidf/bm25 scoring per request"""
+    for scoring in ("tfidf", "bm25"):
+        sample_data = {
+            "resume_text": "Experienced Python developer skilled in Django and REST APIs.",
+            "job_description": "Python developer with Django and API development experience.",
+            "scoring": scoring
+        }
+        response = client.post("/ml/match", json=sample_data, headers={"X-API-Key": TEST_API_KEY})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["scoring"] == scoring
+        assert 0 < data["similarity_score"] <= 1
+    
+    sample_data["scoring"] = "unknown"
+    response = client.post("/ml/match", json=sample_data, headers={"X-API-Key": TEST_API_KEY})
+    assert response.status_code == 422
+
 def test_batch_match_endpoint():
     """Test batch matching endpoint"""
     sample_data = {
@@ -90,6 +152,33 @@ def test_batch_match_endpoint():
     assert len(data["results"]) == 3
     assert len(data["ranked_indices"]) == 3
 
+def test_batch_match_pairs():
+    """Test batch matching with explicit pairs and per-item errors"""
+    resume = "Data scientist with experience in machine learning and Python."
+    job = "Looking for a data scientist with ML experience and Python skills."
+    sample_data = {
+        "pairs": [
+            {"resume_text": resume, "job_description": job},
+            {"resume_text": resume, "job_description": "short"},
+            {"resume_text": resume, "job_description": job}
+        ]
+    }
+    
+    response = client.post(
+        "/ml/match/batch",
+        json=sample_data,
+        headers={"X-API-Key": TEST_API_KEY}
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert [item["index"] for item in data["results"]] == [0, 1, 2]
+    assert data["results"][1]["error"]
+    assert data["results"][0]["match_score"] == data["results"][2]["match_score"]
+    assert data["failed"] == 1
+    assert data["unique_texts"] == 2
+    assert data["ranked_indices"] == [0, 2]
+
 def test_recommend_endpoint():
     """Test job recommendation endpoint"""
     sample_data = {
@@ -123,6 +212,156 @@ def test_recommend_endpoint():
     assert "total_jobs_considered" in data
     assert data["total_jobs_considered"] == 2
 
+def test_job_index_recommend(monkeypatch):
+    """Test recommending from the server-side job index"""
+    # No Redis here: a single worker serves its own copy of the index
+    monkeypatch.setattr(get_settings(), "workers", 1)
+    jobs = {
+        "jobs": [
+            {
+                "id": "idx-react",
+                "title": "React Developer",
+                "company": "Tech Co",
+                "location": "Remote",
+                "description": "Seeking React developer with TypeScript experience for frontend role."
+            },
+            {
+                "id": "idx-java",
+                "title": "Backend Developer",
+                "company": "Other Co",
+                "location": "Berlin",
+                "description": "Java backend developer position with Spring framework."
+            }
+        ]
+    }
+    
+    response = client.post("/ml/jobs", json=jobs, headers={"X-API-Key": TEST_API_KEY})
+    assert response.status_code == 200
+    assert response.json()["index_size"] >= 2
+    
+    sample_data = {
+        "resume_text": "Frontend developer with React and TypeScript experience. Skilled in modern JavaScript frameworks and CSS.",
+        "filters": {"location": ["remote"]},
+        "max_recommendations": 5
+    }
+    response = client.post("/ml/recommend", json=sample_data, headers={"X-API-Key": TEST_API_KEY})
+    assert response.status_code == 200
+    data = response.json()
+    assert [job["id"] for job in data["recommended_jobs"]] == ["idx-react"]
+    assert data["total_jobs_considered"] == 1
+    assert data["documents_scored"] == 1
+    
+    for job_id in ("idx-react", "idx-java"):
+        response = client.delete(f"/ml/jobs/{job_id}", headers={"X-API-Key": TEST_API_KEY})
+        assert response.status_code == 200
+    
+    response = client.delete("/ml/jobs/idx-react", headers={"X-API-Key": TEST_API_KEY})
+    assert response.status_code == 404
+
+def test_resume_profile():
+    """Test scoring a stored resume profile by resume_id"""
+    resume_text = ("Experience: Python developer with Django, AWS and SQL. Increased API throughput by 40%.\n"
+                   "Education: BS Computer Science\nSkills: Python, Django, Docker")
+    job_description = "Looking for a Python developer with Django and Docker experience."
+    headers = {"X-API-Key": TEST_API_KEY}
+    
+    response = client.post("/ml/profiles", json={"resume_text": resume_text}, headers=headers)
+    assert response.status_code == 200
+    profile = response.json()
+    assert "python" in profile["skills"]
+    resume_id = profile["resume_id"]
+    
+    # Scores from the stored profile match scores from the raw text
+    for path, extra in (("/ml/match", {"job_description": job_description}),
+                        ("/ml/ats", {}),
+                        ("/ml/resume/feedback", {"target_role": "python developer"})):
+        by_text = client.post(path, json={"resume_text": resume_text, **extra}, headers=headers)
+        by_id = client.post(path, json={"resume_id": resume_id, **extra}, headers=headers)
+        assert by_text.status_code == 200
+        assert by_id.status_code == 200
+        assert by_id.json() == by_text.json()
+    
+    response = client.post("/ml/match", json={"resume_id": "missing", "job_description": job_description},
+                           headers=headers)
+    assert response.status_code == 404
+    
+    # resume_text stands in for a missing or expired profile
+    response = client.post("/ml/ats", json={"resume_id": "missing", "resume_text": resume_text}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == client.post("/ml/ats", json={"resume_text": resume_text}, headers=headers).json()
+    response = client.post("/ml/match", json={"resume_id": "missing", "resume_text": resume_text,
+                                              "job_description": job_description}, headers=headers)
+    assert response.status_code == 200
+    
+    response = client.post("/ml/ats", json={}, headers=headers)
+    assert response.status_code == 400
+    
+    response = client.delete(f"/ml/profiles/{resume_id}", headers=headers)
+    assert response.status_code == 200
+    response = client.post("/ml/ats", json={"resume_id": resume_id}, headers=headers)
+    assert response.status_code == 404
+    
+    # Callers can store the profile under their own resume id
+    response = client.post("/ml/profiles", json={"resume_text": resume_text, "resume_id": "64f1c2ab9e"},
+                           headers=headers)
+    assert response.status_code == 200
+    assert response.json()["resume_id"] == "64f1c2ab9e"
+    response = client.post("/ml/ats", json={"resume_id": "64f1c2ab9e"}, headers=headers)
+    assert response.status_code == 200
+    client.delete("/ml/profiles/64f1c2ab9e", headers=headers)
+    
+    response = client.post("/ml/profiles", json={"resume_text": resume_text, "resume_id": "bad id/1"},
+                           headers=headers)
+    assert response.status_code == 422
+
+def test_analyze_endpoint():
+    """Test running several analyses over one parse"""
+    resume_text = ("Experience: Python developer with Django and AWS. Improved deploy times by 30%.\n"
+                   "Education: BS Computer Science\nSkills: Python, Docker, SQL")
+    jobs = [
+        {"id": "py", "description": "Python developer with Django and Docker experience."},
+        {"id": "java", "description": "Java backend engineer with Spring framework."}
+    ]
+    headers = {"X-API-Key": TEST_API_KEY}
+    
+    response = client.post("/ml/analyze", json={
+        "resume_text": resume_text,
+        "jobs": jobs,
+        "analyses": ["ats", "feedback", "match", "recommend"]
+    }, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["errors"] == {}
+    assert data["resume_id"] is None
+    assert set(data["timings_ms"]) == {"parse", "ats", "feedback", "match", "recommend", "total"}
+    assert [item["job_id"] for item in data["match"]] == ["py", "java"]
+    assert data["recommend"]["recommended_jobs"][0]["id"] == "py"
+    
+    # Same scores as the single-purpose endpoints
+    single = client.post("/ml/match", json={"resume_text": resume_text, "job_description": jobs[0]["description"]},
+                         headers=headers).json()
+    assert data["match"][0]["match_score"] == single["match_score"]
+    ats = client.post("/ml/ats", json={"resume_text": resume_text}, headers=headers).json()
+    assert data["ats"]["ats_score"] == ats["ats_score"]
+    
+    # The profile is stored only on request
+    response = client.post("/ml/analyze", json={"resume_text": resume_text, "analyses": ["ats"],
+                                                "store_profile": True}, headers=headers)
+    assert response.status_code == 200
+    resume_id = response.json()["resume_id"]
+    assert resume_id
+    
+    # Analyses that cannot run are reported without failing the request
+    response = client.post("/ml/analyze", json={"resume_id": resume_id, "analyses": ["match", "ats"]},
+                           headers=headers)
+    assert response.status_code == 200
+    assert "match" in response.json()["errors"]
+    assert response.json()["ats"]["ats_score"] == ats["ats_score"]
+    assert response.json()["resume_id"] == resume_id
+    
+    response = client.post("/ml/analyze", json={"resume_text": " " * 20}, headers=headers)
+    assert response.status_code == 400
+
 def test_interview_endpoint():
     """Test interview prediction endpoint"""
     sample_data = {
@@ -0,0 +1,91 @@
+import pytest
+import asyncio
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.corpus import job_corpus, resume_text, RESUME_LENGTHS
+from benchmarks.suite import cases, compare, load_baseline, run
+from benchmarks.load import build_endpoints, parse_mix, percentile, saturation_points, sweep
+
+
+def results(**relative):
+    return {"results": {name: {"relative": value, "median_ms": value} for name, value in relative.items()}}
+
+
+class TestCorpus:
+    def test_jobs_are_seeded_and_distinct(self):
+        jobs = job_corpus(50, seed=3)
+        assert jobs == job_corpus(50, seed=3)
+        assert jobs != job_corpus(50, seed=4)
+        assert len({job['id'] for job in jobs}) == 50
+        assert len({job['description'] for job in jobs}) == 50
+
+    def test_resume_sizes(self):
+        assert len(resume_text("short")) < len(resume_text("long")) <= RESUME_LENGTHS["long"]
+
+
+class TestSuite:
+    def test_compare_with_tolerance(self):
+        baseline = results(a=1.0, b=1.0, c=1.0, gone=1.0)
+        report = compare(results(a=1.2, b=1.5, c=0.5, new=1.0), baseline, tolerance=0.3)
+        assert [entry["case"] for entry in report["regressions"]] == ["b"]
+        assert [entry["case"] for entry in report["improvements"]] == ["c"]
+        assert [entry["case"] for entry in report["unchanged"]] == ["a"]
+        assert report["new_cases"] == ["new"]
+
+    def test_baseline_covers_every_case(self):
+        baseline = load_baseline()
+        assert baseline is not None
+        names = {name for name, _ in cases()}
+        assert set(baseline["results"]) | set(baseline["skipped"]) == names
+
+    def test_run_subset(self):
+        report = run("interview", min_time=0.01, min_calls=2)
+        result = report["results"]["interview.predict"]
+        assert result["calls"] >= 2
+        assert result["relative"] > 0
+
+
+def level(value, rps, error_rate=0.0):
+    summary = {"throughput_rps": rps, "error_rate": error_rate}
+    return {"level": value, "total": summary, "endpoints": {"match": summary}}
+
+
+class TestLoad:
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 100) == 100
+        assert percentile([], 50) == 0.0
+
+    def test_parse_mix(self):
+        assert parse_mix("match=5, ats") == {"match": 5.0, "ats": 1.0}
+        assert set(parse_mix("match=1")) <= set(build_endpoints())
+
+    def test_saturation_points(self):
+        assert saturation_points([level(1, 10), level(2, 19), level(4, 20)])["total"] == 2
+        assert saturation_points([level(1, 10), level(2, 19), level(4, 30, error_rate=0.2)])["match"] == 4
+        assert saturation_points([level(1, 10), level(2, 19)])["total"] is None
+
+    @pytest.mark.parametrize("mode,levels", [("closed", [1, 2]), ("open", [20])])
+    def test_sweep_in_process(self, mode, levels):
+        import httpx
+        from main import app
+
+        async def go():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await sweep(client, mode, levels, 0.5, parse_mix("status,interview,ats"), "test-api-key-123")
+
+        report = asyncio.run(go())
+        assert [result["level"] for result in report["levels"]] == levels
+        for result in report["levels"]:
+            assert result["total"]["requests"] > 0
+            assert result["total"]["error_rate"] == 0.0
+            assert set(result["endpoints"]) <= {"status", "interview", "ats"}
+            assert result["total"]["p50_ms"] <= result["total"]["p99_ms"] <= result["total"]["max_ms"]
+
@@ -0,0 +1,102 @@
+import pytest
+import json
+import random
+import re
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipelines.text_cleaner import TextCleaner, text_cleaner, structured_cleaner
+from pipelines.preprocess import preprocessor
+from benchmarks.adversarial import adversarial_inputs, fuzz_inputs, analyze
+
+# CPU budget for analysing one pathological input of twice the API's maximum
+# length. Linear-time analysis takes a few tens of ms; a quadratic pattern
+# takes seconds.
+ADVERSARIAL_LENGTH = 20000
+MAX_ANALYSIS_MS = 200
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+
+def reference_clean(text: str, char_filter: str) -> str:
+    """The original sequential re.sub cleaning passes"""
+    if not text:
+        return ""
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[\+\(]?[1-9][0-9 .\-\(\)]{8,}[0-9]', '', text)
+    text = re.sub(char_filter, ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+TEXT_FILTER = r'[^\w\s.,!?;:]'
+STRUCTURED_FILTER = r'[^\w\s\.\,\!\\?\-\:\;]'
+
+FRAGMENTS = list("abcXYZ019 5\t\n\r.-,!?;:@()+/\\%#&_'\"éß \x1c\x85") + [
+    'http', 'www', 'HTTPS://x.io', '@x.com', 'jane@mail.com', '555 123 4567', '+1 (555)', '(123) 456-7890',
+    'a@http://b', 'www.@', 'C++', 'node.js', 'ci/cd'
+]
+
+
+def fuzz_texts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 40)))
+
+
+def sample_texts():
+    with open(os.path.join(DATA_DIR, 'sample_resumes.json')) as f:
+        texts = [resume['text'] for resume in json.load(f)['resumes']]
+    with open(os.path.join(DATA_DIR, 'sample_jobs.json')) as f:
+        texts += [job['description'] for job in json.load(f)['jobs']]
+    return texts
+
+
+class TestTextCleaner:
+    @pytest.mark.parametrize("cleaner,char_filter", [
+        (text_cleaner, TEXT_FILTER),
+        (structured_cleaner, STRUCTURED_FILTER)
+    ])
+    def test_matches_reference_on_fuzzed_text(self, cleaner, char_filter):
+        for text in fuzz_texts(5000):
+            assert cleaner.clean(text) == reference_clean(text, char_filter), repr(text)
+
+    def test_matches_reference_on_sample_data(self):
+        for text in sample_texts():
+            assert text_cleaner.clean(text) == reference_clean(text, TEXT_FILTER)
+            assert structured_cleaner.clean(text) == reference_clean(text, STRUCTURED_FILTER)
+
+    def test_contacts_removed(self):
+        text = "Jane Doe | jane.doe@mail.com | +1 (555) 123-4567 | https://github.com/jane\nPython, C++!"
+        assert text_cleaner.clean(text) == "jane doe python, c !"
+        assert structured_cleaner.clean(text) == "jane doe python, c !"
+        assert structured_cleaner.clean("Full-stack - React") == "full-stack - react"
+
+    def test_empty(self):
+        assert text_cleaner.clean("") == ""
+        assert text_cleaner.clean(None) == ""
+        assert TextCleaner(".")("  !!  ") == ""
+
+    def test_shared_by_preprocessor(self):
+        text = "Senior Engineer (Python/Go) - see www.example.com"
+        assert preprocessor.clean_text(text) == text_cleaner.clean(text)
+        assert preprocessor.clean_structured_text(text) == structured_cleaner.clean(text)
+
+
+class TestAdversarialInputs:
+    @pytest.mark.parametrize("name,text", sorted(adversarial_inputs(ADVERSARIAL_LENGTH).items()))
+    def test_pathological_input_within_budget(self, name, text):
+        assert analyze(text) < MAX_ANALYSIS_MS, name
+
+    def test_fuzzed_input_within_budget(self):
+        worst = max(analyze(text) for text in fuzz_inputs(10, ADVERSARIAL_LENGTH).values())
+        assert worst < MAX_ANALYSIS_MS
+
+    def test_cleaning_still_matches_reference(self):
+        for text in adversarial_inputs(2000).values():
+            assert text_cleaner.clean(text) == reference_clean(text, TEXT_FILTER)
+            assert structured_cleaner.clean(text) == reference_clean(text, STRUCTURED_FILTER)
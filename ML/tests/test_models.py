@@ -10,6 +10,7 @@ from models.recommend_model import RecommendModel
 from models.interview_model import InterviewModel
 from models.feedback_model import FeedbackModel
 from models.ats_model import ATSModel
+from models.registry import ModelRegistry
 
 class TestMatchModel:
     def setup_method(self):
@@ -85,6 +86,24 @@ class TestRecommendModel:
         explanations = self.model.explain(prediction)
         assert isinstance(explanations, list)
 
+    def test_job_pool_past_vocabulary_cap(self, monkeypatch):
+        """Request job pools never grow the shared vocabulary and still overlap the resume"""
+        from pipelines.vocabulary import token_vocabulary
+        monkeypatch.setattr(token_vocabulary, 'max_size', len(token_vocabulary))
+        size = len(token_vocabulary)
+        words = [f"zxterm{i}" for i in range(50)]
+        result = self.model.predict({
+            'resume_text': 'Engineer fluent in ' + ' '.join(words[:10]),
+            'job_pool': [
+                {'id': 'other', 'title': 'Other', 'company': 'B', 'description': ' '.join(words[20:])},
+                {'id': 'match', 'title': 'Match', 'company': 'A', 'description': ' '.join(words[:10])}
+            ]
+        })
+        assert len(token_vocabulary) == size
+        assert result['recommended_jobs'][0]['id'] == 'match'
+        assert result['recommended_jobs'][0]['match_score'] > 0
+        assert result['recommended_jobs'][1]['match_score'] == 0
+
 class TestInterviewModel:
     def setup_method(self):
         self.model = InterviewModel()
@@ -209,5 +228,40 @@ def test_all_models_loaded():
         assert hasattr(model, 'predict')
         assert hasattr(model, 'explain')
 
+class TestModelRegistry:
+    def setup_method(self):
+        self.registry = ModelRegistry()
+
+    def test_lazy_shared_instances(self):
+        assert not self.registry.is_loaded("interview")
+        assert self.registry.stats()["interview"]["loaded"] is False
+        
+        model = self.registry.get("interview")
+        assert isinstance(model, InterviewModel)
+        assert self.registry.get("interview") is model
+        assert self.registry.is_loaded("interview")
+
+    def test_version_keyed(self):
+        default = self.registry.get("interview")
+        other = self.registry.get("interview", "interview-v2")
+        assert other is not default
+        assert other.get_version() == "interview-v2"
+        assert sorted(self.registry.stats()["interview"]["versions"]) == [default.get_version(), "interview-v2"]
+
+    def test_warmup_reports_load_info(self):
+        timings = self.registry.warmup(["ats", "feedback"])
+        assert set(timings) == {"ats", "feedback"}
+        
+        info = self.registry.stats()["ats"]
+        assert info["loaded"] is True
+        loaded = info["versions"][info["version"]]
+        assert loaded["load_time_ms"] >= 0
+        assert loaded["memory_mb"] >= 0
+        assert not self.registry.is_loaded("match")
+
+    def test_unknown_model(self):
+        with pytest.raises(KeyError):
+            self.registry.get("unknown")
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,749 @@
+import pytest
+import numpy as np
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pipelines.preprocess import preprocessor
+from pipelines.skill_matcher import SkillMatcher
+from pipelines.job_index import JobIndex, JobIndexUnavailable
+import pipelines.job_index as job_index_module
+from pipelines.sparse_scoring import JobMatrix, round_scores, jaccard, intersection_size
+from pipelines.vocabulary import Vocabulary, token_vocabulary
+from pipelines.lexical import LexicalIndex
+from pipelines.document import ParsedDocument, parse_document
+from pipelines.embeddings import EmbeddingManager
+from pipelines.embedding_codec import encode_embedding, decode_embedding
+from pipelines.profile_store import ProfileStore
+import pipelines.profile_store as profile_store_module
+import utils.cache as cache
+
+class TestSkillMatcher:
+    def setup_method(self):
+        self.matcher = SkillMatcher({
+            "programming": ["python", "java", "c++", "go", "r"],
+            "web": ["react", "react native", "node.js"],
+            "devops": ["ci/cd", "docker"],
+            "mobile": ["react native", "swift"]
+        })
+
+    def test_word_boundaries(self):
+        skills = self.matcher.extract("Javascript and golang developer with strong Rust")
+        assert skills == []
+
+    def test_punctuated_skills(self):
+        skills = self.matcher.extract("Built services in C++ and Node.js with CI/CD pipelines")
+        assert skills == ["c++", "node.js", "ci/cd"]
+
+    def test_overlapping_skills(self):
+        skills = self.matcher.extract("Shipped React Native apps")
+        assert skills == ["react", "react native"]
+
+    def test_offsets(self):
+        text = "Python, Docker and React  Native"
+        matches = self.matcher.extract(text, with_offsets=True)
+        assert [(skill, text[start:end]) for skill, start, end in matches] == [
+            ("python", "Python"),
+            ("docker", "Docker"),
+            ("react", "React"),
+            ("react native", "React  Native")
+        ]
+
+    def test_duplicates_removed(self):
+        assert self.matcher.size == 11
+        assert self.matcher.extract("python python PYTHON") == ["python"]
+        assert self.matcher.get_category("swift") == "mobile"
+
+    def test_empty_text(self):
+        assert self.matcher.extract("") == []
+
+class TestTextPreprocessor:
+    def test_extract_skills(self):
+        skills = preprocessor.extract_skills("Experienced Python developer using Django, Docker and AWS")
+        assert skills == ["python", "django", "docker", "aws"]
+
+    def test_extract_skills_with_offsets(self):
+        text = "Django and Kubernetes"
+        matches = preprocessor.extract_skills(text, with_offsets=True)
+        assert [text[start:end] for _, start, end in matches] == ["Django", "Kubernetes"]
+
+    def test_tokenize_text(self):
+        tokens = preprocessor.tokenize_text("Built C++ and Node.js services (CI/CD), didn't stop!")
+        assert tokens == ["built", "c++", "and", "node.js", "services", "(", "ci/cd", ")", ",", "didn't", "stop", "!"]
+        assert preprocessor.tokenize_text("") == []
+
+class TestVocabulary:
+    def test_encode(self):
+        vocab = Vocabulary()
+        ids = vocab.encode(["b", "a", "b", "c"])
+        assert ids.dtype == np.int32
+        assert ids.tolist() == sorted(ids.tolist())
+        assert [vocab.term(i) for i in ids] == ["b", "a", "c"]
+        assert vocab.encode([]).tolist() == []
+
+    def test_encode_past_max_size(self):
+        vocab = Vocabulary(max_size=2)
+        known = vocab.encode(["a", "b"])
+        ids = vocab.encode(["a", "x", "y", "x"])
+        assert len(vocab) == 2
+        assert len(ids) == 3 and (ids < 0).sum() == 2
+        assert known[0] in ids
+        # Hashed ids are still stable within the process
+        assert vocab.encode(["y", "x"]).tolist() == ids[ids < 0].tolist()
+        assert vocab.intern("z") == Vocabulary.hashed_id("z") and len(vocab) == 2
+
+    def test_jaccard_matches_sets(self):
+        rng = np.random.RandomState(1)
+        words = [f"w{i}" for i in range(200)]
+        vocab = Vocabulary(max_size=150)
+        for _ in range(200):
+            words1 = set(rng.choice(words, rng.randint(0, 80)).tolist())
+            words2 = set(rng.choice(words, rng.randint(0, 80)).tolist())
+            ids1, ids2 = vocab.encode(words1), vocab.encode(words2)
+            assert intersection_size(ids1, ids2) == len(words1 & words2)
+            expected = len(words1 & words2) / len(words1 | words2) if words1 and words2 else 0.0
+            assert jaccard(ids1, ids2) == expected
+
+class TestJobIndex:
+    def setup_method(self):
+        self.index = JobIndex()
+        self.index.upsert_many([
+            {'id': '1', 'title': 'Data Scientist', 'company': 'AI Corp', 'location': 'Remote',
+             'description': 'Looking for data scientist with Python and pandas experience.'},
+            {'id': '2', 'title': 'Web Developer', 'company': 'Web Co', 'location': 'London',
+             'description': 'Frontend developer role with React.'},
+            {'id': '3', 'title': 'Senior Data Scientist', 'company': 'AI Corp', 'location': 'London',
+             'description': 'Python machine learning lead.'}
+        ])
+
+    def teardown_method(self):
+        self.index.clear()
+
+    def test_features_precomputed(self):
+        assert self.index.skills('1') == ['python', 'pandas']
+        matrix, job_ids = self.index.matrix()
+        assert job_ids == ['1', '2', '3']
+        token_overlap, skill_overlap = matrix.overlaps({'pandas', 'react.'}, ['python'])
+        assert token_overlap.tolist() == [1, 1, 0]
+        assert skill_overlap.tolist() == [1, 0, 1]
+
+    def test_filters(self):
+        assert self.index.allowed_ids(None) is None
+        assert self.index.allowed_ids({'location': ['london']}) == {'2', '3'}
+        assert self.index.allowed_ids({'company': 'ai corp', 'title_keywords': ['senior']}) == {'3'}
+        assert self.index.allowed_ids({'job_ids': ['1', 'missing']}) == {'1'}
+
+    def test_upsert_replaces_postings(self):
+        created = self.index.upsert({'id': '2', 'title': 'Web Developer', 'company': 'Web Co',
+                                     'description': 'Vue developer role.'})
+        assert created is False
+        matrix, job_ids = self.index.matrix()
+        assert job_ids == ['1', '2', '3']
+        assert matrix.overlaps({'react.'}, [])[0].tolist() == [0, 0, 0]
+        assert matrix.overlaps({'vue'}, [])[0].tolist() == [0, 1, 0]
+        assert self.index.allowed_ids({'location': ['london']}) == {'3'}
+        assert len(self.index) == 3
+
+    def test_delete(self):
+        assert self.index.delete('1') is True
+        assert self.index.delete('1') is False
+        assert self.index.matrix()[1] == ['2', '3']
+        stats = self.index.stats()
+        assert stats['jobs'] == 2
+        assert stats['unique_skills'] == 2
+
+    def test_shared_between_workers(self, monkeypatch):
+        redis = FakeRedis()
+        monkeypatch.setattr(job_index_module, "get_redis", lambda: redis)
+        monkeypatch.setattr(job_index_module.settings, "job_index_sync", 0)
+        cache.redis_breaker.reset()
+        worker1, worker2 = JobIndex(key="test-jobs"), JobIndex(key="test-jobs")
+        try:
+            counts = worker1.publish([{'id': 7, 'title': 'Go Developer', 'company': 'Gopher Inc',
+                                       'description': 'Backend developer writing Go services.'}])
+            assert counts == {"created": 1, "updated": 0}
+            assert '7' in worker1 and '7' not in worker2
+            worker2.sync()
+            assert worker2.get('7') == worker1.get('7')
+            assert worker2.matrix()[1] == ['7']
+
+            # A delete on one worker reaches the others
+            assert worker2.retract('7') is True
+            worker1.sync()
+            assert len(worker1) == 0
+            assert worker1.retract('7') is False
+
+            # Nothing changed: no reload
+            redis.round_trips = 0
+            worker1.sync()
+            assert redis.round_trips == 1
+        finally:
+            worker1.clear()
+            worker2.clear()
+
+    def test_refuses_unshared_changes_with_several_workers(self, monkeypatch):
+        monkeypatch.setattr(job_index_module, "get_redis", lambda: DownRedis())
+        cache.redis_breaker.reset()
+        job = {'id': 'x', 'title': 'Go Developer', 'company': 'Gopher Inc',
+               'description': 'Backend developer writing Go services.'}
+        worker = JobIndex(key="test-jobs")
+        try:
+            monkeypatch.setattr(job_index_module.settings, "workers", 4)
+            with pytest.raises(JobIndexUnavailable):
+                worker.publish([job])
+            assert len(worker) == 0
+
+            # A single worker serves its own copy
+            monkeypatch.setattr(job_index_module.settings, "workers", 1)
+            assert worker.publish([job]) == {"created": 1, "updated": 0}
+            assert worker.retract('x') is True
+        finally:
+            worker.clear()
+            cache.redis_breaker.reset()
+
+    def test_term_vectors_stored(self):
+        from pipelines.document import ParsedDocument, document_digest
+        from pipelines.lexical import lexical_index
+        key = document_digest('Python machine learning lead.')
+        stored = lexical_index.document_vector(key)
+        assert 'python' in stored.counts
+        assert ParsedDocument('Python machine learning lead.').terms is stored
+        # Postings do not move the IDF
+        n_docs, df = lexical_index.n_docs, lexical_index.doc_freq('python')
+        self.index.delete('3')
+        assert lexical_index.document_vector(key) is None
+        assert (lexical_index.n_docs, lexical_index.doc_freq('python')) == (n_docs, df)
+
+class TestJobMatrix:
+    def test_matches_pairwise_scoring(self):
+        jobs = [
+            ("python developer with docker", ["python", "docker"]),
+            ("java backend engineer", ["java"]),
+            ("", [])
+        ]
+        resume_tokens = {"python", "developer", "react"}
+        resume_skills = ["python", "react"]
+        matrix = JobMatrix.from_features(((text.split(), skills) for text, skills in jobs),
+                                         Vocabulary(), Vocabulary())
+        similarity, skill_match, match_score = matrix.score(resume_tokens, resume_skills)
+
+        for row, (text, skills) in enumerate(jobs):
+            words = set(text.split())
+            expected_similarity = len(words & resume_tokens) / len(words | resume_tokens) if words else 0.0
+            expected_skill = len(set(skills) & set(resume_skills)) / len(skills) if skills else 0
+            assert similarity[row] == expected_similarity
+            assert skill_match[row] == expected_skill
+            assert match_score[row] == expected_similarity * 0.6 + expected_skill * 0.4
+
+    def test_top_k_matches_full_ranking(self):
+        rng = np.random.RandomState(0)
+        words = [f"w{i}" for i in range(300)]
+        skills = [f"s{i}" for i in range(20)]
+        features = [
+            (rng.choice(words, rng.randint(1, 40)).tolist(), rng.choice(skills, rng.randint(0, 4), replace=False).tolist())
+            for _ in range(2000)
+        ]
+        matrix = JobMatrix.from_features(features, Vocabulary(), Vocabulary())
+        resume_tokens = set(rng.choice(words, 60).tolist())
+        resume_skills = skills[:3]
+        allowed = rng.rand(len(matrix)) < 0.5
+
+        for mask in (None, allowed):
+            token_overlap, skill_overlap = matrix.overlaps(resume_tokens, resume_skills)
+            _, skill_match, match_score = matrix.score(resume_tokens, resume_skills)
+            candidates = (token_overlap > 0) | (skill_overlap > 0)
+            if mask is not None:
+                candidates &= mask
+            rounded = round_scores(match_score)
+            expected = sorted(np.flatnonzero(candidates).tolist(), key=lambda row: -rounded[row])[:10]
+
+            top, documents_scored = matrix.top_k(resume_tokens, resume_skills, 10, mask, batch_size=16)
+            assert [row for row, _, _ in top] == expected
+            assert [score for _, score, _ in top] == [rounded[row] for row in expected]
+            assert documents_scored < candidates.sum()
+
+    def test_encoded_query(self):
+        vocab = Vocabulary(max_size=4)
+        vocab.encode(["python", "docker", "java", "spring"])
+        matrix = JobMatrix.from_features([(["python", "docker"], []), (["java", "spring"], [])], vocab, Vocabulary())
+        query = vocab.encode(["python", "react", "go"])
+        assert (query < 0).sum() == 2
+        similarity, _, _ = matrix.score(query, [])
+        assert similarity.tolist() == matrix.score({"python", "react", "go"}, [])[0].tolist() == [0.25, 0.0]
+        top, _ = matrix.top_k(query, [], 2)
+        assert [row for row, _, _ in top] == [0]
+
+    def test_pool_terms_are_not_interned(self):
+        vocab = Vocabulary(max_size=2)
+        vocab.encode(["python"])
+        matrix = JobMatrix.from_features([(["python", "kotlin", "rust"], []), (["rust", "go"], [])], vocab, Vocabulary())
+        assert len(vocab) == 1
+        # The resume interns "kotlin" after the pool was built and gets a hashed id for "rust"
+        resume = vocab.encode(["python", "kotlin", "rust"])
+        assert len(vocab) == 2 and (resume < 0).sum() == 1
+        similarity, _, _ = matrix.score(resume, [])
+        assert similarity.tolist() == [1.0, 0.25]
+
+    def test_round_scores(self):
+        assert round_scores(JobMatrix([], [], Vocabulary(), Vocabulary()).score(set(), [])[2]) == []
+        assert round_scores(np.array([0.123456, 1 / 3])) == [0.1235, 0.3333]
+
+class TestLexicalIndex:
+    def setup_method(self):
+        self.index = LexicalIndex().fit([
+            "Python developer with Django experience",
+            "Java developer with Spring experience",
+            "Data scientist using Python and pandas"
+        ])
+
+    def test_idf(self):
+        assert self.index.n_docs == 3
+        assert self.index.doc_freq("developer") == 2
+        assert self.index.idf("pandas") > self.index.idf("python") == self.index.idf("developer")
+        assert self.index.doc_freq("with") == 0
+        assert self.index.idf("unseen") > self.index.idf("pandas")
+
+    def test_incremental_updates(self):
+        before = self.index.idf("pandas")
+        self.index.add_document("Pandas and numpy analyst")
+        assert self.index.doc_freq("pandas") == 2
+        assert self.index.idf("pandas") < before
+        self.index.remove_document("Pandas and numpy analyst")
+        assert self.index.idf("pandas") == before
+        assert self.index.n_docs == 3
+
+    def test_stored_vectors(self):
+        vector = self.index.store_document("Pandas and numpy analyst", "job-1")
+        assert self.index.document_vector("job-1") is vector
+        # Weighted once when stored, and not counted in the IDF
+        assert vector._version == self.index._version
+        assert self.index.doc_freq("pandas") == 1
+        assert self.index.n_docs == 3
+        assert self.index.store_document("Pandas and numpy analyst", "job-1") is vector
+        self.index.drop_document("job-1")
+        assert self.index.document_vector("job-1") is vector
+        self.index.drop_document("job-1")
+        assert self.index.document_vector("job-1") is None
+
+    def test_similarities(self):
+        resume = self.index.vectorize("Python developer skilled in Django and pandas")
+        python_job = self.index.vectorize("Python developer with Django experience")
+        java_job = self.index.vectorize("Java developer with Spring experience")
+        assert self.index.tfidf_similarity(resume, python_job) > self.index.tfidf_similarity(resume, java_job)
+        assert 0 < self.index.bm25_similarity(python_job, resume) <= 1
+        assert self.index.bm25_similarity(python_job, resume) > self.index.bm25_similarity(java_job, resume)
+
+    def test_save_and_load(self, tmp_path):
+        prefix = str(tmp_path / "match-test-idf")
+        self.index.save(prefix)
+        loaded = LexicalIndex.load(prefix)
+        assert isinstance(loaded._base_df, np.memmap)
+        assert loaded.n_docs == 3
+        assert loaded.doc_freq("developer") == 2
+        loaded.add_document("Python tester")
+        assert loaded.doc_freq("python") == 3
+        assert LexicalIndex.load(str(tmp_path / "missing")) is None
+
+class TestParsedDocument:
+    RESUME = ("Experience\nLed a team of 5 and increased revenue by 25%. Implemented CI with Docker.\n"
+              "Education: BS Computer Science\nSkills: Python, Django\nContact: jane@example.com")
+
+    def test_shared_per_text(self):
+        document = parse_document(self.RESUME)
+        assert parse_document(self.RESUME) is document
+        assert parse_document(self.RESUME + " ") is not document
+
+    def test_analyses(self):
+        document = parse_document(self.RESUME)
+        assert document.text == preprocessor.clean_text(self.RESUME)
+        assert document.word_count == len(document.text.split())
+        assert {"python", "django", "docker"} <= set(document.skills)
+        assert document.impact_verbs == 3
+        assert document.ats_sections == ["experience", "education", "skills"]
+        # "%" and emails are stripped before the ATS checks run
+        assert document.achievement_count == 2
+        assert document.has_contact is False
+        assert {token_vocabulary.term(i) for i in document.token_ids} == set(document.text.split())
+        assert len(document.token_ids) == len(set(document.text.split()))
+        assert parse_document("").text == ""
+
+    def test_parses_of_different_texts_do_not_wait_on_each_other(self, monkeypatch):
+        entered, release = threading.Event(), threading.Event()
+        clean_text = preprocessor.clean_text
+
+        def blocking_clean_text(text):
+            if text == "first resume":
+                entered.set()
+                release.wait(5)
+            else:
+                release.set()
+            return clean_text(text)
+
+        monkeypatch.setattr(preprocessor, "clean_text", blocking_clean_text)
+        first, second = ParsedDocument("first resume"), ParsedDocument("second resume")
+        thread = threading.Thread(target=lambda: first.text)
+        thread.start()
+        assert entered.wait(5)
+        started = time.perf_counter()
+        assert second.text == "second resume"
+        thread.join(5)
+        assert time.perf_counter() - started < 1
+        assert first.text == "first resume"
+
+class TestEmbeddingCodec:
+    def test_round_trip(self):
+        embedding = np.random.RandomState(0).rand(384).astype(np.float32)
+        data = encode_embedding(embedding, "all-MiniLM-L6-v2")
+        decoded = decode_embedding(data, "all-MiniLM-L6-v2")
+        assert np.array_equal(decoded, embedding)
+        assert len(data) < 384 * 4 + 64
+        # Decoding is a read-only view over the cached bytes
+        assert not decoded.flags.writeable
+
+    def test_float16(self):
+        embedding = np.linspace(-1, 1, 384)
+        decoded = decode_embedding(encode_embedding(embedding, "model", "float16"))
+        assert decoded.dtype == np.float16
+        assert np.allclose(decoded, embedding, atol=1e-3)
+
+    def test_rejects_foreign_entries(self):
+        data = encode_embedding(np.ones(8), "model-a")
+        assert decode_embedding(data, "model-b") is None
+        assert decode_embedding(data[:-1], "model-a") is None
+        assert decode_embedding(b"[0.1, 0.2, 0.3, 0.4, 0.5, 0.6]") is None
+        assert decode_embedding(None) is None
+
+class FakeRedis:
+    """Dict-backed Redis stand-in that counts network round trips"""
+
+    def __init__(self):
+        self.store = {}
+        self.ttls = {}
+        self.round_trips = 0
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.store.get(key) for key in keys]
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.round_trips += 1
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    def delete(self, key):
+        self.round_trips += 1
+        return 1 if self.store.pop(key, None) is not None else 0
+
+    def incr(self, key):
+        self.round_trips += 1
+        self.store[key] = int(self.store.get(key, 0)) + 1
+        return self.store[key]
+
+    def hset(self, key, mapping):
+        self.round_trips += 1
+        fields = self.store.setdefault(key, {})
+        added = len(set(mapping) - set(fields))
+        fields.update(mapping)
+        return added
+
+    def hdel(self, key, field):
+        self.round_trips += 1
+        return 1 if self.store.get(key, {}).pop(field, None) is not None else 0
+
+    def hgetall(self, key):
+        self.round_trips += 1
+        return dict(self.store.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+class FakePipeline:
+    """Queues commands and sends them in one round trip"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        round_trips = self.client.round_trips + 1
+        results = [getattr(self.client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.client.round_trips = round_trips
+        return results
+
+class FakeEncoder:
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        if isinstance(texts, str):
+            return self.encode([texts])[0]
+        self.encoded.extend(texts)
+        return np.array([[len(text), 1.0, 0.5] for text in texts], dtype=np.float32)
+
+class TestEmbeddingManager:
+    def setup_method(self):
+        self.redis = FakeRedis()
+        self._original_get_redis = (cache.get_redis, cache.get_redis_binary)
+        self._original_enable_cache = cache.settings.enable_cache
+        cache.get_redis = cache.get_redis_binary = lambda: self.redis
+        cache.settings.enable_cache = True
+        cache.local_cache.clear()
+        cache.redis_breaker.reset()
+        self.manager = EmbeddingManager()
+        self.manager.cache_enabled = True
+        self.manager.model = FakeEncoder()
+
+    def teardown_method(self):
+        cache.get_redis, cache.get_redis_binary = self._original_get_redis
+        cache.settings.enable_cache = self._original_enable_cache
+
+    def test_batch_round_trips(self):
+        texts = ["python developer", "java developer", "python developer"]
+        embeddings = self.manager.get_embeddings_batch(texts)
+        assert embeddings.shape == (3, 3)
+        assert self.manager.model.encoded == ["python developer", "java developer"]
+        assert self.redis.round_trips == 2
+
+        self.redis.round_trips = 0
+        cached = self.manager.get_embeddings_batch(texts + ["go developer"])
+        assert np.allclose(cached[:3], embeddings)
+        assert self.manager.model.encoded[-1] == "go developer"
+        assert self.redis.round_trips == 2
+
+    def test_local_cache_in_front_of_redis(self):
+        first = self.manager.get_embedding("python developer")
+        self.redis.round_trips = 0
+        second = self.manager.get_embedding("python developer")
+        assert np.array_equal(first, second)
+        assert self.redis.round_trips == 0
+        assert self.manager.model.encoded == ["python developer"]
+
+        # Redis hits are copied into the local cache
+        cache.local_cache.clear()
+        self.manager.get_embedding("python developer")
+        self.manager.get_embedding("python developer")
+        assert self.redis.round_trips == 1
+
+class TestLRUCache:
+    def test_item_budget(self):
+        lru = cache.LRUCache(max_items=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        assert lru.get("a") == 1
+        lru.set("c", 3)
+        assert "b" not in lru
+        assert lru.get("b") is None
+        assert lru.stats()["hits"] == 1
+        assert lru.stats()["misses"] == 1
+        assert lru.stats()["evictions"] == 1
+
+    def test_byte_budget(self):
+        lru = cache.LRUCache(max_items=100, max_bytes=2000)
+        lru.set("a", np.zeros(200))
+        lru.set("b", np.zeros(100))
+        assert "a" not in lru and "b" in lru
+        lru.set("huge", np.zeros(1000))
+        assert "huge" not in lru
+        assert lru.stats()["bytes"] == 800
+
+    def test_nested_values_sized_by_serialized_length(self):
+        profile = {"skills": ["python"] * 200, "text": "x" * 5000}
+        lru = cache.LRUCache(max_items=100, max_bytes=4000)
+        lru.set("profile", profile)
+        assert "profile" not in lru
+        lru.set("small", {"skills": ["python"]})
+        assert lru.stats()["bytes"] == len('{"skills":["python"]}')
+
+    def test_ttl(self, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        lru = cache.LRUCache(max_items=10)
+        lru.set("a", 1, ttl=60)
+        lru.set("b", 2)
+        now[0] += 61
+        assert lru.get("a") is None
+        assert lru.get("b") == 2
+        assert lru.stats()["expirations"] == 1
+
+    def test_local_copies_expire_and_raw_keys_are_separate(self, monkeypatch):
+        redis = FakeRedis()
+        monkeypatch.setattr(cache, "get_redis", lambda: redis)
+        monkeypatch.setattr(cache, "get_redis_binary", lambda: redis)
+        monkeypatch.setattr(cache.settings, "enable_cache", True)
+        monkeypatch.setattr(cache.settings, "local_cache_ttl", 60)
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        cache.local_cache.clear()
+        cache.redis_breaker.reset()
+
+        cache.set_cache("embedding:a", b"\x00\x01", raw=True)
+        # Not served as a decoded JSON value from the local copy
+        assert cache.get_cache("embedding:a") is None
+        assert cache.get_cache("embedding:a", raw=True) == b"\x00\x01"
+
+        cache.set_cache("profile:a", {"v": 1}, ttl=3600)
+        # Another worker overwrites the Redis copy; this worker sees it once its copy expires
+        redis.store["profile:a"] = '{"v": 2}'
+        assert cache.get_cache("profile:a") == {"v": 1}
+        now[0] += 61
+        assert cache.get_cache("profile:a") == {"v": 2}
+        cache.local_cache.clear()
+
+class DownRedis:
+    """Redis stand-in that fails every call like an unreachable server"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def pipeline(self, transaction=True):
+        # Queuing commands is local; only execute() reaches the server
+        pipe = FakePipeline(self)
+        pipe.execute = self.execute
+        return pipe
+
+    def __getattr__(self, name):
+        def fail(*args, **kwargs):
+            self.calls += 1
+            raise ConnectionError("Connection refused")
+        return fail
+
+class TestRedisCircuitBreaker:
+    def setup_method(self):
+        self.redis = DownRedis()
+        self._original_get_redis = (cache.get_redis, cache.get_redis_binary)
+        self._original_enable_cache = cache.settings.enable_cache
+        cache.get_redis = cache.get_redis_binary = lambda: self.redis
+        cache.settings.enable_cache = True
+        cache.local_cache.clear()
+        cache.redis_breaker.reset()
+
+    def teardown_method(self):
+        cache.get_redis, cache.get_redis_binary = self._original_get_redis
+        cache.settings.enable_cache = self._original_enable_cache
+        cache.redis_breaker.reset()
+
+    def test_states(self):
+        breaker = cache.CircuitBreaker(failure_threshold=2, reset_timeout=30)
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                with breaker.call("get"):
+                    raise ConnectionError()
+        assert breaker.state == "open"
+        with pytest.raises(cache.CircuitOpenError):
+            with breaker.call("get"):
+                pytest.fail("Redis called while the circuit is open")
+        assert breaker.stats()["skipped"] == 1
+
+        # After the reset timeout one probe goes through; the rest are skipped
+        breaker.opened_at -= 30
+        assert breaker.allow()
+        assert breaker.state == "half_open"
+        assert not breaker.allow()
+        breaker.record_failure(ConnectionError())
+        assert breaker.state == "open"
+
+        breaker.opened_at -= 30
+        with breaker.call("get"):
+            pass
+        assert breaker.state == "closed"
+        assert breaker.stats()["consecutive_failures"] == 0
+
+    def test_error_replies_do_not_open(self):
+        import redis
+        breaker = cache.CircuitBreaker(failure_threshold=1)
+        with pytest.raises(redis.ResponseError):
+            with breaker.call("get"):
+                raise redis.ResponseError("WRONGTYPE")
+        assert breaker.state == "closed"
+
+    def test_outage_falls_back_to_local_cache(self):
+        threshold = cache.redis_breaker.failure_threshold
+        for i in range(threshold):
+            assert cache.get_cache(f"profile:{i}") is None
+        assert self.redis.calls == threshold
+        assert cache.redis_breaker.state == "open"
+        assert cache.metrics.REGISTRY.get_sample_value("ml_redis_circuit_state") == 2
+
+        # Open circuit: Redis is no longer called, the local cache still serves
+        assert cache.set_cache("profile:a", {"skills": ["python"]}) is False
+        assert cache.get_cache("profile:a") == {"skills": ["python"]}
+        assert cache.get_cache_many(["profile:a", "profile:b"]) == [{"skills": ["python"]}, None]
+        assert cache.set_cache_many({"profile:b": 1}) is False
+        assert cache.delete_cache("profile:b") is False
+        assert self.redis.calls == threshold
+
+        calls = []
+
+        @cache.cache_result("test")
+        def compute(x):
+            calls.append(x)
+            return x * 2
+
+        assert compute(2) == compute(2) == 4
+        assert calls == [2]
+        assert self.redis.calls == threshold
+
+class TestProfileStore:
+    RESUME = "Experience: Python developer with Django and AWS.\nSkills: Python, Docker"
+
+    def setup_method(self):
+        cache.local_cache.clear()
+        cache.redis_breaker.reset()
+
+    def teardown_method(self):
+        cache.redis_breaker.reset()
+
+    def test_persisted_to_redis_not_response_cache(self, monkeypatch):
+        redis = FakeRedis()
+        monkeypatch.setattr(profile_store_module, "get_redis", lambda: redis)
+        monkeypatch.setattr(profile_store_module.settings, "local_cache_ttl", 60)
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        store = ProfileStore(max_profiles=10, ttl=3600)
+        other = ProfileStore(max_profiles=10, ttl=3600)
+
+        profile = store.build(self.RESUME)
+        assert store.save(profile) is True
+        key = f"profile:{profile['resume_id']}"
+        assert redis.ttls[key] == 3600
+        assert len(cache.local_cache) == 0
+        assert other.get(profile["resume_id"]) == profile
+
+        # Another worker's copy is dropped within LOCAL_CACHE_TTL of a delete
+        assert store.delete(profile["resume_id"]) is True
+        assert store.get(profile["resume_id"]) is None
+        assert other.get(profile["resume_id"]) == profile
+        now[0] += 61
+        assert other.get(profile["resume_id"]) is None
+        assert store.delete(profile["resume_id"]) is False
+
+    def test_local_copy_keeps_full_ttl_when_redis_is_down(self, monkeypatch):
+        monkeypatch.setattr(profile_store_module, "get_redis", lambda: DownRedis())
+        monkeypatch.setattr(profile_store_module.settings, "local_cache_ttl", 60)
+        now = [1000.0]
+        monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+        store = ProfileStore(max_profiles=10, ttl=3600)
+
+        profile = store.build(self.RESUME)
+        assert store.save(profile) is False
+        now[0] += 61
+        assert store.get(profile["resume_id"]) == profile
+        now[0] += 3600
+        assert store.get(profile["resume_id"]) is None
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,41 @@
+import json
+import subprocess
+import sys
+import os
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import startup
+from benchmarks.startup import cold_start, import_times, summarize
+
+# Budget for a fresh process to import the app, warm up the models and answer
+# its first request. Lazy imports keep this well under a second; importing
+# torch/sentence_transformers or NLTK alone would take several.
+COLD_START_BUDGET_MS = 3000
+ENV = {"ENABLE_SBERT": "false", "WARMUP_MODELS": "true"}
+
+
+class TestColdStart:
+    def test_within_budget(self):
+        timings = cold_start("/health", ENV)
+        assert timings["status_code"] == 200
+        assert timings["heavy_modules_loaded"] == []
+        total = timings["import_ms"] + timings["startup_ms"] + timings["first_response_ms"]
+        assert total < COLD_START_BUDGET_MS, timings
+
+    def test_timings_found_among_log_lines(self, monkeypatch):
+        timings = {"import_ms": 1.04, "startup_ms": 2.0, "first_response_ms": 3.0, "status_code": 200}
+        stdout = "\n".join([
+            '{"level": "INFO", "message": "Request processed"}',
+            startup.TIMINGS_MARKER + json.dumps(timings),
+            '{"level": "INFO", "message": "Shutting down"}'
+        ])
+        monkeypatch.setattr(startup, "_python", lambda args, env=None: subprocess.CompletedProcess(args, 0, stdout, ""))
+        assert cold_start("/health")["import_ms"] == 1.0
+
+    def test_import_profile(self):
+        summary = summarize(import_times("main", ENV), top=5)
+        assert 0 < summary["total_ms"] < COLD_START_BUDGET_MS
+        assert summary["slowest_imports"][0]["module"] == "main"
+        assert len(summary["top_packages_self_ms"]) == 5
@@ -0,0 +1,279 @@
+import pytest
+import asyncio
+import subprocess
+import threading
+import time
+import json
+import logging
+import sys
+import os
+from concurrent.futures import Executor
+from concurrent.futures.process import BrokenProcessPool
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+
+from utils.executor import ModelExecutor, ExecutorRegistry, parse_executor_config
+from utils import metrics
+from utils import tracing
+from utils.logger import log_prediction
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestModelExecutor:
+    def test_run_records_stats(self):
+        executor = ModelExecutor("interview", max_workers=2, max_queue=2)
+        result = asyncio.run(executor.run(lambda x, y: x + y, 2, 3))
+        assert result == 5
+
+        stats = executor.stats()
+        assert stats["completed"] == 1
+        assert stats["in_flight"] == 0
+        assert stats["queue_wait_ms"]["max"] >= 0
+        executor.shutdown()
+
+    def test_bounded_queue_rejects(self):
+        executor = ModelExecutor("recommend", max_workers=1, max_queue=1)
+        release = threading.Event()
+
+        async def submit_three():
+            tasks = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            with pytest.raises(HTTPException) as error:
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(*tasks)
+            return error.value
+
+        error = asyncio.run(submit_three())
+        assert error.status_code == 503
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        # The second call waited for the first to finish
+        assert stats["queue_wait_ms"]["max"] >= 40
+        executor.shutdown()
+
+    def test_failures_release_capacity(self):
+        executor = ModelExecutor("ats", max_workers=1, max_queue=0)
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(executor.run(fail))
+        assert asyncio.run(executor.run(time.time)) > 0
+        assert executor.stats()["failed"] == 1
+        executor.shutdown()
+
+    def test_broken_process_pool_is_replaced(self):
+        class BrokenPool(Executor):
+            def submit(self, *args, **kwargs):
+                raise BrokenProcessPool("A child process terminated abruptly")
+
+        executor = ModelExecutor("ats", kind="process", max_workers=1, max_queue=0)
+        executor._pool = BrokenPool()
+        model = type("Model", (), {"get_version": lambda self: "v1", "predict": lambda self, data: data})()
+        with pytest.raises(BrokenProcessPool):
+            asyncio.run(executor.run(model.predict, {}))
+        assert executor._pool is None
+        assert executor.stats()["failed"] == 1
+        assert executor.stats()["in_flight"] == 0
+
+class TestExecutorRegistry:
+    def test_parse_config(self):
+        assert parse_executor_config("ats=process:2:32, recommend=thread:8") == {
+            "ats": {"kind": "process", "max_workers": 2, "max_queue": 32},
+            "recommend": {"kind": "thread", "max_workers": 8}
+        }
+        with pytest.raises(ValueError):
+            parse_executor_config("ats=fiber")
+
+    def test_per_model_pools(self):
+        registry = ExecutorRegistry("interview=thread:1:4", max_workers=3, max_queue=10)
+        assert registry["interview"].max_workers == 1
+        assert registry["match"].max_workers == 3
+        assert asyncio.run(registry.run("match", str.upper, "ok")) == "OK"
+        assert set(registry.stats()) == {"match", "recommend", "interview", "feedback", "ats"}
+        registry.shutdown()
+
+    def test_warns_about_process_pools_with_worker_state(self, caplog):
+        with caplog.at_level(logging.WARNING, logger="executor"):
+            ExecutorRegistry("match=process,ats=process")
+        assert [record.getMessage().split(":")[0] for record in caplog.records] == [
+            "match runs in a process pool"
+        ]
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
+
+def sample(name: str, **labels) -> float:
+    value = metrics.REGISTRY.get_sample_value(name, labels)
+    return value or 0.0
+
+class TestMetrics:
+    def test_executor_metrics(self):
+        before = sample("ml_model_latency_seconds_count", model="feedback")
+        executor = ModelExecutor("feedback", max_workers=1, max_queue=1)
+        asyncio.run(executor.run(lambda: None))
+        executor.shutdown()
+        assert sample("ml_model_latency_seconds_count", model="feedback") == before + 1
+        assert sample("ml_executor_in_flight", model="feedback") == 0
+
+    def test_lru_and_redis_timer(self):
+        from utils.cache import LRUCache
+        cache = LRUCache(2, name="test")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+        assert sample("ml_lru_lookups_total", cache="test", result="hit") == 1
+        assert sample("ml_lru_lookups_total", cache="test", result="miss") == 1
+
+        with pytest.raises(ConnectionError):
+            with metrics.redis_timer("test"):
+                raise ConnectionError()
+        assert sample("ml_redis_errors_total", operation="test") == 1
+        assert sample("ml_redis_latency_seconds_count", operation="test") == 1
+
+    def test_render(self):
+        metrics.observe_request("/ml/test", "GET", 200, 0.01)
+        content, content_type = metrics.render()
+        assert content_type.startswith("text/plain")
+        assert b'ml_http_requests_total{endpoint="/ml/test",method="GET",status="200"} 1.0' in content
+        assert b"ml_process_resident_memory_bytes" in content
+
+    def test_multiprocess_aggregation(self, tmp_path):
+        """Samples written by separate worker processes are summed on scrape"""
+        env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+        record = "from utils import metrics; metrics.observe_request('/ml/match', 'POST', 200, 0.02)"
+        for _ in range(2):
+            subprocess.run([sys.executable, "-c", record], cwd=SERVICE_DIR, env=env, check=True)
+        scrape = "from utils import metrics; print(metrics.render()[0].decode())"
+        output = subprocess.run([sys.executable, "-c", scrape], cwd=SERVICE_DIR, env=env,
+                                check=True, capture_output=True, text=True).stdout
+        assert 'ml_http_requests_total{endpoint="/ml/match",method="POST",status="200"} 2.0' in output
+
+
+class TestTracing:
+    def test_spans_outside_request_are_noops(self):
+        with tracing.span("scoring") as current:
+            assert current is None
+        assert tracing.current_request_id() is None
+
+    def test_server_timing_and_otlp_export(self, tmp_path):
+        trace = tracing.Trace("0123456789abcdef0123456789abcdef", "POST /ml/match")
+        token = tracing._current_trace.set(trace)
+        try:
+            with tracing.span("preprocess"):
+                # Same-name nesting is not counted twice
+                with tracing.span("preprocess") as nested:
+                    assert nested.name == "preprocess"
+                tracing.in_context(lambda: tracing.traced("skills")(lambda: None)())()
+            with tracing.span("scoring", model="match"):
+                pass
+        finally:
+            tracing._current_trace.reset(token)
+        trace.root.end_ns = trace.root.start_ns + 5_000_000
+
+        assert [span.name for span in trace.spans] == ["skills", "preprocess", "scoring"]
+        skills = trace.spans[0]
+        assert skills.parent_id == trace.spans[1].span_id
+        header = trace.server_timing()
+        assert header.split(", ")[0].startswith("skills;dur=")
+        assert header.endswith("total;dur=5.00")
+
+        path = tmp_path / "spans.jsonl"
+        tracing.SpanExporter(str(path)).export([trace])
+        exported = json.loads(path.read_text())
+        spans = exported["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert {span["traceId"] for span in spans} == {trace.trace_id}
+        assert [span["name"] for span in spans] == ["POST /ml/match", "skills", "preprocess", "scoring"]
+        assert spans[3]["attributes"] == [{"key": "model", "value": {"stringValue": "match"}}]
+
+    def test_prediction_log_is_a_debug_summary(self, caplog):
+        output = {"match_score": 0.8, "matched_skills": ["python"], "feedback": "Python developer at Acme", "cached": True}
+        with caplog.at_level(logging.INFO, logger="trackruit_ml.predictions"):
+            log_prediction("match", "req-1", output, 0.0123)
+        assert caplog.records == []
+
+        with caplog.at_level(logging.DEBUG, logger="trackruit_ml.predictions"):
+            log_prediction("match", "req-1", output, 0.0123)
+            log_prediction("recommend", "req-2", [{}, {}], 0.001)
+        match, recommend = caplog.records
+        assert match.levelno == logging.DEBUG
+        assert match.output == {"match_score": 0.8}
+        assert (match.model, match.request_id, match.duration_ms) == ("match", "req-1", 12.3)
+        assert recommend.output == {"results": 2}
+        assert not hasattr(match, "input")
+
+
+
+class TestRateLimiter:
+    def make_request(self, host="10.0.0.1"):
+        from starlette.requests import Request
+        return Request({"type": "http", "client": (host, 1234), "headers": []})
+
+    def test_parse_rate_limits(self):
+        from utils.security import parse_rate_limits
+        assert parse_rate_limits("match=60, match_batch=10/30,") == {"match": (60, 60), "match_batch": (10, 30)}
+        assert parse_rate_limits("") == {}
+
+    def test_limit_precedence(self):
+        from utils.security import RateLimiter
+        limiter = RateLimiter({"match": (5, 60), "default": (50, 60), "ats": (0, 60)},
+                              {"partner-key": (500, 60)}, use_redis=False)
+        assert limiter.limit_for("match") == (5, 60)
+        assert limiter.limit_for("match", "partner-key") == (500, 60)
+        assert limiter.limit_for("recommend") == (50, 60)
+        assert limiter.limit_for("ats") is None
+        assert RateLimiter(use_redis=False).limit_for("match") is None
+
+    def test_client_id(self):
+        from utils.security import RateLimiter
+        limiter = RateLimiter(key_limits={"partner-key": (500, 60)}, use_redis=False)
+        request = self.make_request()
+        known = limiter.client_id(request, "partner-key")
+        assert known.startswith("key:") and "partner-key" not in known
+        assert limiter.client_id(request, "made-up-key") == "ip:10.0.0.1"
+
+    def test_token_bucket_denies_with_retry_after(self):
+        from utils.security import RateLimiter
+        limiter = RateLimiter({"ats": (2, 60)}, use_redis=False)
+        request = self.make_request()
+        before = sample("ml_rate_limit_decisions_total", endpoint="ats", result="limited")
+        assert limiter.check_rate_limit(request, endpoint="ats")
+        assert limiter.check_rate_limit(request, endpoint="ats")
+        with pytest.raises(HTTPException) as exc_info:
+            limiter.check_rate_limit(request, endpoint="ats")
+        assert exc_info.value.status_code == 429
+        assert 1 <= int(exc_info.value.headers["Retry-After"]) <= 30
+        assert sample("ml_rate_limit_decisions_total", endpoint="ats", result="limited") == before + 1
+        # Other clients have their own bucket
+        assert limiter.check_rate_limit(self.make_request("10.0.0.2"), endpoint="ats")
+
+    def test_falls_back_to_local_buckets_without_redis(self, monkeypatch):
+        from utils import security
+        limiter = security.RateLimiter({"ats": (1, 60)})
+        monkeypatch.setattr(security, "get_redis", lambda: None)
+        assert limiter.hit("ratelimit:test", 1, 60) == (True, 0.0)
+        allowed, retry_after = limiter.hit("ratelimit:test", 1, 60)
+        assert not allowed and retry_after > 0
+
+    def test_route_dependency_returns_429(self):
+        from fastapi import FastAPI, Depends
+        from fastapi.testclient import TestClient
+        from utils.security import RateLimiter
+        limiter = RateLimiter({"ping": (1, 60)}, use_redis=False)
+        app = FastAPI()
+
+        @app.get("/ping", dependencies=[Depends(limiter.limit("ping"))])
+        def ping():
+            return {"ok": True}
+
+        client = TestClient(app)
+        assert client.get("/ping").status_code == 200
+        response = client.get("/ping")
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
@@ -1,4 +1,4 @@
-from .cache import get_cache, set_cache, cache_result
+from .cache import get_cache, set_cache, get_cache_many, set_cache_many, cache_result
 from .logger import setup_logger, log_request, log_prediction
 from .security import verify_api_key, sanitize_input
 from .validators import validator
@@ -6,6 +6,8 @@ from .validators import validator
 __all__ = [
     "get_cache",
     "set_cache", 
+    "get_cache_many",
+    "set_cache_many",
     "cache_result",
     "setup_logger",
     "log_request",
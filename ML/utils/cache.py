@@ -1,25 +1,285 @@
 import redis
 import json
+import sys
 import hashlib
-from typing import Any, Optional
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
 from functools import wraps
 
 from config import get_settings
+from . import metrics
+from .tracing import span
 
 settings = get_settings()
+logger = logging.getLogger("cache")
+
+class LRUCache:
+    """Thread-safe in-process LRU with an item-count and optional byte budget
+    
+    Entries set with a ttl expire like their Redis copies; expired entries
+    are dropped when next looked up or evicted.
+    """
+    
+    def __init__(self, max_items: int, max_bytes: int = 0, name: str = "lru"):
+        self.name = name
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._expires: Dict[str, float] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: str) -> bool:
+        expires = self._expires.get(key)
+        return key in self._data and (expires is None or expires > time.monotonic())
+    
+    @classmethod
+    def _sizeof(cls, value: Any) -> int:
+        """Approximate payload size used for the byte budget: arrays by their
+        buffer, JSON-able values by their serialized length, other objects by
+        their attributes"""
+        nbytes = getattr(value, 'nbytes', None)
+        if nbytes is not None:
+            return int(nbytes)
+        if isinstance(value, (bytes, bytearray, str)):
+            return len(value)
+        try:
+            return len(json.dumps(value, separators=(',', ':')))
+        except (TypeError, ValueError):
+            attributes = getattr(value, '__dict__', None)
+            if not attributes:
+                return sys.getsizeof(value)
+            return sys.getsizeof(value) + sum(cls._sizeof(item) for item in attributes.values())
+    
+    def _remove(self, key: str):
+        """Drop an entry (lock held)"""
+        del self._data[key]
+        self._bytes -= self._sizes.pop(key)
+        self._expires.pop(key, None)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            hit = key in self._data
+            if hit:
+                expires = self._expires.get(key)
+                if expires is not None and expires <= time.monotonic():
+                    self._remove(key)
+                    self.expirations += 1
+                    hit = False
+            if hit:
+                self._data.move_to_end(key)
+                self.hits += 1
+                value = self._data[key]
+            else:
+                self.misses += 1
+                value = default
+        metrics.lru_lookup(self.name, hit)
+        return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, size: Optional[int] = None):
+        """Store a value, expiring after ttl seconds if given
+
+        size (e.g. the length of the payload already serialized for Redis)
+        saves measuring the value for the byte budget.
+        """
+        if self.max_items <= 0:
+            return
+        if not self.max_bytes:
+            size = 0
+        elif size is None:
+            size = self._sizeof(value)
+        if self.max_bytes and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            if ttl:
+                self._expires[key] = time.monotonic() + ttl
+            while len(self._data) > self.max_items or (self.max_bytes and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+    
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self._bytes = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "items": len(self._data),
+            "max_items": self.max_items,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+# In-process caches in front of Redis
+local_cache = LRUCache(settings.max_embedding_cache, settings.local_cache_max_bytes, name="local")
+feature_cache = LRUCache(settings.max_feature_cache, settings.local_cache_max_bytes, name="features")
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss/eviction counters of the in-process caches"""
+    return {
+        "local": local_cache.stats(),
+        "features": feature_cache.stats()
+    }
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Redis while the circuit is open"""
+
+class CircuitBreaker:
+    """Circuit breaker around Redis so an outage costs hit rate, not latency
+    
+    closed: calls go through; failure_threshold consecutive failures open
+    the circuit. open: calls fail at once with CircuitOpenError and callers
+    fall back to the in-process cache, until reset_timeout seconds have
+    passed. half_open: a single call goes through as a probe (the others
+    are still skipped); success closes the circuit, failure reopens it.
+    
+    Error replies (ResponseError) mean Redis is up and are not failures.
+    """
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.skipped = 0
+        self.opened_at = 0.0
+        self.last_error: Optional[str] = None
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        if state == "open":
+            logger.warning(f"Redis circuit open for {self.reset_timeout}s after {self.failures} failures: {self.last_error}")
+        elif state == "closed":
+            logger.info("Redis circuit closed")
+        self.state = state
+        metrics.redis_circuit(state)
+    
+    def allow(self) -> bool:
+        """Whether a Redis call may be made now (claims the probe when half-open)"""
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state("half_open")
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self.skipped += 1
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state("closed")
+    
+    def record_failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._probing = False
+                self._set_state("open")
+    
+    @contextmanager
+    def call(self, operation: str):
+        """Guard one Redis round trip; raises CircuitOpenError when skipped"""
+        if not self.allow():
+            metrics.redis_skipped(operation)
+            raise CircuitOpenError(f"Redis circuit is {self.state}; skipped {operation}")
+        try:
+            yield
+        except redis.ResponseError:
+            self.record_success()
+            raise
+        except Exception as e:
+            self.record_failure(e)
+            raise
+        else:
+            self.record_success()
+    
+    def reset(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state("closed")
+    
+    def stats(self) -> Dict[str, Any]:
+        retry_in = self.reset_timeout - (time.monotonic() - self.opened_at)
+        return {
+            "state": self.state,
+            "degraded": self.state != "closed",
+            "consecutive_failures": self.failures,
+            "skipped": self.skipped,
+            "last_error": self.last_error,
+            "retry_in_seconds": round(max(0.0, retry_in), 2) if self.state == "open" else None
+        }
+
+# Global breaker shared by every Redis user in this process
+redis_breaker = CircuitBreaker(settings.redis_breaker_failures, settings.redis_breaker_reset)
 
 # Redis connection pool
 _redis_pool = None
+_redis_binary_pool = None
+
+def _connect(decode_responses: bool):
+    # Short timeouts: a dead or unreachable Redis must fail fast so the breaker can open
+    return redis.from_url(
+        settings.redis_url, decode_responses=decode_responses,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_connect_timeout
+    )
 
 def get_redis():
     """Get Redis connection"""
     global _redis_pool
     if _redis_pool is None:
-        _redis_pool = redis.from_url(settings.redis_url, decode_responses=True)
+        _redis_pool = _connect(decode_responses=True)
     return _redis_pool
 
+def get_redis_binary():
+    """Get Redis connection that returns raw bytes (for binary payloads)"""
+    global _redis_binary_pool
+    if _redis_binary_pool is None:
+        _redis_binary_pool = _connect(decode_responses=False)
+    return _redis_binary_pool
+
 def cache_result(prefix: str, ttl: int = None):
-    """Decorator to cache function results"""
+    """Decorator to cache function results (through get_cache/set_cache)"""
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -35,60 +295,148 @@ def cache_result(prefix: str, ttl: int = None):
             full_key = f"cache:{prefix}:{cache_key}"
             
             # Try to get from cache
-            redis_client = get_redis()
-            cached = redis_client.get(full_key)
-            
+            cached = get_cache(full_key)
             if cached is not None:
-                return json.loads(cached)
+                return cached
             
             # Execute function and cache result
             result = func(*args, **kwargs)
-            redis_client.setex(full_key, ttl or settings.cache_ttl, json.dumps(result))
+            set_cache(full_key, result, ttl)
             
             return result
         return wrapper
     return decorator
 
-def get_cache(key: str) -> Optional[Any]:
-    """Get value from cache"""
+def _local_key(key: str, raw: bool) -> str:
+    """Local cache key; raw payloads live apart from decoded JSON values"""
+    return f"raw:{key}" if raw else key
+
+def _local_ttl(ttl: Optional[int] = None) -> float:
+    """Lifetime of a local copy: the Redis TTL, capped so that deletes and
+    overwrites made by other workers are seen within LOCAL_CACHE_TTL"""
+    return min(ttl or settings.cache_ttl, settings.local_cache_ttl)
+
+def get_cache(key: str, raw: bool = False) -> Optional[Any]:
+    """Get value from cache (raw=True returns the stored bytes undecoded)
+    
+    The in-process LRU is checked first; Redis hits are copied into it.
+    Values returned from the LRU are shared, so treat them as read-only.
+    """
     if not settings.enable_cache:
         return None
     
+    local_key = _local_key(key, raw)
+    value = local_cache.get(local_key)
+    if value is not None:
+        metrics.cache_request(key, "local_hit")
+        return value
+    
     try:
-        redis_client = get_redis()
-        value = redis_client.get(key)
-        return json.loads(value) if value else None
+        with redis_breaker.call("get"), span("cache", operation="get"), metrics.redis_timer("get"):
+            if raw:
+                payload = get_redis_binary().get(key)
+            else:
+                payload = get_redis().get(key)
+        value = payload if raw or not payload else json.loads(payload)
     except:
+        metrics.cache_request(key, "miss")
         return None
+    
+    if value is not None:
+        local_cache.set(local_key, value, ttl=_local_ttl(), size=len(payload))
+    metrics.cache_request(key, "redis_hit" if value is not None else "miss")
+    return value
 
-def set_cache(key: str, value: Any, ttl: int = None) -> bool:
-    """Set value in cache"""
+def set_cache(key: str, value: Any, ttl: int = None, raw: bool = False) -> bool:
+    """Set value in cache (raw=True stores bytes as-is instead of JSON)"""
     if not settings.enable_cache:
         return False
     
     try:
-        redis_client = get_redis()
-        redis_client.setex(key, ttl or settings.cache_ttl, json.dumps(value))
+        payload = value if raw else json.dumps(value)
+    except (TypeError, ValueError):
+        return False
+    local_cache.set(_local_key(key, raw), value, ttl=_local_ttl(ttl), size=len(payload))
+    
+    try:
+        redis_client = get_redis_binary() if raw else get_redis()
+        with redis_breaker.call("set"), span("cache", operation="set"), metrics.redis_timer("set"):
+            redis_client.setex(key, ttl or settings.cache_ttl, payload)
+        return True
+    except:
+        return False
+
+def get_cache_many(keys: List[str], raw: bool = False) -> List[Optional[Any]]:
+    """Get many values with a single MGET round trip (None for misses)"""
+    if not settings.enable_cache or not keys:
+        return [None] * len(keys)
+    
+    results = [local_cache.get(_local_key(key, raw)) for key in keys]
+    missing = [i for i, value in enumerate(results) if value is None]
+    for i, value in enumerate(results):
+        if value is not None:
+            metrics.cache_request(keys[i], "local_hit")
+    if not missing:
+        return results
+    
+    try:
+        with redis_breaker.call("mget"), span("cache", operation="mget"), metrics.redis_timer("mget"):
+            payloads = (get_redis_binary() if raw else get_redis()).mget([keys[i] for i in missing])
+        values = payloads if raw else [json.loads(payload) if payload else None for payload in payloads]
+    except:
+        payloads = values = [None] * len(missing)
+    
+    for i, payload, value in zip(missing, payloads, values):
+        if value is not None:
+            results[i] = value
+            local_cache.set(_local_key(keys[i], raw), value, ttl=_local_ttl(), size=len(payload))
+        metrics.cache_request(keys[i], "redis_hit" if value is not None else "miss")
+    return results
+
+def set_cache_many(items: Dict[str, Any], ttl: int = None, raw: bool = False) -> bool:
+    """Set many values with TTLs in one pipelined round trip"""
+    if not settings.enable_cache or not items:
+        return False
+    
+    try:
+        payloads = {key: value if raw else json.dumps(value) for key, value in items.items()}
+    except (TypeError, ValueError):
+        return False
+    for key, value in items.items():
+        local_cache.set(_local_key(key, raw), value, ttl=_local_ttl(ttl), size=len(payloads[key]))
+    
+    try:
+        redis_client = get_redis_binary() if raw else get_redis()
+        pipe = redis_client.pipeline(transaction=False)
+        for key, payload in payloads.items():
+            pipe.setex(key, ttl or settings.cache_ttl, payload)
+        with redis_breaker.call("pipeline"), span("cache", operation="pipeline"), metrics.redis_timer("pipeline"):
+            pipe.execute()
         return True
     except:
         return False
 
 def delete_cache(key: str) -> bool:
     """Delete key from cache"""
+    local_cache.delete(key)
+    local_cache.delete(_local_key(key, raw=True))
     try:
         redis_client = get_redis()
-        redis_client.delete(key)
+        with redis_breaker.call("delete"), span("cache", operation="delete"), metrics.redis_timer("delete"):
+            redis_client.delete(key)
         return True
     except:
         return False
 
 def clear_pattern(pattern: str) -> bool:
     """Clear keys matching pattern"""
+    local_cache.clear()
     try:
         redis_client = get_redis()
-        keys = redis_client.keys(pattern)
-        if keys:
-            redis_client.delete(*keys)
+        with redis_breaker.call("clear"), metrics.redis_timer("clear"):
+            keys = redis_client.keys(pattern)
+            if keys:
+                redis_client.delete(*keys)
         return True
     except:
         return False
\ No newline at end of file
@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Tuple
+
+from fastapi import HTTPException
+
+from config import get_settings
+from . import metrics
+from .logger import log_prediction
+from .tracing import add_span, current_request_id, in_context, span
+
+settings = get_settings()
+logger = logging.getLogger("executor")
+
+MODEL_TYPES = ('match', 'recommend', 'interview', 'feedback', 'ats')
+
+# What a model loses in a process pool, whose workers have their own copy of in-memory state
+PROCESS_POOL_WARNINGS = {
+    'recommend': "index mode sees indexed jobs only through Redis (none without it)",
+    'match': "tfidf/bm25 re-vectorize indexed job descriptions instead of reusing their stored "
+             "term vectors, and only see jobs indexed through Redis"
+}
+
+
+def _timed_call(func: Callable, args: tuple, model_type: str = None) -> Tuple[float, Any]:
+    """Run func in the worker and report when it actually started"""
+    started_at = time.time()
+    with span(f"model.{model_type}" if model_type else "model"):
+        return started_at, func(*args)
+
+
+def _call_model(model_type: str, version: str, method: str, args: tuple) -> Tuple[float, Any]:
+    """Process-pool entry point: call a method on the worker's own registry instance"""
+    started_at = time.time()
+    from models.registry import model_registry
+    model = model_registry.get(model_type, version)
+    return started_at, getattr(model, method)(*args)
+
+
+class ModelExecutor:
+    """Bounded worker pool for one model type
+
+    At most max_workers calls run at once and at most max_queue more wait;
+    anything beyond that is rejected with 503 instead of queueing without
+    bound. Queue wait (submit to start) and run time are recorded per call.
+    """
+
+    def __init__(self, name: str, kind: str = 'thread', max_workers: int = 4, max_queue: int = 64):
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool: Executor = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self._queue_waits = deque(maxlen=1000)
+        self._run_times = deque(maxlen=1000)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == 'process':
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"{self.name}-model")
+        return self._pool
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                metrics.EXECUTOR_REJECTED.labels(self.name).inc()
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"{self.name} service is at capacity. Please retry shortly."
+                )
+            self._in_flight += 1
+            self.submitted += 1
+            self._report_load()
+
+    def _report_load(self):
+        """Publish in-flight/queued counts (call with the lock held)"""
+        metrics.set_executor_load(self.name, self._in_flight, max(self._in_flight - self.max_workers, 0))
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a model call in the pool without blocking the event loop
+
+        Process pools cannot ship bound methods of models holding locks or
+        indexes, so func must be a bound model method; the worker calls the
+        same method on its own registry instance of that model version.
+        """
+        self._acquire()
+        submitted_at = time.time()
+        pool = None
+        try:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                pool = self._get_pool()
+            if self.kind == 'process':
+                call = (_call_model, self.name, func.__self__.get_version(), func.__name__, args)
+            else:
+                # Threads run in the request's context so model stages join its trace
+                call = (in_context(_timed_call), func, args, self.name)
+            started_at, result = await loop.run_in_executor(pool, *call)
+            finished_at = time.time()
+            queue_wait = max(started_at - submitted_at, 0.0)
+            add_span("queue", int(submitted_at * 1e9), int(max(started_at, submitted_at) * 1e9), model=self.name)
+            if self.kind == 'process':
+                # The worker process has no trace; record its run as one span
+                add_span(f"model.{self.name}", int(started_at * 1e9), int(finished_at * 1e9), model=self.name)
+            with self._lock:
+                self.completed += 1
+                self._queue_waits.append(queue_wait)
+                self._run_times.append(finished_at - started_at)
+            metrics.observe_model_call(self.name, queue_wait, finished_at - started_at)
+            log_prediction(self.name, current_request_id(), result, finished_at - started_at)
+            return result
+        except BrokenProcessPool:
+            # A worker process died; drop the pool so the next call starts a new one
+            with self._lock:
+                self.failed += 1
+                if self._pool is pool:
+                    self._pool = None
+            logger.error(f"{self.name} process pool broke; restarting it on the next call")
+            pool.shutdown(wait=False)
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._report_load()
+
+    @staticmethod
+    def _percentile(values, q: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = list(self._queue_waits)
+            runs = list(self._run_times)
+            in_flight = self._in_flight
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "queued": max(in_flight - self.max_workers, 0),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_wait_ms": {
+                "p50": round(self._percentile(waits, 0.5) * 1000, 3),
+                "p99": round(self._percentile(waits, 0.99) * 1000, 3),
+                "max": round(max(waits, default=0.0) * 1000, 3)
+            },
+            "run_time_ms": {
+                "p50": round(self._percentile(runs, 0.5) * 1000, 3),
+                "p99": round(self._percentile(runs, 0.99) * 1000, 3)
+            }
+        }
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait)
+                self._pool = None
+
+
+def parse_executor_config(config: str) -> Dict[str, Dict[str, Any]]:
+    """Parse MODEL_EXECUTORS, e.g. "ats=process:2:32,recommend=thread:4:16"
+
+    Each entry is <model>=<thread|process>[:workers[:queue]]; models not
+    listed get a thread pool with the default size.
+    """
+    parsed = {}
+    for entry in filter(None, (part.strip() for part in config.split(','))):
+        model_type, _, spec = entry.partition('=')
+        parts = spec.split(':')
+        kind = parts[0] or 'thread'
+        if kind not in ('thread', 'process'):
+            raise ValueError(f"Unknown executor kind '{kind}' for {model_type}")
+        options = {'kind': kind}
+        if len(parts) > 1 and parts[1]:
+            options['max_workers'] = int(parts[1])
+        if len(parts) > 2 and parts[2]:
+            options['max_queue'] = int(parts[2])
+        parsed[model_type.strip()] = options
+    return parsed
+
+
+class ExecutorRegistry:
+    """One ModelExecutor per model type"""
+
+    def __init__(self, config: str = "", max_workers: int = 4, max_queue: int = 64):
+        overrides = parse_executor_config(config)
+        self._executors = {
+            model_type: ModelExecutor(
+                model_type,
+                **{'max_workers': max_workers, 'max_queue': max_queue, **overrides.get(model_type, {})}
+            )
+            for model_type in MODEL_TYPES
+        }
+        for model_type, warning in PROCESS_POOL_WARNINGS.items():
+            if self._executors[model_type].kind == 'process':
+                logger.warning(f"{model_type} runs in a process pool: {warning}")
+
+    def __getitem__(self, model_type: str) -> ModelExecutor:
+        return self._executors[model_type]
+
+    async def run(self, model_type: str, func: Callable, *args) -> Any:
+        """Dispatch a model call to that model's pool"""
+        return await self._executors[model_type].run(func, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        return {model_type: executor.stats() for model_type, executor in self._executors.items()}
+
+    def shutdown(self):
+        for executor in self._executors.values():
+            executor.shutdown(wait=False)
+
+# Global executor registry used by the routes
+executors = ExecutorRegistry(settings.model_executors, settings.executor_workers, settings.executor_queue_size)
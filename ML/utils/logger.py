@@ -1,13 +1,22 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from config import get_settings
 
 settings = get_settings()
 
+# Writes log records to stdout from a background thread (see setup_logger)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Attributes every LogRecord has; anything else came in through extra=
+STANDARD_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
 class JSONFormatter(logging.Formatter):
     """JSON formatter for structured logging"""
     
@@ -22,19 +31,32 @@ class JSONFormatter(logging.Formatter):
             "line": record.lineno
         }
         
+        # Fields passed with extra= (request_id, duration_ms, ...)
+        for key, value in record.__dict__.items():
+            if key not in STANDARD_RECORD_ATTRIBUTES and key not in log_entry:
+                log_entry[key] = value
+        
         # Add exception info if present
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
         
-        return json.dumps(log_entry)
+        return json.dumps(log_entry, default=str)
 
 def setup_logger() -> logging.Logger:
-    """Setup application logger"""
+    """Setup application logger
+
+    Handlers run on a QueueListener thread: logging from a request only
+    enqueues the record, so formatting and the stdout write never block
+    the event loop. Logs go to stdout only; the platform collects them.
+    """
+    global _listener
     logger = logging.getLogger("trackruit_ml")
     logger.setLevel(getattr(logging, settings.log_level.upper()))
     
     # Clear existing handlers
     logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -49,20 +71,24 @@ def setup_logger() -> logging.Logger:
         formatter = JSONFormatter()
     
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
     
-    # File handler for production
-    if not settings.debug:
-        try:
-            file_handler = logging.FileHandler('ml_service.log')
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
-        except Exception as e:
-            logger.warning(f"Could not setup file logging: {e}")
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, console_handler, respect_handler_level=True)
+    _listener.start()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
     
     logger.propagate = False
     return logger
 
+def _stop_listener():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+atexit.register(_stop_listener)
+
 def log_request(request_id: str, endpoint: str, method: str, duration: float, status_code: int = 200):
     """Log HTTP request details"""
     logger = logging.getLogger("trackruit_ml.requests")
@@ -77,25 +103,32 @@ def log_request(request_id: str, endpoint: str, method: str, duration: float, st
         }
     )
 
-def log_prediction(model_name: str, request_id: str, input_data: Dict[str, Any], output_data: Dict[str, Any], duration: float):
-    """Log model prediction details"""
+def log_prediction(model_name: str, request_id: str, output_data: Any, duration: float):
+    """Log a model prediction summary at DEBUG
+
+    Only numeric top-level outputs (scores, counts) are logged, never the
+    request payload or text fields, which can hold resume content.
+    """
     logger = logging.getLogger("trackruit_ml.predictions")
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     
-    # Sanitize input data for logging
-    sanitized_input = {}
-    for key, value in input_data.items():
-        if isinstance(value, str) and len(value) > 100:
-            sanitized_input[key] = value[:100] + "..."
-        else:
-            sanitized_input[key] = value
+    if isinstance(output_data, dict):
+        summary = {
+            key: value for key, value in output_data.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        }
+    elif isinstance(output_data, list):
+        summary = {"results": len(output_data)}
+    else:
+        summary = {}
     
-    logger.info(
+    logger.debug(
         "Model prediction",
         extra={
             "model": model_name,
             "request_id": request_id,
-            "input": sanitized_input,
-            "output": output_data,
+            "output": summary,
             "duration_ms": round(duration * 1000, 2)
         }
     )
@@ -0,0 +1,194 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+)
+
+# With gunicorn, every worker writes its samples to files in this directory
+# and a scrape of any worker aggregates all of them (see gunicorn.conf.py).
+# It must be set before prometheus_client is first imported.
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REDIS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+# Requests are labelled with the route template, never the raw path
+HTTP_REQUESTS = Counter(
+    "ml_http_requests_total", "HTTP requests by endpoint, method and status code",
+    ["endpoint", "method", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "ml_http_request_duration_seconds", "HTTP request latency by endpoint",
+    ["endpoint", "method"], buckets=LATENCY_BUCKETS
+)
+MODEL_LATENCY = Histogram(
+    "ml_model_latency_seconds", "Model call run time inside its executor",
+    ["model"], buckets=LATENCY_BUCKETS
+)
+EXECUTOR_QUEUE_WAIT = Histogram(
+    "ml_executor_queue_wait_seconds", "Time model calls wait for an executor worker",
+    ["model"], buckets=LATENCY_BUCKETS
+)
+EXECUTOR_IN_FLIGHT = Gauge(
+    "ml_executor_in_flight", "Model calls running or queued",
+    ["model"], multiprocess_mode="livesum"
+)
+EXECUTOR_QUEUED = Gauge(
+    "ml_executor_queue_depth", "Model calls waiting for an executor worker",
+    ["model"], multiprocess_mode="livesum"
+)
+EXECUTOR_REJECTED = Counter(
+    "ml_executor_rejected_total", "Model calls rejected because the executor queue was full",
+    ["model"]
+)
+CACHE_REQUESTS = Counter(
+    "ml_cache_requests_total", "Redis-backed cache reads by key kind (embedding, profile, ...) and outcome",
+    ["kind", "result"]
+)
+LRU_LOOKUPS = Counter(
+    "ml_lru_lookups_total", "In-process LRU cache lookups",
+    ["cache", "result"]
+)
+REDIS_LATENCY = Histogram(
+    "ml_redis_latency_seconds", "Redis round-trip time by operation",
+    ["operation"], buckets=REDIS_BUCKETS
+)
+REDIS_ERRORS = Counter(
+    "ml_redis_errors_total", "Failed Redis operations",
+    ["operation"]
+)
+REDIS_CIRCUIT_STATE = Gauge(
+    "ml_redis_circuit_state", "Redis circuit breaker state (0 closed, 1 half-open, 2 open; worst worker)",
+    multiprocess_mode="livemax"
+)
+REDIS_CIRCUIT_TRANSITIONS = Counter(
+    "ml_redis_circuit_transitions_total", "Redis circuit breaker state changes by new state",
+    ["state"]
+)
+REDIS_SKIPPED = Counter(
+    "ml_redis_skipped_total", "Redis operations skipped because the circuit was open",
+    ["operation"]
+)
+RATE_LIMIT_DECISIONS = Counter(
+    "ml_rate_limit_decisions_total", "Rate limit checks by endpoint and outcome",
+    ["endpoint", "result"]
+)
+PROCESS_RSS = Gauge(
+    "ml_process_resident_memory_bytes", "Resident set size of each worker process",
+    multiprocess_mode="liveall"
+)
+
+# RSS is refreshed on requests at most this often (seconds)
+RSS_INTERVAL = 5.0
+_rss_updated_at = 0.0
+
+# ml_redis_circuit_state values
+CIRCUIT_STATES = {"closed": 0, "half_open": 1, "open": 2}
+
+
+def observe_request(endpoint: str, method: str, status: int, seconds: float):
+    HTTP_REQUESTS.labels(endpoint, method, str(status)).inc()
+    HTTP_LATENCY.labels(endpoint, method).observe(seconds)
+
+
+def observe_model_call(model: str, queue_wait: float, run_time: float):
+    EXECUTOR_QUEUE_WAIT.labels(model).observe(queue_wait)
+    MODEL_LATENCY.labels(model).observe(run_time)
+
+
+def set_executor_load(model: str, in_flight: int, queued: int):
+    EXECUTOR_IN_FLIGHT.labels(model).set(in_flight)
+    EXECUTOR_QUEUED.labels(model).set(queued)
+
+
+def cache_request(key: str, result: str):
+    """Count a cache read; result is local_hit, redis_hit or miss"""
+    CACHE_REQUESTS.labels(key.partition(":")[0], result).inc()
+
+
+def lru_lookup(cache: str, hit: bool):
+    LRU_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def redis_circuit(state: str):
+    REDIS_CIRCUIT_STATE.set(CIRCUIT_STATES[state])
+    REDIS_CIRCUIT_TRANSITIONS.labels(state).inc()
+
+
+def redis_skipped(operation: str):
+    REDIS_SKIPPED.labels(operation).inc()
+
+
+def rate_limit_decision(endpoint: str, allowed: bool):
+    RATE_LIMIT_DECISIONS.labels(endpoint, "allowed" if allowed else "limited").inc()
+
+
+@contextmanager
+def redis_timer(operation: str):
+    """Time one Redis round trip, counting it as an error if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        REDIS_ERRORS.labels(operation).inc()
+        raise
+    finally:
+        REDIS_LATENCY.labels(operation).observe(time.perf_counter() - started)
+
+
+def update_rss(force: bool = False):
+    """Refresh this process's RSS gauge (throttled unless forced)"""
+    global _rss_updated_at
+    now = time.monotonic()
+    if not force and now - _rss_updated_at < RSS_INTERVAL:
+        return
+    _rss_updated_at = now
+    try:
+        import psutil
+        PROCESS_RSS.set(psutil.Process(os.getpid()).memory_info().rss)
+    except Exception:
+        pass
+
+
+def render() -> Tuple[bytes, str]:
+    """Exposition text of every worker's metrics (or this process's)"""
+    update_rss(force=True)
+    if MULTIPROCESS_DIR:
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request count and latency per route"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or "unmatched"
+            observe_request(endpoint, scope["method"], status["code"], time.perf_counter() - started)
+            update_rss()
@@ -1,44 +1,168 @@
 from fastapi import HTTPException, Depends, Request
 from fastapi.security import APIKeyHeader
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import hashlib
+import math
+import threading
 import time
-from collections import defaultdict
 
 from config import get_settings
+from . import metrics
+from .cache import LRUCache, get_redis, redis_breaker
 
 settings = get_settings()
 
 # API Key header
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Token bucket per client and endpoint, refilled continuously at limit/window
+# tokens per second. State is two numbers in a hash; TIME keeps every worker
+# on the Redis clock. Returns {allowed, tokens left, seconds until a token}
+# as strings (Lua numbers are truncated to integers on return).
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+local retry_after = 0
+if allowed == 0 then
+    retry_after = (1 - tokens) / rate
+end
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+
+def parse_rate_limits(config: str, default_window: int = 60) -> Dict[str, Tuple[int, int]]:
+    """Parse RATE_LIMITS / API_KEY_RATE_LIMITS, e.g. "match=60,match_batch=10/60"
+
+    Each entry is <name>=<limit>[/<window seconds>]; a limit of 0 turns
+    limiting off for that name.
+    """
+    parsed = {}
+    for entry in filter(None, (part.strip() for part in config.split(','))):
+        name, _, spec = entry.rpartition('=')
+        limit, _, window = spec.partition('/')
+        parsed[name.strip()] = (int(limit), int(window) if window else default_window)
+    return parsed
+
+
 class RateLimiter:
-    """Rate limiting for API endpoints"""
-    def __init__(self):
-        self.requests = defaultdict(list)
+    """Token-bucket rate limiting shared by every worker through Redis
+
+    Each client (its API key when it sent a known one, otherwise its IP)
+    has one bucket per endpoint: `limit` tokens refilled over `window`
+    seconds, stored as two numbers and updated atomically by a Lua script,
+    so the limit holds across gunicorn workers and memory per client is
+    constant. When Redis is unavailable (or its circuit breaker is open)
+    the same buckets are kept in a bounded in-process LRU (per worker).
+
+    Limits resolve per API key first, then per endpoint, then "default";
+    endpoints with none of these are not limited.
+    """
     
-    def check_rate_limit(self, request: Request, limit: int = 60, window: int = 60):
-        """Check and enforce rate limits"""
-        client_ip = request.client.host
-        current_time = time.time()
-        
-        # Clean old requests
-        self.requests[client_ip] = [
-            req_time for req_time in self.requests[client_ip] 
-            if current_time - req_time < window
-        ]
+    def __init__(self, endpoint_limits: Dict[str, Tuple[int, int]] = None,
+                 key_limits: Dict[str, Tuple[int, int]] = None,
+                 max_local_clients: int = 100000, use_redis: bool = True):
+        self.endpoint_limits = endpoint_limits or {}
+        self.key_limits = key_limits or {}
+        self.use_redis = use_redis
+        self._local = LRUCache(max_local_clients, name="rate_limits")
+        self._local_lock = threading.Lock()
+        self._script = None
+    
+    def limit_for(self, endpoint: str, api_key: Optional[str] = None) -> Optional[Tuple[int, int]]:
+        """(limit, window) for a client of an endpoint, or None if unlimited"""
+        limit = self.key_limits.get(api_key) if api_key else None
+        if limit is None:
+            limit = self.endpoint_limits.get(endpoint, self.endpoint_limits.get("default"))
+        if limit is None or limit[0] <= 0:
+            return None
+        return limit
+    
+    def client_id(self, request: Request, api_key: Optional[str] = None) -> str:
+        """Bucket owner: a known API key (hashed, never stored raw) or the client IP"""
+        if api_key and (api_key == settings.api_key or api_key in self.key_limits):
+            return "key:" + hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        host = request.client.host if request is not None and request.client else "unknown"
+        return f"ip:{host}"
+    
+    def _hit_redis(self, bucket: str, limit: int, window: int) -> Tuple[bool, float]:
+        if self._script is None:
+            self._script = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+        with redis_breaker.call("rate_limit"), metrics.redis_timer("rate_limit"):
+            allowed, _, retry_after = self._script(keys=[bucket], args=[limit, limit / window])
+        return bool(int(allowed)), float(retry_after)
+    
+    def _hit_local(self, bucket: str, limit: int, window: int) -> Tuple[bool, float]:
+        rate = limit / window
+        with self._local_lock:
+            now = time.monotonic()
+            tokens, updated = self._local.get(bucket) or (float(limit), now)
+            tokens = min(float(limit), tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._local.set(bucket, (tokens, now))
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+    
+    def hit(self, bucket: str, limit: int, window: int) -> Tuple[bool, float]:
+        """Take a token from a bucket: (allowed, seconds until the next token)"""
+        if self.use_redis:
+            try:
+                return self._hit_redis(bucket, limit, window)
+            except Exception:
+                pass
+        return self._hit_local(bucket, limit, window)
+    
+    def check_rate_limit(self, request: Request, limit: int = None, window: int = 60,
+                         endpoint: str = "default", api_key: Optional[str] = None):
+        """Check and enforce rate limits (an explicit limit overrides the configured one)"""
+        configured = (limit, window) if limit is not None else self.limit_for(endpoint, api_key)
+        if configured is None:
+            return True
+        limit, window = configured
         
-        # Check rate limit
-        if len(self.requests[client_ip]) >= limit:
+        bucket = f"ratelimit:{endpoint}:{self.client_id(request, api_key)}"
+        allowed, retry_after = self.hit(bucket, limit, window)
+        metrics.rate_limit_decision(endpoint, allowed)
+        if not allowed:
             raise HTTPException(
                 status_code=429, 
-                detail=f"Rate limit exceeded. Maximum {limit} requests per {window} seconds."
+                detail=f"Rate limit exceeded. Maximum {limit} requests per {window} seconds.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
             )
-        
-        self.requests[client_ip].append(current_time)
         return True
+    
+    def limit(self, endpoint: str):
+        """Route dependency enforcing the endpoint's limit for the calling client"""
+        def dependency(request: Request, api_key: Optional[str] = Depends(api_key_header)):
+            self.check_rate_limit(request, endpoint=endpoint, api_key=api_key)
+        return dependency
+
+
+# Model endpoints that were limited before limits became configurable keep their limits
+DEFAULT_RATE_LIMITS = {
+    "match": (settings.rate_limit_per_minute, 60),
+    "match_batch": (settings.rate_limit_per_minute, 60),
+    "match_models": (30, 60)
+}
 
 # Global rate limiter instance
-rate_limiter = RateLimiter()
+rate_limiter = RateLimiter(
+    {**DEFAULT_RATE_LIMITS, **parse_rate_limits(settings.rate_limits)},
+    parse_rate_limits(settings.api_key_rate_limits)
+)
 
 def verify_api_key(api_key: Optional[str] = Depends(api_key_header)) -> str:
     """
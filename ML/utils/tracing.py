@@ -0,0 +1,365 @@
+import asyncio
+import functools
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Dict, List, Optional
+
+from fastapi.routing import APIRoute
+
+from config import get_settings
+from .logger import log_request
+
+settings = get_settings()
+logger = logging.getLogger("tracing")
+
+REQUEST_ID_HEADER = b"x-request-id"
+# Client-supplied request ids are echoed back only if they look like ids
+REQUEST_ID_PATTERN = re.compile(r'^[\w.\-]{1,64}$')
+HEX_TRACE_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start_ns", "end_ns", "attributes")
+
+    def __init__(self, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+
+class Trace:
+    """Spans of one request; the root span covers the whole request"""
+
+    def __init__(self, request_id: str, name: str):
+        self.request_id = request_id
+        self.trace_id = request_id if HEX_TRACE_ID.match(request_id) else uuid.uuid4().hex
+        self.root = Span(name, None, {})
+        self.spans: List[Span] = []
+        # Set by TracedRoute around the endpoint call
+        self.handler_start_ns: Optional[int] = None
+        self.handler_end_ns: Optional[int] = None
+
+    def server_timing(self) -> str:
+        """Server-Timing header value: summed duration per stage, then the total"""
+        totals: Dict[str, float] = {}
+        for span in list(self.spans):
+            if span.end_ns is not None:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        entries = [f"{name};dur={duration:.2f}" for name, duration in totals.items()]
+        entries.append(f"total;dur={self.root.duration_ms:.2f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a stage of the current request (no-op outside a traced request)
+
+    Names are Server-Timing tokens (letters, digits, "-", "_", "."); spans
+    with the same name are summed in the header.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    parent = _current_span.get() or trace.root
+    if parent.name == name:
+        # Nested stage of the same kind (e.g. preprocess calling clean_text)
+        # is already being timed; a second span would double its duration
+        yield parent
+        return
+    current = Span(name, parent.span_id, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        current.end_ns = time.time_ns()
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def traced(name: str):
+    """Decorator form of span() for functions and methods"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def in_context(func):
+    """Wrap func to run in a copy of the caller's context (trace included)
+
+    Executors started with loop.run_in_executor or Executor.map do not
+    carry context variables over to their threads.
+    """
+    context = copy_context()
+    return lambda *args, **kwargs: context.copy().run(func, *args, **kwargs)
+
+
+def add_span(name: str, start_ns: int, end_ns: int, **attributes):
+    """Record a stage timed elsewhere (e.g. executor queue wait)"""
+    trace = _current_trace.get()
+    if trace is None:
+        return
+    parent = _current_span.get() or trace.root
+    recorded = Span(name, parent.span_id, attributes)
+    recorded.start_ns, recorded.end_ns = start_ns, end_ns
+    trace.spans.append(recorded)
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(trace: Trace, span_: Span, kind: int) -> Dict[str, Any]:
+    otlp = {
+        "traceId": trace.trace_id,
+        "spanId": span_.span_id,
+        "name": span_.name,
+        "kind": kind,
+        "startTimeUnixNano": str(span_.start_ns),
+        "endTimeUnixNano": str(span_.end_ns or span_.start_ns),
+        "attributes": [{"key": key, "value": _otlp_value(value)} for key, value in span_.attributes.items()]
+    }
+    if span_.parent_id:
+        otlp["parentSpanId"] = span_.parent_id
+    return otlp
+
+
+def to_otlp(traces: List[Trace], service_name: str = "trackruit-ml") -> Dict[str, Any]:
+    """OTLP/JSON ExportTraceServiceRequest body for finished traces"""
+    spans = []
+    for trace in traces:
+        spans.append(_otlp_span(trace, trace.root, kind=2))  # SERVER
+        spans.extend(_otlp_span(trace, span_, kind=1) for span_ in trace.spans)  # INTERNAL
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": service_name}},
+                {"key": "process.pid", "value": {"intValue": str(os.getpid())}}
+            ]},
+            "scopeSpans": [{"scope": {"name": "trackruit-ml.tracing"}, "spans": spans}]
+        }]
+    }
+
+
+class SpanExporter:
+    """Background export of finished traces to a JSONL span file and/or an OTLP/HTTP endpoint
+
+    Requests only enqueue; a daemon thread batches and writes. When the
+    queue is full traces are dropped (and counted) rather than slowing
+    requests down.
+    """
+
+    def __init__(self, path: str = "", endpoint: str = "", max_queue: int = 10000,
+                 batch_size: int = 256, timeout: float = 2.0):
+        self.path = path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.dropped = 0
+        self.exported = 0
+        self._queue: "queue.Queue[Trace]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path or self.endpoint)
+
+    def submit(self, trace: Trace):
+        if not self.enabled:
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.export(batch)
+
+    def export(self, traces: List[Trace]):
+        """Write one batch synchronously"""
+        payload = to_otlp(traces)
+        if self.path:
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(payload) + "\n")
+            except OSError as e:
+                logger.warning(f"Could not write spans to {self.path}: {e}")
+        if self.endpoint:
+            try:
+                request = urllib.request.Request(
+                    self.endpoint, data=json.dumps(payload).encode("utf-8"),
+                    headers={"Content-Type": "application/json"}, method="POST"
+                )
+                urllib.request.urlopen(request, timeout=self.timeout).close()
+            except Exception as e:
+                logger.warning(f"Could not export spans to {self.endpoint}: {e}")
+        self.exported += len(traces)
+
+
+class TracingMiddleware:
+    """ASGI middleware: request id, root span, Server-Timing header and request log
+
+    The request id comes from X-Request-ID (or is generated) and is echoed
+    back in the response, which also carries a Server-Timing header with
+    the summed duration of every stage recorded while handling it.
+    """
+
+    def __init__(self, app, exporter: "SpanExporter" = None):
+        self.app = app
+        self.exporter = exporter or span_exporter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope.get("headers", []):
+            if key == REQUEST_ID_HEADER:
+                candidate = value.decode("latin-1")
+                if REQUEST_ID_PATTERN.match(candidate):
+                    request_id = candidate
+                break
+        trace = Trace(request_id or uuid.uuid4().hex, f"{scope['method']} {scope['path']}")
+        token = _current_trace.set(trace)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, trace.request_id.encode("latin-1")))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_trace.reset(token)
+            trace.root.end_ns = time.time_ns()
+            route = scope.get("route")
+            endpoint = getattr(route, "path", None) or scope["path"]
+            trace.root.name = f"{scope['method']} {endpoint}"
+            trace.root.attributes.update({
+                "http.method": scope["method"],
+                "http.route": endpoint,
+                "http.status_code": status["code"],
+                "request_id": trace.request_id
+            })
+            log_request(trace.request_id, endpoint, scope["method"],
+                        (trace.root.end_ns - trace.root.start_ns) / 1e9, status["code"])
+            self.exporter.submit(trace)
+
+
+class TracedRoute(APIRoute):
+    """Route that records request validation, handler and serialization spans
+
+    Validation covers body parsing, pydantic validation and dependencies
+    (up to the handler call); serialization covers response model
+    validation and JSON encoding (after the handler returns).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, self._wrap_endpoint(endpoint), **kwargs)
+
+    @staticmethod
+    def _wrap_endpoint(endpoint):
+        def mark(name: str):
+            trace = _current_trace.get()
+            if trace is not None:
+                setattr(trace, name, time.time_ns())
+
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                mark("handler_start_ns")
+                try:
+                    return await endpoint(*args, **kwargs)
+                finally:
+                    mark("handler_end_ns")
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                mark("handler_start_ns")
+                try:
+                    return endpoint(*args, **kwargs)
+                finally:
+                    mark("handler_end_ns")
+        return wrapper
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            trace = _current_trace.get()
+            if trace is None:
+                return await handler(request)
+            started = time.time_ns()
+            response = await handler(request)
+            finished = time.time_ns()
+            if trace.handler_start_ns is not None:
+                add_span("validation", started, trace.handler_start_ns)
+            if trace.handler_end_ns is not None:
+                add_span("serialize", trace.handler_end_ns, finished)
+            return response
+
+        return traced_handler
+
+# Global exporter configured from TRACE_FILE / TRACE_ENDPOINT
+span_exporter = SpanExporter(settings.trace_file, settings.trace_endpoint)
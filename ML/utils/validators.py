@@ -92,6 +92,26 @@ class InputValidator:
         
         return errors
     
+    @staticmethod
+    def validate_resume_input(input_data: Dict[str, Any], sanitized_data: Dict[str, Any]) -> List[str]:
+        """Validate resume_text and/or a stored resume_id into sanitized_data"""
+        errors = []
+        
+        if input_data.get('resume_id'):
+            # Stored resume profile, resolved by the route; resume_text is its fallback
+            sanitized_data['resume_id'] = str(input_data['resume_id'])
+            if input_data.get('resume_text') is None:
+                return errors
+        
+        if 'resume_text' not in input_data:
+            errors.append("Missing resume_text")
+        elif not InputValidator.validate_resume_text(input_data['resume_text']):
+            errors.append("Invalid resume_text - must be at least 10 characters and under 10,000 characters")
+        else:
+            sanitized_data['resume_text'] = InputValidator.sanitize_text(input_data['resume_text'])
+        
+        return errors
+    
     @staticmethod
     def sanitize_text(text: str) -> str:
         """Sanitize text input"""
@@ -126,13 +146,7 @@ class InputValidator:
         
         try:
             if endpoint == "match":
-                if 'resume_text' not in input_data:
-                    errors.append("Missing resume_text")
-                else:
-                    if not InputValidator.validate_resume_text(input_data['resume_text']):
-                        errors.append("Invalid resume_text - must be at least 10 characters and under 10,000 characters")
-                    else:
-                        sanitized_data['resume_text'] = InputValidator.sanitize_text(input_data['resume_text'])
+                errors.extend(InputValidator.validate_resume_input(input_data, sanitized_data))
                         
                 if 'job_description' not in input_data:
                     errors.append("Missing job_description")
@@ -172,6 +186,15 @@ class InputValidator:
                 if 'user_history' in input_data:
                     sanitized_data['user_history'] = input_data['user_history']
                     
+            elif endpoint == "analyze":
+                errors.extend(InputValidator.validate_resume_input(input_data, sanitized_data))
+                
+                if input_data.get('jobs') is not None:
+                    job_errors = InputValidator.validate_job_pool(input_data['jobs'])
+                    errors.extend(job_errors)
+                    if not job_errors:
+                        sanitized_data['jobs'] = input_data['jobs']
+                    
             elif endpoint == "interview":
                 feature_errors = InputValidator.validate_interview_features(input_data)
                 errors.extend(feature_errors)
@@ -60,7 +60,18 @@ class MLService {
     }
   }
 
-  async analyzeJobMatch(resumeId, jobData) {
+  // Stores the resume on the ML service under our resume id, so that
+  // analyzeJobMatch and getJobRecommendations can refer to it by resumeId.
+  // Those still send resumeText when given, which the ML service uses if
+  // the stored profile is missing or expired
+  async createResumeProfile(resumeId, resumeText) {
+    return this.makeMLRequest("/ml/profiles", {
+      resume_id: String(resumeId),
+      resume_text: resumeText,
+    });
+  }
+
+  async analyzeJobMatch(resumeId, jobData, resumeText) {
     try {
       const cacheKey = `job_match:${resumeId}:${Buffer.from(
         JSON.stringify(jobData)
@@ -74,6 +85,7 @@ class MLService {
 
       const analysis = await this.makeMLRequest("/ml/match", {
         resume_id: resumeId,
+        resume_text: resumeText,
         job_description: jobData.description,
         job_title: jobData.title,
         company: jobData.company,
@@ -90,10 +102,11 @@ class MLService {
     }
   }
 
-  async getJobRecommendations(resumeId, jobPool = []) {
+  async getJobRecommendations(resumeId, jobPool = [], resumeText) {
     try {
       const analysis = await this.makeMLRequest("/ml/recommend", {
         resume_id: resumeId,
+        resume_text: resumeText,
         job_pool: jobPool,
       });
 